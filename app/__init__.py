@@ -1,6 +1,13 @@
+from pathlib import Path
+import sys
+
+# The modules import each other by name, as when the game is run with ``python app``.
+# This lets them be imported as a package too, e.g. ``python -m app.simulate``.
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
 from .utils import get_uuid
 from .players import Player, AIPlayer
-from .boards import Board, PlayerBoard
+from .boards import Board, BitBoard, PlayerBoard
 from .game import Game
 from .ships import Ship, Submarine, Battleship, Destroyer, PatrolBoat, Carrier
 from .ui import CLI
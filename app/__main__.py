@@ -1,8 +1,27 @@
-from players import Player, AIPlayer
-from game import Game
-from ui import CLI
-from config import config
-from cli_config import icon_ascii_art
+import argparse
+import os
+
+parser = argparse.ArgumentParser(description="Battleships game")
+parser.add_argument(
+    "--profile",
+    nargs="?",
+    const="battleships",
+    default=None,
+    metavar="PATH",
+    help="profile the game and write PATH.pstats, PATH.collapsed and PATH.phases.txt",
+)
+args = parser.parse_args()
+# The phases of the game are marked when the modules are imported,
+# so profiling is switched on before importing them
+if args.profile is not None:
+    os.environ["BATTLESHIPS_PROFILE"] = "1"
+
+from players import Player, AIPlayer  # noqa: E402
+from game import Game  # noqa: E402
+from ui import CLI  # noqa: E402
+from config import config  # noqa: E402
+from cli_config import icon_ascii_art  # noqa: E402
+import profiling  # noqa: E402
 
 cli = CLI()
 
@@ -20,7 +39,9 @@ def loop():
     if option == 0:
         player_name = cli.input("Please enter your name: ")
         player = Player(side=config.DEFAULT_PLAYER_SIDE, name=player_name, ui=cli)
-        enemy = AIPlayer(side=1 - config.DEFAULT_PLAYER_SIDE, name="AI")
+        enemy = AIPlayer(
+            side=1 - config.DEFAULT_PLAYER_SIDE, name="AI", strategy=config.AI_STRATEGY
+        )
     elif option == 1:
         player_1_name = cli.input("Please enter the name of Player 1: ")
         player_2_name = cli.input("Please enter the name of Player 2: ")
@@ -44,6 +65,7 @@ def loop():
 
 
 loop = cli.wrap(loop)
-loop()
+with profiling.profiled(args.profile):
+    loop()
 
 cli.close()
@@ -0,0 +1,119 @@
+from time import monotonic
+from knowledge import KnowledgeBoard
+from montecarlo import MonteCarloTargeting
+from targeting import DensityTargeting
+import numpy as np
+
+# Share of the remaining time given to the sampling workers,
+# the rest covers the pool round trip and choosing the target
+_SAMPLING_SHARE = 0.8
+
+HEURISTIC = "heuristic"
+SAMPLED = "sampled"
+EXACT = "exact"
+
+
+class AnytimeTargeting(MonteCarloTargeting):
+    def __init__(
+        self,
+        board_size: int,
+        ship_sizes: list,
+        rng: np.random.Generator | None = None,
+        time_budget: float = 0.1,
+        min_samples: int = 100,
+        samples: int = 100_000,
+        workers: int | None = 1,
+        threshold: float = 2e4,
+        max_states: int = 50_000,
+        knowledge: KnowledgeBoard | None = None,
+    ) -> None:
+        """Targeting that refines its answer until the time budget of the move runs out.
+
+        It starts from the ``DensityTargeting`` heat map, which is always available.
+        With the time left it enumerates the consistent layouts exactly if there are
+        few enough of them, and otherwise samples consistent layouts until the
+        deadline. The best answer reached in time is used: the samples replace the
+        heat map only if there are at least ``min_samples`` of them.
+
+        Args:
+            board_size (int): size of the enemy board
+            ship_sizes (list): sizes of the enemy ships
+            rng (np.random.Generator | None, optional): random generator used to break ties and seed the workers. Defaults to a new unseeded one.
+            time_budget (float, optional): default time budget of a move in seconds. Defaults to 0.1.
+            min_samples (int, optional): sampled layouts needed to trust the samples over the heat map. Defaults to 100.
+            samples (int, optional): sampled layouts after which sampling stops early. Defaults to 100 000.
+            workers (int | None, optional): number of worker processes, ``1`` samples in the current process. Defaults to 1.
+            threshold (float, optional): estimated layout count under which the layouts are enumerated. Defaults to 2e4.
+            max_states (int, optional): memoized states after which the enumeration gives up. Defaults to 50 000.
+            knowledge (KnowledgeBoard | None, optional): board the shots are recorded on, shared with the player. Defaults to a new one.
+        """
+        super().__init__(
+            board_size,
+            ship_sizes,
+            rng,
+            samples,
+            time_budget,
+            workers,
+            threshold,
+            max_states,
+            knowledge,
+        )
+        self._min_samples = min_samples
+        self._deadline = None
+        self._quality = HEURISTIC
+
+    @property
+    def quality(self) -> str:
+        """Returns how the last density was computed: ``HEURISTIC``, ``SAMPLED`` or ``EXACT``
+
+        Returns:
+            str: quality of the last density
+        """
+        return self._quality
+
+    def choose_target(self, time_budget: float | None = None) -> tuple:
+        """Chooses the most likely unshot cell found within the time budget
+
+        Args:
+            time_budget (float | None, optional): seconds the choice may take. Defaults to the one given to the constructor.
+
+        Returns:
+            tuple: (x, y) location
+        """
+        time_budget = time_budget if time_budget is not None else self._time_limit
+        self._deadline = monotonic() + time_budget
+        try:
+            return super().choose_target()
+        finally:
+            self._deadline = None
+
+    def density(self) -> np.ndarray:
+        """Returns the best density that could be computed before the deadline
+
+        Returns:
+            np.ndarray: ``size x size`` float matrix indexed by ``[x, y]``
+        """
+        deadline = self._deadline
+        if deadline is None:
+            deadline = monotonic() + self._time_limit
+
+        best = DensityTargeting.density(self)
+        self._quality = HEURISTIC
+        self._accepted = 0
+        if monotonic() >= deadline:
+            return best
+
+        exact = self._exact_density(deadline)
+        if exact is not None:
+            self._quality = EXACT
+            return exact
+
+        time_left = deadline - monotonic()
+        if time_left <= 0:
+            return best
+        counts = self._sample(time_left * _SAMPLING_SHARE)
+        if self._accepted >= self._min_samples:
+            self._quality = SAMPLED
+            return counts
+        self._accepted = 0
+        return best
@@ -1,14 +1,21 @@
 from config import config
 import numpy as np
+from array import array
 from typing import Literal
 from ships import Ship, LocationOutsideOfRangeError
-from utils import AttackResult
+from utils import AttackResult, window_sums
+from geometry import ShipGeometry, ship_geometry
+from metrics import instrumented
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from players import Player
 
 
+# Enum member lookups are comparatively slow, the hot paths use these aliases
+_MISS, _HIT, _SUNK = AttackResult.MISS, AttackResult.HIT, AttackResult.SUNK
+
+
 class DoubleDestructionError(IndexError):
     pass
 
@@ -26,6 +33,8 @@ class UnlocatedShipRemovalError(IndexError):
 
 
 class Cell:
+    __slots__ = ("shipUUID", "squareIndex", "_alive")
+
     def __init__(self, shipUUID: int, squareIndex: int, alive: bool) -> None:
         """Board cell class
 
@@ -59,17 +68,19 @@ class Cell:
 
 
 class Board:
-    def __init__(self, player: "Player") -> None:
+    def __init__(self, player: "Player", size: int | None = None) -> None:
         """Board class
 
         Args:
             player (Player): player that owns the board
+            size (int | None, optional): board size. Defaults to ``config.BOARD_SIZE``.
         """
         self._player = player
-        self._size = config.BOARD_SIZE
+        self._size = size if size is not None else config.BOARD_SIZE
         self._matrix = np.array([None for _ in range(self._size**2)]).reshape(
             self._size, self._size
         )
+        self._forbidden = array("B", bytes(self._size**2))
 
     @property
     def size(self) -> int:
@@ -95,7 +106,8 @@ class Board:
         orientation: Literal["UP", "DOWN", "LEFT", "RIGHT"],
         size: int,
     ) -> list:
-        """Calculates the locations of the squares of a ship
+        """Calculates the locations of the squares of a ship.
+        The result is built from the shared ``geometry.ship_geometry`` cache.
 
         Args:
             start_location (tuple): location of the first square of the ship
@@ -110,32 +122,8 @@ class Board:
                 tuple[0]: list of the locations of the squares of the ship,
                 tuple[1]: list of the locations of the squares surrounding the ship
         """
-
-        orientation_operation = {
-            "UP": lambda loc, x, y=0: (loc[0] + y, loc[1] + x),
-            "DOWN": lambda loc, x, y=0: (loc[0] + y, loc[1] - x),
-            "LEFT": lambda loc, x, y=0: (loc[0] - x, loc[1] + y),
-            "RIGHT": lambda loc, x, y=0: (loc[0] + x, loc[1] + y),
-        }
-
-        move = orientation_operation[orientation]
-        end_location = move(start_location, size - 1)
-
-        if any(coordinate not in range(self._size) for coordinate in end_location):
-            raise LocationOutsideOfRangeError("Ship would not fit on the board")
-
-        ship_square_locations = [move(start_location, x) for x in range(size)]
-        surrounding_square_locations = []
-        for y in range(-1, 2):
-            for x in range(-1, size + 1):
-                surrounding_location = move(start_location, x, y)
-                if all(
-                    coordinate in range(self._size)
-                    for coordinate in surrounding_location
-                ):
-                    surrounding_square_locations.append(move(start_location, x, y))
-
-        return (ship_square_locations, surrounding_square_locations)
+        geometry = ship_geometry(self._size, size, orientation, tuple(start_location))
+        return (list(geometry.squares), list(geometry.surrounding))
 
     def _get_ship_object(self, shipUUID: int) -> Ship:
         """Returns the ship object associated with the given uuid
@@ -154,6 +142,81 @@ class Board:
         except KeyError:
             raise ShipDoesNotExistError("Ship does not exist")
 
+    def _is_forbidden(self, geometry: ShipGeometry) -> bool:
+        """Checks if any square of the ship lies in the forbidden cells mask
+
+        Args:
+            geometry (ShipGeometry): geometry of the ship
+
+        Returns:
+            bool: ``True`` if the ship can't be placed there
+        """
+        forbidden = self._forbidden
+        return any(forbidden[index] for index in geometry.square_indexes)
+
+    def _update_forbidden(self, geometry: ShipGeometry, delta: int) -> None:
+        """Updates the forbidden cells mask with the surrounding of a ship.
+        Every cell keeps the number of ships it is close to, so removing a ship is as cheap as adding one.
+
+        Args:
+            geometry (ShipGeometry): geometry of the ship
+            delta (int): ``1`` when the ship is added, ``-1`` when it is removed
+        """
+        forbidden = self._forbidden
+        for index in geometry.surrounding_indexes:
+            forbidden[index] += delta
+
+    def forbidden_mask(self) -> np.ndarray:
+        """Returns a boolean matrix of the cells that no new ship square can occupy
+        (the ships and the squares surrounding them)
+
+        Returns:
+            np.ndarray: ``size x size`` boolean matrix indexed by ``[x, y]``
+        """
+        forbidden = np.frombuffer(self._forbidden, dtype=np.uint8)
+        return forbidden.reshape(self._size, self._size) > 0
+
+    def is_valid_location(
+        self,
+        size: int,
+        location: tuple,
+        orientation: Literal["UP", "DOWN", "LEFT", "RIGHT"],
+        ignored_shipUUID: int | None = None,
+    ) -> bool:
+        """Checks if a ship can be placed at the given location.
+        Only the squares of the ship are checked against the forbidden cells mask.
+
+        Args:
+            size (int): size of the ship
+            location (tuple): location of the first square of the ship
+            orientation (Literal["UP", "DOWN", "LEFT", "RIGHT"]): orientation of the ship
+            ignored_shipUUID (int | None, optional): ship that is not taken into account (e.g. the one being moved). Defaults to None.
+
+        Raises:
+            ShipDoesNotExistError: if the ignored ship does not exist
+
+        Returns:
+            bool: ``True`` if the ship can be placed there
+        """
+        try:
+            geometry = ship_geometry(self._size, size, orientation, tuple(location))
+        except LocationOutsideOfRangeError:
+            return False
+
+        ignored_mask = 0
+        if ignored_shipUUID is not None:
+            ship = self._get_ship_object(ignored_shipUUID)
+            if ship.location:
+                ignored_mask = ship_geometry(
+                    self._size, ship.size, ship.orientation, ship.location
+                ).surrounding_mask
+
+        forbidden = self._forbidden
+        return not any(
+            forbidden[index] - (ignored_mask >> index & 1)
+            for index in geometry.square_indexes
+        )
+
     def add_ship(
         self,
         shipUUID: int,
@@ -174,19 +237,20 @@ class Board:
 
         """
         ship = self._get_ship_object(shipUUID)
-        square_locations = self.calculate_square_locations(
-            location, orientation, ship.size
-        )
+        # Locations are also given as lists, the geometry cache needs a hashable key
+        location = tuple(location)
+        geometry = ship_geometry(self._size, ship.size, orientation, location)
 
-        if any(self._matrix[*square] is not None for square in square_locations[1]):
+        if self._is_forbidden(geometry):
             raise CellAlreadyOccupiedError(
                 "Ship would overlap with or be to close to another ship"
             )
 
-        for index, square in enumerate(square_locations[0]):
+        for index, square in enumerate(geometry.squares):
             self._matrix[*square] = Cell(
                 shipUUID=shipUUID, squareIndex=index, alive=ship[index]
             )
+        self._update_forbidden(geometry, 1)
         ship.location = location
         ship.orientation = orientation
 
@@ -205,12 +269,11 @@ class Board:
         if not ship.location:
             raise UnlocatedShipRemovalError("Ship is not located")
 
-        square_locations = self.calculate_square_locations(
-            ship.location, ship.orientation, ship.size
-        )
+        geometry = ship_geometry(self._size, ship.size, ship.orientation, ship.location)
 
-        for location in square_locations[0]:
+        for location in geometry.squares:
             self._matrix[*location] = None
+        self._update_forbidden(geometry, -1)
         ship.location = None
 
     def move_ship(
@@ -254,6 +317,50 @@ class Board:
 
         return self._matrix[x, y]
 
+    def occupancy_mask(self) -> np.ndarray:
+        """Returns a boolean matrix of the occupied cells
+
+        Returns:
+            np.ndarray: ``size x size`` boolean matrix indexed by ``[x, y]``
+        """
+        return np.not_equal(self._matrix, None)
+
+    def get_possible_locations_mask(
+        self, size: int, orientation: Literal["UP", "DOWN", "LEFT", "RIGHT"]
+    ) -> np.ndarray:
+        """Returns a boolean matrix of all the legal anchors for a ship of the given size and orientation.
+        All anchors are computed at once from the maintained forbidden cells mask using sliding window sums.
+
+        Args:
+            size (int): size of the ship
+            orientation (Literal["UP", "DOWN", "LEFT", "RIGHT"]): orientation of the ship
+
+        Returns:
+            np.ndarray: ``size x size`` boolean matrix indexed by ``[x, y]``
+        """
+        anchors = np.zeros((self._size, self._size), dtype=bool)
+        if size > self._size:
+            return anchors
+
+        blocked = self.forbidden_mask()
+        axis = 1 if orientation in ("UP", "DOWN") else 0
+        free = window_sums(blocked, size, axis) == 0
+        last = self._size - size + 1
+
+        if orientation == "UP":
+            anchors[:, :last] = free
+        elif orientation == "DOWN":
+            anchors[:, size - 1 :] = free
+        elif orientation == "RIGHT":
+            anchors[:last, :] = free
+        else:
+            anchors[size - 1 :, :] = free
+        return anchors
+
+    @instrumented(
+        "battleships_board_get_possible_locations_seconds",
+        "Latency of Board.get_possible_locations",
+    )
     def get_possible_locations(
         self, size: int, orientation: Literal["UP", "DOWN", "LEFT", "RIGHT"]
     ) -> list:
@@ -266,36 +373,15 @@ class Board:
         Returns:
             list: list of (x, y) tuples
         """
-        location_range_function = {
-            "UP": lambda board_size, ship_size: (
-                range(board_size),
-                range(board_size - ship_size + 1),
-            ),
-            "DOWN": lambda board_size, ship_size: (
-                range(board_size),
-                range(ship_size - 1, board_size),
-            ),
-            "LEFT": lambda board_size, ship_size: location_range_function["DOWN"](
-                board_size, ship_size
-            )[::-1],
-            "RIGHT": lambda board_size, ship_size: location_range_function["UP"](
-                board_size, ship_size
-            )[::-1],
-        }
-
-        x_range, y_range = location_range_function[orientation](self._size, size)
-
-        possible_locations = []
-        for x in x_range:
-            for y in y_range:
-                square_locations = self.calculate_square_locations(
-                    (x, y), orientation, size
-                )
-                if all(self.cell(*square) is None for square in square_locations[1]):
-                    possible_locations.append((x, y))
-
-        return possible_locations
-
+        anchors = self.get_possible_locations_mask(size, orientation)
+        return [(int(x), int(y)) for x, y in np.argwhere(anchors)]
+
+    @instrumented(
+        "battleships_board_attack_seconds",
+        "Latency of Board.attack",
+        result_label=True,
+        engine="Board",
+    )
     def attack(self, x: int, y: int) -> AttackResult:
         """Attacks the given location and returns ``AttackResult``
 
@@ -326,5 +412,208 @@ class Board:
             return AttackResult.HIT
 
 
+class BitBoard(Board):
+    def __init__(self, player: "Player", size: int | None = None) -> None:
+        """Board that keeps its state in packed integers instead of a ``Cell`` matrix.
+
+        Occupancy and hits are stored as one bitmask per row (bit ``y`` of row ``x``),
+        small ints that are cheap to test and update. The ship and the square index
+        of every cell are kept in flat lookups indexed by ``x * size + y``.
+        It has the same public API as ``Board``, but ``cell`` returns
+        a fresh ``Cell`` snapshot rather than the stored object.
+
+        Args:
+            player (Player): player that owns the board
+            size (int | None, optional): board size. Defaults to ``config.BOARD_SIZE``.
+        """
+        self._player = player
+        self._size = size if size is not None else config.BOARD_SIZE
+        self._occupied_rows = [0] * self._size
+        self._hit_rows = [0] * self._size
+        self._cell_ships = [None] * self._size**2
+        self._square_indexes = array("h", [0]) * self._size**2
+        self._forbidden = array("B", bytes(self._size**2))
+        self._forbidden_bits = 0
+
+    def _flat_index(self, x: int, y: int) -> int:
+        """Returns the bit index of the given coordinates
+
+        Raises:
+            LocationOutsideOfRangeError: if the coordinates are out of range
+
+        Returns:
+            int: ``x * size + y``
+        """
+        if not (0 <= x < self._size and 0 <= y < self._size):
+            raise LocationOutsideOfRangeError("Index out of range")
+        return x * self._size + y
+
+    def _is_forbidden(self, geometry: ShipGeometry) -> bool:
+        """Checks if any square of the ship lies in the forbidden cells mask
+
+        Args:
+            geometry (ShipGeometry): geometry of the ship
+
+        Returns:
+            bool: ``True`` if the ship can't be placed there
+        """
+        return bool(self._forbidden_bits & geometry.square_mask)
+
+    def _update_forbidden(self, geometry: ShipGeometry, delta: int) -> None:
+        """Updates the forbidden cells counters and their bitmask with the surrounding of a ship
+
+        Args:
+            geometry (ShipGeometry): geometry of the ship
+            delta (int): ``1`` when the ship is added, ``-1`` when it is removed
+        """
+        super()._update_forbidden(geometry, delta)
+        if delta > 0:
+            self._forbidden_bits |= geometry.surrounding_mask
+            return
+
+        forbidden = self._forbidden
+        for index in geometry.surrounding_indexes:
+            if not forbidden[index]:
+                self._forbidden_bits &= ~(1 << index)
+
+    def add_ship(
+        self,
+        shipUUID: int,
+        location: tuple,
+        orientation: Literal["UP", "DOWN", "LEFT", "RIGHT"],
+    ) -> None:
+        """Adds a ship to the board
+
+        Args:
+            shipUUID (int): uuid of the ship to add
+            location (tuple): location of the first square of the ship
+            orientation (Literal["UP", "DOWN", "LEFT", "RIGHT"]): orientation of the ship
+
+        Raises:
+            CellAlreadyOccupiedError: if the ship would overlap with or be to close to another ship
+            LocationOutsideOfRange: if the ship would not fit on the board
+            ShipDoesNotExistError: if the ship does not exist
+        """
+        ship = self._get_ship_object(shipUUID)
+        # Locations are also given as lists, the geometry cache needs a hashable key
+        location = tuple(location)
+        geometry = ship_geometry(self._size, ship.size, orientation, location)
+
+        if self._is_forbidden(geometry):
+            raise CellAlreadyOccupiedError(
+                "Ship would overlap with or be to close to another ship"
+            )
+
+        for index, (x, y) in enumerate(geometry.squares):
+            self._cell_ships[x * self._size + y] = ship
+            self._square_indexes[x * self._size + y] = index
+            self._occupied_rows[x] |= 1 << y
+            if not ship[index]:
+                self._hit_rows[x] |= 1 << y
+        self._update_forbidden(geometry, 1)
+        ship.location = location
+        ship.orientation = orientation
+
+    def remove_ship(self, shipUUID: int) -> None:
+        """Removes a ship from the board
+
+        Args:
+            shipUUID (int): uuid of the ship to remove
+
+        Raises:
+            ShipDoesNotExistError: if the ship does not exist
+            UnlocatedShipRemovalError: if the ship is not located
+        """
+        ship = self._get_ship_object(shipUUID)
+        if not ship.location:
+            raise UnlocatedShipRemovalError("Ship is not located")
+
+        geometry = ship_geometry(self._size, ship.size, ship.orientation, ship.location)
+
+        for x, y in geometry.squares:
+            self._cell_ships[x * self._size + y] = None
+            self._occupied_rows[x] &= ~(1 << y)
+            self._hit_rows[x] &= ~(1 << y)
+        self._update_forbidden(geometry, -1)
+        ship.location = None
+
+    def cell(self, x: int, y: int) -> Cell | None:
+        """Returns a snapshot of the cell at the given coordinates.
+        If there is no cell it returns ``None``
+
+        Args:
+            x (int): coordinate x
+            y (int): coordinate y
+
+        Raises:
+            IndexError: if the coordinates are out of range
+
+        Returns:
+            Cell | None: value at the given coordinates
+        """
+        flat_index = self._flat_index(x, y)
+        if not self._occupied_rows[x] >> y & 1:
+            return None
+
+        return Cell(
+            shipUUID=self._cell_ships[flat_index].uuid,
+            squareIndex=self._square_indexes[flat_index],
+            alive=not self._hit_rows[x] >> y & 1,
+        )
+
+    def occupancy_mask(self) -> np.ndarray:
+        """Returns a boolean matrix of the occupied cells
+
+        Returns:
+            np.ndarray: ``size x size`` boolean matrix indexed by ``[x, y]``
+        """
+        bits = [
+            [row >> y & 1 for y in range(self._size)] for row in self._occupied_rows
+        ]
+        return np.array(bits, dtype=bool)
+
+    @instrumented(
+        "battleships_board_attack_seconds",
+        "Latency of Board.attack",
+        result_label=True,
+        engine="BitBoard",
+    )
+    def attack(self, x: int, y: int) -> AttackResult:
+        """Attacks the given location and returns ``AttackResult``
+
+        Args:
+            x (int): x coordinate
+            y (int): y coordinate
+
+        Raises:
+            HitDestroyedSquareError: if the cell has already been hit
+            LocationOutsideOfRangeError: if the coordinates are not on the board
+
+        Returns:
+            AttackResult: result of the attack
+        """
+        size = self._size
+        if x < 0 or not 0 <= y < size:
+            raise LocationOutsideOfRangeError("Index out of range")
+        try:
+            occupied = self._occupied_rows[x]
+        except IndexError:
+            raise LocationOutsideOfRangeError("Index out of range") from None
+        if not occupied >> y & 1:
+            return _MISS
+
+        flat_index = x * size + y
+        ship = self._cell_ships[flat_index]
+        strength_after_hit = ship.hit_mask(1 << self._square_indexes[flat_index])
+        self._hit_rows[x] |= 1 << y
+
+        self._player.fleet_strength -= 1
+
+        if strength_after_hit == 0:
+            return _SUNK
+        else:
+            return _HIT
+
+
 class PlayerBoard(Board):
     pass
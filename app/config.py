@@ -5,9 +5,14 @@ import os
 CONFIG_FOLDER = "configs/"
 DEFAULT_CONFIG_FILE = "default_config.json"
 USER_CONFIG_FILE = "user_config.json"
+# Used when a config file was saved before the setting existed
+DEFAULT_AI_STRATEGY = "hunt_target"
 
 
 class Config:
+    # Registered AI strategies, see ``use_strategies``
+    _strategies = None
+
     def __init__(self) -> None:
         """Config class"""
         try:
@@ -27,14 +32,25 @@ class Config:
             isUserConfig (bool, optional): indicates if it's a user made config. Defaults to False.
         """
         config = json.load(file)
-        if isUserConfig:
-            self._check_data(config)
+        # An invalid user config is replaced by the default one
+        if isUserConfig and not self._check_data(config):
+            return
 
         self.BOARD_SIZE = config["BOARD_SIZE"]
         self.DEFAULT_ORIENTATION = config["DEFAULT_ORIENTATION"]
         self.BOAT_SIZES = config["BOAT_SIZES"]
         self.DEFAULT_SHIP_SET = config["DEFAULT_SHIP_SET"]
         self.DEFAULT_PLAYER_SIDE = config["DEFAULT_PLAYER_SIDE"]
+        self.AI_STRATEGY = config.get("AI_STRATEGY", DEFAULT_AI_STRATEGY)
+
+    def load_file(self, path: str) -> None:
+        """Loads the config from another file, without saving it as the user config
+
+        Args:
+            path (str): path to a JSON file with the keys of ``default_config.json``
+        """
+        with open(path) as file:
+            self._load(file)
 
     def save(self):
         """Saves the config to ```user_config.json``"""
@@ -46,19 +62,43 @@ class Config:
                     "BOAT_SIZES": self.BOAT_SIZES,
                     "DEFAULT_SHIP_SET": self.DEFAULT_SHIP_SET,
                     "DEFAULT_PLAYER_SIDE": self.DEFAULT_PLAYER_SIDE,
+                    "AI_STRATEGY": self.AI_STRATEGY,
                 },
                 file,
             )
 
-    def _check_data(self, config: dict):
-        """Checks if the data in the config is valid
+    def _check_data(self, config: dict) -> bool:
+        """Checks if the data in the config is valid and restores the defaults if it's not
 
         Args:
             config (dict): config data
+
+        Returns:
+            bool: True if the data is valid
         """
         if config["BOARD_SIZE"] < 10:
-            self.restore_defaults()
+            valid = False
         elif config["DEFAULT_ORIENTATION"] not in ["UP", "RIGHT"]:
+            valid = False
+        elif self._strategies is not None:
+            valid = config.get("AI_STRATEGY", DEFAULT_AI_STRATEGY) in self._strategies
+        else:
+            valid = True
+
+        if not valid:
+            self.restore_defaults()
+        return valid
+
+    def use_strategies(self, strategies: dict) -> None:
+        """Sets the registry the AI strategy of the user config is checked against
+        and checks the loaded config. The ``strategies`` module calls it once the strategies
+        are registered, it can't be imported here as the strategies need the config themselves.
+
+        Args:
+            strategies (dict): registered strategies, name -> ``strategies.Strategy``
+        """
+        self._strategies = strategies
+        if self.AI_STRATEGY not in strategies:
             self.restore_defaults()
 
     def restore_defaults(self):
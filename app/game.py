@@ -1,32 +1,136 @@
+from typing import Iterator, NamedTuple, TYPE_CHECKING
+from metrics import ENABLED, increment, instrumented
 from players import Player
+from profiling import INITIALIZE_BOARDS, marked
+from utils import AttackResult
+import numpy as np
+
+if TYPE_CHECKING:
+    from replay import ReplayWriter
+
+
+class GameOverError(Exception):
+    pass
+
+
+class Turn(NamedTuple):
+    """An attack made during a game"""
+
+    player: Player
+    location: tuple
+    result: AttackResult
 
 
 class Game:
-    def __init__(self, playerA: Player, playerB: Player) -> None:
+    def __init__(
+        self,
+        playerA: Player,
+        playerB: Player,
+        seed: int | np.random.SeedSequence | None = None,
+        recorder: "ReplayWriter | None" = None,
+    ) -> None:
         """Game object
 
         Args:
             playerA (Player): player A
             playerB (Player): player B
+            seed (int | np.random.SeedSequence | None, optional): if set, the players get independent
+                random generators spawned from it, so the game can be replayed exactly. Defaults to None.
+            recorder (ReplayWriter | None, optional): writes the fleets and every attack to a replay file
+                as the turns happen. Defaults to None.
         """
+        if seed is not None:
+            if not isinstance(seed, np.random.SeedSequence):
+                seed = np.random.SeedSequence(seed)
+            seed_a, seed_b = seed.spawn(2)
+            playerA.rng = np.random.default_rng(seed_a)
+            playerB.rng = np.random.default_rng(seed_b)
         playerA.set_enemy(playerB)
         playerB.set_enemy(playerA)
         self._playerA = playerA
         self._playerB = playerB
+        # Player attacking in the next turn
+        self._attacker = playerA
+        self._recorder = recorder
+        self._recording = False
 
+    @marked(INITIALIZE_BOARDS)
     def initialize_boards(self) -> None:
         """Initialize boards for the players"""
         self._playerA.initialize_board()
         self._playerB.initialize_board()
 
+    @property
+    def finished(self) -> bool:
+        """Checks if one of the fleets has been sunk
+
+        Returns:
+            bool: True if the game is over
+        """
+        return not (self._playerA.fleet_strength and self._playerB.fleet_strength)
+
+    @property
+    def winner(self) -> Player | None:
+        """Returns the winner of the game
+
+        Returns:
+            Player | None: the player whose fleet is afloat, None if the game is not over
+        """
+        if not self.finished:
+            return None
+        return self._playerA if self._playerA.fleet_strength else self._playerB
+
+    @instrumented("battleships_game_turn_seconds", "Latency of a turn of Game.step")
+    def step(self) -> Turn:
+        """Plays a single turn: the player whose turn it is attacks
+
+        Raises:
+            GameOverError: if the game is over
+
+        Returns:
+            Turn: attacking player, location and result of the attack
+        """
+        if self.finished:
+            raise GameOverError("The game is over")
+
+        player = self._attacker
+        result = player.attack_enemy()
+        self._attacker = self._playerB if player is self._playerA else self._playerA
+        if ENABLED and self.finished:
+            increment("battleships_games_total", "Games played to the end")
+        if self._recorder is not None:
+            self._record(player.last_attack_location)
+        return Turn(player, player.last_attack_location, result)
+
+    def _record(self, location: tuple) -> None:
+        """Writes an attack to the replay, the fleets before the first one
+
+        Args:
+            location (tuple): attacked location
+        """
+        if not self._recording:
+            self._recorder.start(self._playerA, self._playerB)
+            self._recording = True
+        self._recorder.attack(location)
+        if self.finished:
+            self._recorder.finish()
+
+    def steps(self) -> Iterator[Turn]:
+        """Plays the turns one by one until a fleet is sunk
+
+        Yields:
+            Turn: attacking player, location and result of every attack
+        """
+        while not self.finished:
+            yield self.step()
+
     def start(self) -> bool:
         """Main game loop
 
         Returns:
             bool: True if player A won, False if player B won
         """
-        while all([self._playerA.fleet_strength, self._playerB.fleet_strength]):
-            self._playerA.attack_enemy()
-            self._playerB.attack_enemy()
+        for _ in self.steps():
+            pass
 
-        return self._playerA.fleet_strength > self._playerB.fleet_strength
+        return self.winner is self._playerA
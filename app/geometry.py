@@ -0,0 +1,135 @@
+from functools import lru_cache
+from typing import Literal, NamedTuple
+from ships import LocationOutsideOfRangeError
+import numpy as np
+
+ORIENTATIONS = ("UP", "DOWN", "LEFT", "RIGHT")
+
+# (direction along the ship, direction across the ship)
+_DIRECTIONS = {
+    "UP": ((0, 1), (1, 0)),
+    "DOWN": ((0, -1), (1, 0)),
+    "LEFT": ((-1, 0), (0, 1)),
+    "RIGHT": ((1, 0), (0, 1)),
+}
+
+
+class ShipGeometry(NamedTuple):
+    """Precomputed footprint of a ship placed on a board
+
+    Flat indexes are ``x * board_size + y`` and masks have the bits of those indexes set.
+    """
+
+    squares: tuple
+    surrounding: tuple
+    square_indexes: tuple
+    surrounding_indexes: tuple
+    square_mask: int
+    surrounding_mask: int
+
+
+class PlacementTable(NamedTuple):
+    """All the placements of a ship of one size and orientation on an empty board.
+    Rows are ordered like ``Board.get_possible_locations`` (by x, then by y).
+    """
+
+    anchors: np.ndarray
+    square_indexes: np.ndarray
+    square_masks: tuple
+    surrounding_masks: tuple
+
+
+@lru_cache(maxsize=None)
+def ship_geometry(
+    board_size: int,
+    size: int,
+    orientation: Literal["UP", "DOWN", "LEFT", "RIGHT"],
+    location: tuple,
+) -> ShipGeometry:
+    """Returns the geometry of a ship. Results are cached and shared between all boards of the same size.
+
+    Args:
+        board_size (int): size of the board
+        size (int): size of the ship
+        orientation (Literal["UP", "DOWN", "LEFT", "RIGHT"]): orientation of the ship
+        location (tuple): location of the first square of the ship
+
+    Raises:
+        LocationOutsideOfRangeError: if the ship would not fit on the board
+
+    Returns:
+        ShipGeometry: ship's squares and the squares surrounding it
+    """
+    (along_x, along_y), (across_x, across_y) = _DIRECTIONS[orientation]
+    x, y = location
+
+    def move(along: int, across: int = 0) -> tuple:
+        return (
+            x + along * along_x + across * across_x,
+            y + along * along_y + across * across_y,
+        )
+
+    def on_board(square: tuple) -> bool:
+        return 0 <= square[0] < board_size and 0 <= square[1] < board_size
+
+    if not (on_board(location) and on_board(move(size - 1))):
+        raise LocationOutsideOfRangeError("Ship would not fit on the board")
+
+    squares = tuple(move(along) for along in range(size))
+    surrounding = tuple(
+        square
+        for across in range(-1, 2)
+        for along in range(-1, size + 1)
+        if on_board(square := move(along, across))
+    )
+    square_indexes = tuple(sx * board_size + sy for sx, sy in squares)
+    surrounding_indexes = tuple(sx * board_size + sy for sx, sy in surrounding)
+
+    return ShipGeometry(
+        squares=squares,
+        surrounding=surrounding,
+        square_indexes=square_indexes,
+        surrounding_indexes=surrounding_indexes,
+        square_mask=sum(1 << index for index in square_indexes),
+        surrounding_mask=sum(1 << index for index in surrounding_indexes),
+    )
+
+
+@lru_cache(maxsize=None)
+def placement_table(
+    board_size: int,
+    size: int,
+    orientation: Literal["UP", "DOWN", "LEFT", "RIGHT"],
+) -> PlacementTable:
+    """Returns every placement of a ship of the given size and orientation that fits on the board
+
+    Args:
+        board_size (int): size of the board
+        size (int): size of the ship
+        orientation (Literal["UP", "DOWN", "LEFT", "RIGHT"]): orientation of the ship
+
+    Returns:
+        PlacementTable: anchors ``(P, 2)``, flat square indexes ``(P, size)`` and bitmasks
+    """
+    geometries = []
+    for x in range(board_size):
+        for y in range(board_size):
+            try:
+                geometries.append(ship_geometry(board_size, size, orientation, (x, y)))
+            except LocationOutsideOfRangeError:
+                pass
+
+    anchors = np.array([g.squares[0] for g in geometries], dtype=np.int16)
+    square_indexes = np.array([g.square_indexes for g in geometries], dtype=np.int32)
+    anchors = anchors.reshape(-1, 2)
+    square_indexes = square_indexes.reshape(-1, size)
+    # The table is shared, so it must not be modified by its users
+    anchors.flags.writeable = False
+    square_indexes.flags.writeable = False
+
+    return PlacementTable(
+        anchors=anchors,
+        square_indexes=square_indexes,
+        square_masks=tuple(g.square_mask for g in geometries),
+        surrounding_masks=tuple(g.surrounding_mask for g in geometries),
+    )
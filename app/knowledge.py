@@ -0,0 +1,152 @@
+from collections import Counter
+from typing import NamedTuple
+from utils import AttackResult
+import numpy as np
+
+# Codes of the observed cells, EMPTY cells are not shot but can't hold a ship
+UNKNOWN, MISS, HIT, SUNK, EMPTY = 0, 1, 2, 3, 4
+
+_DIAGONALS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+_NEIGHBOURS = tuple((dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy)
+
+
+def sunk_ship_cells(state: np.ndarray, location: tuple) -> list:
+    """Returns the cells of the ship sunk at the given location.
+    Ships can't touch each other, so it's the line of hit cells going through the location.
+
+    Args:
+        state (np.ndarray): matrix of observed cell codes
+        location (tuple): (x, y) location of the sinking shot
+
+    Returns:
+        list: list of (x, y) tuples
+    """
+    board_size = state.shape[0]
+    x, y = location
+    cells = [location]
+    for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+        nx, ny = x + dx, y + dy
+        while 0 <= nx < board_size and 0 <= ny < board_size and state[nx, ny] == HIT:
+            cells.append((nx, ny))
+            nx, ny = nx + dx, ny + dy
+    return cells
+
+
+class Observation(NamedTuple):
+    """What was learnt from an attack"""
+
+    # (x, y) cells of the ship sunk by the attack
+    sunk: list
+    # (x, y) cells newly known to be empty, as ships can't touch each other
+    empty: list
+
+
+class KnowledgeBoard:
+    __slots__ = ("_state", "_remaining")
+
+    def __init__(self, board_size: int, ship_sizes: list) -> None:
+        """What a player knows about the enemy board, built only from the results of its shots.
+        It doesn't look at the enemy board, so it can be used by the AI and the UI alike.
+
+        Args:
+            board_size (int): size of the enemy board
+            ship_sizes (list): sizes of the enemy ships
+        """
+        self._state = np.full((board_size, board_size), UNKNOWN, dtype=np.int8)
+        self._remaining = Counter(ship_sizes)
+
+    @property
+    def size(self) -> int:
+        """Size of the enemy board
+
+        Returns:
+            int: board size
+        """
+        return len(self._state)
+
+    @property
+    def state(self) -> np.ndarray:
+        """Matrix of observed cell codes (``UNKNOWN``, ``MISS``, ``HIT``, ``SUNK``, ``EMPTY``)
+
+        Returns:
+            np.ndarray: ``size x size`` int8 matrix indexed by ``[x, y]``
+        """
+        return self._state
+
+    @property
+    def remaining(self) -> Counter:
+        """Sizes of the enemy ships that are not sunk yet
+
+        Returns:
+            Counter: size -> number of ships
+        """
+        return self._remaining
+
+    def is_shot(self, x: int, y: int) -> bool:
+        """Checks if the cell has already been attacked
+
+        Args:
+            x (int): x coordinate
+            y (int): y coordinate
+
+        Returns:
+            bool: True if the result of an attack on the cell is known
+        """
+        return self._state[x, y] not in (UNKNOWN, EMPTY)
+
+    def is_known(self, x: int, y: int) -> bool:
+        """Checks if the cell has been attacked or is known to be empty
+
+        Args:
+            x (int): x coordinate
+            y (int): y coordinate
+
+        Returns:
+            bool: True if the cell can't be the target of a useful attack
+        """
+        return self._state[x, y] != UNKNOWN
+
+    def _mark_empty(self, cells: list, offsets: tuple) -> list:
+        """Marks the unknown neighbours of the cells as empty
+
+        Args:
+            cells (list): (x, y) cells
+            offsets (tuple): (dx, dy) offsets of the neighbours
+
+        Returns:
+            list: (x, y) cells newly marked as empty
+        """
+        size = len(self._state)
+        empty = []
+        for x, y in cells:
+            for dx, dy in offsets:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < size and 0 <= ny < size and self._state[nx, ny] == UNKNOWN:
+                    self._state[nx, ny] = EMPTY
+                    empty.append((nx, ny))
+        return empty
+
+    def record(self, location: tuple, result: AttackResult) -> Observation:
+        """Records the result of an attack and infers the cells that can't hold a ship:
+        the diagonal neighbours of a hit and the whole halo of a sunk ship
+
+        Args:
+            location (tuple): (x, y) location of the attack
+            result (AttackResult): result of the attack
+
+        Returns:
+            Observation: sunk ship cells and newly inferred empty cells
+        """
+        if result == AttackResult.MISS:
+            self._state[location] = MISS
+            return Observation([], [])
+
+        self._state[location] = HIT
+        if result != AttackResult.SUNK:
+            return Observation([], self._mark_empty([location], _DIAGONALS))
+
+        cells = sunk_ship_cells(self._state, location)
+        for cell in cells:
+            self._state[cell] = SUNK
+        self._remaining[len(cells)] -= 1
+        return Observation(cells, self._mark_empty(cells, _NEIGHBOURS))
@@ -0,0 +1,793 @@
+from bisect import bisect_right
+from functools import lru_cache
+from math import inf
+from time import monotonic
+from typing import NamedTuple
+from config import config
+from geometry import ORIENTATIONS, ShipGeometry, placement_table, ship_geometry
+import numpy as np
+
+# Layouts are generated in blocks to bound the memory of the working arrays
+_CHUNK_SIZE = 1 << 16
+
+# Draws of the first block of ``uniform_layouts`` per requested layout,
+# about 1 default fleet in 460 draws is legal
+_FIRST_DRAWS_PER_LAYOUT = 1 << 9
+
+# Seconds the layout counting of ``uniform_layouts`` may take
+# before it falls back to ``generate_layouts``
+PLACEMENT_TIME_LIMIT = 0.1
+
+# Memoized states counted between two checks of the deadline
+_DEADLINE_CHECK_INTERVAL = 256
+
+# Seconds the layout counting may take when no deadline is given,
+# so a layout space too large to count fails fast
+COUNT_TIME_LIMIT = 2.0
+
+
+class LayoutGenerationError(RuntimeError):
+    pass
+
+
+class FleetTable(NamedTuple):
+    """Placements of every ship size of a fleet, stacked into fixed-width arrays.
+
+    Square indexes are padded with ``cell_count`` (a column that is never forbidden),
+    surrounding indexes with ``cell_count + 1`` (a column that is never read).
+    """
+
+    anchors: np.ndarray
+    orientations: np.ndarray
+    square_indexes: np.ndarray
+    surrounding_indexes: np.ndarray
+    group_start: np.ndarray
+    group_count: np.ndarray
+
+
+def _bits(mask: np.ndarray) -> int:
+    """Converts a bool mask to an int with the bits of its flat indexes set"""
+    packed = np.packbits(np.asarray(mask, dtype=bool).ravel(), bitorder="little")
+    return int.from_bytes(packed.tobytes(), "little")
+
+
+def _below(rng: np.random.Generator, bound: int) -> int:
+    """Draws a uniform int from ``[0, bound)``, also for bounds past the int64 range"""
+    if bound <= np.iinfo(np.int64).max:
+        return int(rng.integers(bound))
+    bits = bound.bit_length()
+    while True:
+        value = int.from_bytes(rng.bytes((bits + 7) // 8), "little") >> (-bits % 8)
+        if value < bound:
+            return value
+
+
+def default_ship_sizes() -> list:
+    """Returns the sizes of the ships of the default ship set in ``get_default_ship_set`` order
+
+    Returns:
+        list: ship sizes
+    """
+    return [
+        config.BOAT_SIZES[name]
+        for name, quantity in config.DEFAULT_SHIP_SET.items()
+        for _ in range(quantity)
+    ]
+
+
+@lru_cache(maxsize=None)
+def fleet_table(board_size: int, sizes: tuple) -> FleetTable:
+    """Stacks the placement tables of all the given ship sizes in all orientations
+
+    Args:
+        board_size (int): size of the board
+        sizes (tuple): distinct ship sizes
+
+    Returns:
+        FleetTable: placements of the ships, ``group_start[size]`` and ``group_count[size]``
+        point to the rows of a given size
+    """
+    cell_count = board_size**2
+    max_size = max(sizes)
+    max_surrounding = 3 * (max_size + 2)
+
+    anchors, orientations, squares, surroundings = [], [], [], []
+    group_start = np.zeros(max_size + 1, dtype=np.int64)
+    group_count = np.zeros(max_size + 1, dtype=np.int64)
+
+    for size in sorted(set(sizes)):
+        group_start[size] = len(anchors)
+        for orientation_index, orientation in enumerate(ORIENTATIONS):
+            table = placement_table(board_size, size, orientation)
+            for anchor, square_indexes in zip(table.anchors, table.square_indexes):
+                geometry = ship_geometry(
+                    board_size, size, orientation, (int(anchor[0]), int(anchor[1]))
+                )
+                anchors.append(anchor)
+                orientations.append(orientation_index)
+                squares.append(list(square_indexes) + [cell_count] * (max_size - size))
+                surroundings.append(
+                    list(geometry.surrounding_indexes)
+                    + [cell_count + 1]
+                    * (max_surrounding - len(geometry.surrounding_indexes))
+                )
+        group_count[size] = len(anchors) - group_start[size]
+
+    table = FleetTable(
+        anchors=np.array(anchors, dtype=np.int16).reshape(-1, 2),
+        orientations=np.array(orientations, dtype=np.int16),
+        square_indexes=np.array(squares, dtype=np.int64).reshape(-1, max_size),
+        surrounding_indexes=np.array(surroundings, dtype=np.int64).reshape(
+            -1, max_surrounding
+        ),
+        group_start=group_start,
+        group_count=group_count,
+    )
+    # The table is shared, so it must not be modified by its users
+    for array in table:
+        array.flags.writeable = False
+    return table
+
+
+def _fill_layouts(
+    layouts: np.ndarray,
+    table: FleetTable,
+    sizes: np.ndarray,
+    cell_count: int,
+    rng: np.random.Generator,
+    max_attempts: int,
+    max_restarts: int,
+    blocked_cells: np.ndarray | None,
+) -> None:
+    """Fills a block of layouts in place. See ``generate_layouts``"""
+    count, ship_count, _ = layouts.shape
+    forbidden = np.zeros((count, cell_count + 2), dtype=bool)
+    if blocked_cells is not None:
+        forbidden[:, :cell_count] = blocked_cells
+    next_ship = np.zeros(count, dtype=np.int64)
+    failures = np.zeros(count, dtype=np.int64)
+    restarts = np.zeros(count, dtype=np.int64)
+    active = np.arange(count)
+
+    while active.size:
+        needed_sizes = sizes[next_ship[active]]
+        picks = table.group_start[needed_sizes] + (
+            rng.random(active.size) * table.group_count[needed_sizes]
+        ).astype(np.int64)
+
+        blocked = forbidden[active[:, None], table.square_indexes[picks]].any(axis=1)
+
+        placed, placed_picks = active[~blocked], picks[~blocked]
+        forbidden[placed[:, None], table.surrounding_indexes[placed_picks]] = True
+        layouts[placed, next_ship[placed], :2] = table.anchors[placed_picks]
+        layouts[placed, next_ship[placed], 2] = table.orientations[placed_picks]
+        next_ship[placed] += 1
+        failures[placed] = 0
+
+        missed = active[blocked]
+        failures[missed] += 1
+        stuck = missed[failures[missed] >= max_attempts]
+        if stuck.size:
+            restarts[stuck] += 1
+            if restarts[stuck].max() > max_restarts:
+                raise LayoutGenerationError(
+                    f"Could not place ships {sizes.tolist()} on the board"
+                )
+            forbidden[stuck] = False
+            if blocked_cells is not None:
+                forbidden[stuck, :cell_count] = blocked_cells
+            next_ship[stuck] = 0
+            failures[stuck] = 0
+
+        active = active[next_ship[active] < ship_count]
+
+
+def generate_layouts(
+    count: int,
+    board_size: int | None = None,
+    ship_sizes: list | None = None,
+    rng: np.random.Generator | None = None,
+    max_attempts: int = 64,
+    max_restarts: int = 1000,
+    blocked: np.ndarray | None = None,
+) -> np.ndarray:
+    """Generates random valid fleet layouts in batch.
+
+    All the layouts are built at once: on every step each unfinished layout draws
+    a random placement for its next ship and keeps it if none of its squares is forbidden.
+    A layout that fails ``max_attempts`` times in a row is restarted from scratch,
+    so early placements can never leave it in a dead end.
+
+    Args:
+        count (int): number of layouts
+        board_size (int | None, optional): size of the board. Defaults to ``config.BOARD_SIZE``.
+        ship_sizes (list | None, optional): sizes of the ships. Defaults to ``default_ship_sizes()``.
+        rng (np.random.Generator | None, optional): random generator. Defaults to a new unseeded one.
+        max_attempts (int, optional): failed draws in a row after which a layout is restarted. Defaults to 64.
+        max_restarts (int, optional): restarts after which a layout is considered impossible. Defaults to 1000.
+        blocked (np.ndarray | None, optional): ``board_size x board_size`` bool mask of cells no ship may occupy. Defaults to None.
+
+    Raises:
+        LayoutGenerationError: if the ships can't be placed on the board
+
+    Returns:
+        np.ndarray: ``(count, len(ship_sizes), 3)`` int16 array of ``(x, y, orientation)`` rows,
+        where ``orientation`` is an index of ``geometry.ORIENTATIONS``
+    """
+    board_size = board_size if board_size is not None else config.BOARD_SIZE
+    ship_sizes = list(ship_sizes) if ship_sizes is not None else default_ship_sizes()
+    rng = rng if rng is not None else np.random.default_rng()
+    ship_count = len(ship_sizes)
+    layouts = np.zeros((count, ship_count, 3), dtype=np.int16)
+    if count == 0 or ship_count == 0:
+        return layouts
+    if max(ship_sizes) > board_size or min(ship_sizes) < 1:
+        raise LayoutGenerationError("Ships do not fit on the board")
+
+    table = fleet_table(board_size, tuple(sorted(set(ship_sizes))))
+    sizes = np.array(ship_sizes, dtype=np.int64)
+    if blocked is not None:
+        blocked = np.asarray(blocked, dtype=bool).ravel()
+    for start in range(0, count, _CHUNK_SIZE):
+        _fill_layouts(
+            layouts[start : start + _CHUNK_SIZE],
+            table,
+            sizes,
+            board_size**2,
+            rng,
+            max_attempts,
+            max_restarts,
+            blocked,
+        )
+
+    return layouts
+
+
+def consistent_placements(
+    board_size: int,
+    ship_sizes: list,
+    blocked: np.ndarray | None = None,
+    hits: np.ndarray | None = None,
+) -> dict:
+    """Returns the placements of every ship size consistent with the shots on their own:
+    no square blocked, not lying entirely on hits (the ship would have been reported sunk)
+    and no hit next to the ship without being on it
+
+    Args:
+        board_size (int): size of the board
+        ship_sizes (list): sizes of the ships
+        blocked (np.ndarray | None, optional): ``board_size x board_size`` bool mask of cells no ship may occupy. Defaults to None.
+        hits (np.ndarray | None, optional): ``board_size x board_size`` bool mask of cells every layout must cover. Defaults to None.
+
+    Returns:
+        dict: size -> rows of ``fleet_table(board_size, sizes)``, every footprint appears
+        once per orientation that gives it
+    """
+    cell_count = board_size**2
+    table = fleet_table(board_size, tuple(sorted(set(ship_sizes))))
+    # The padding columns are neither blocked nor hit
+    blocked_cells = np.zeros(cell_count + 2, dtype=bool)
+    hit_cells = np.zeros(cell_count + 2, dtype=bool)
+    if blocked is not None:
+        blocked_cells[:cell_count] = np.asarray(blocked, dtype=bool).ravel()
+    if hits is not None:
+        hit_cells[:cell_count] = np.asarray(hits, dtype=bool).ravel()
+
+    placements = {}
+    for size in set(ship_sizes):
+        rows = np.arange(table.group_count[size]) + table.group_start[size]
+        squares = table.square_indexes[rows]
+        consistent = ~blocked_cells[squares].any(axis=1)
+        if hit_cells.any():
+            square_hits = hit_cells[squares].sum(axis=1)
+            consistent &= square_hits < size
+            consistent &= (
+                hit_cells[table.surrounding_indexes[rows]].sum(axis=1) == square_hits
+            )
+        placements[size] = rows[consistent]
+    return placements
+
+
+def draw_layouts(
+    draws: int,
+    board_size: int,
+    ship_sizes: list,
+    rng: np.random.Generator,
+    blocked: np.ndarray | None = None,
+    hits: np.ndarray | None = None,
+) -> np.ndarray:
+    """Draws the placement of every ship independently and keeps the draws that are legal layouts.
+
+    Every legal layout is drawn with the same probability, so the kept layouts
+    are uniform over the legal ones, unlike the ones of ``generate_layouts``,
+    where the first ships shape the space left to the next ones. Most draws
+    are rejected on a full board: about 1 in 460 is kept for the default fleet.
+
+    With hits, only the layouts consistent with them are kept: every hit covered,
+    no ship lying entirely on hits (it would have been reported sunk) and no hit
+    next to a ship it's not part of. One ship is drawn among the placements covering
+    the first hit, the ship being chosen in proportion to the share of its placements
+    covering it, so every consistent layout is still drawn with the same probability.
+
+    Args:
+        draws (int): number of draws
+        board_size (int): size of the board
+        ship_sizes (list): sizes of the ships
+        rng (np.random.Generator): random generator
+        blocked (np.ndarray | None, optional): ``board_size x board_size`` bool mask of cells no ship may occupy. Defaults to None.
+        hits (np.ndarray | None, optional): ``board_size x board_size`` bool mask of cells every layout must cover. Defaults to None.
+
+    Returns:
+        np.ndarray: ``(kept, len(ship_sizes), 3)`` int16 array of ``(x, y, orientation)`` rows,
+        like the ones of ``generate_layouts``
+    """
+    ship_count = len(ship_sizes)
+    table = fleet_table(board_size, tuple(sorted(set(ship_sizes))))
+    no_layout = np.zeros((0, ship_count, 3), dtype=np.int16)
+    placements = consistent_placements(board_size, ship_sizes, blocked, hits)
+    if not all(len(rows) for rows in placements.values()):
+        return no_layout
+    cell_count = board_size**2
+    # The padding columns are not hit
+    hit_cells = np.zeros(cell_count + 2, dtype=bool)
+    if hits is not None:
+        hit_cells[:cell_count] = np.asarray(hits, dtype=bool).ravel()
+    hit_indexes = np.flatnonzero(hit_cells)
+    if hit_indexes.size:
+        covering = {
+            size: rows[(table.square_indexes[rows] == hit_indexes[0]).any(axis=1)]
+            for size, rows in placements.items()
+        }
+
+    picks = np.stack(
+        [
+            placements[size][rng.integers(len(placements[size]), size=draws)]
+            for size in ship_sizes
+        ],
+        axis=1,
+    )
+    if hit_indexes.size:
+        shares = np.array(
+            [len(covering[size]) / len(placements[size]) for size in ship_sizes]
+        )
+        if not shares.any():
+            return no_layout
+        covering_ship = rng.choice(ship_count, size=draws, p=shares / shares.sum())
+        for ship, size in enumerate(ship_sizes):
+            chosen = np.flatnonzero(covering_ship == ship)
+            picks[chosen, ship] = covering[size][
+                rng.integers(len(covering[size]), size=chosen.size)
+            ]
+
+    forbidden = np.zeros((draws, cell_count + 2), dtype=bool)
+    covered = np.zeros(draws, dtype=np.int64)
+    kept = np.arange(draws)
+    # The largest ships collide most often, so most draws are dropped early
+    for ship in np.argsort(ship_sizes, kind="stable")[::-1]:
+        ship_picks = picks[kept, ship]
+        squares = table.square_indexes[ship_picks]
+        legal = ~forbidden[kept[:, None], squares].any(axis=1)
+        kept, ship_picks = kept[legal], ship_picks[legal]
+        forbidden[kept[:, None], table.surrounding_indexes[ship_picks]] = True
+        if hit_indexes.size:
+            covered[kept] += hit_cells[squares[legal]].sum(axis=1)
+    # Ships don't overlap, so they cover every hit if they cover as many squares
+    kept = kept[covered[kept] == hit_indexes.size]
+
+    layouts = np.zeros((len(kept), ship_count, 3), dtype=np.int16)
+    layouts[..., :2] = table.anchors[picks[kept]]
+    layouts[..., 2] = table.orientations[picks[kept]]
+    return layouts
+
+
+def uniform_layouts(
+    count: int,
+    board_size: int | None = None,
+    ship_sizes: list | None = None,
+    rng: np.random.Generator | None = None,
+    blocked: np.ndarray | None = None,
+    max_draws_per_layout: int = 1 << 15,
+) -> np.ndarray:
+    """Generates fleet layouts uniformly at random among all the legal layouts.
+
+    Layouts are drawn with ``draw_layouts`` in growing blocks, starting from a few
+    hundred draws per requested layout. Every kept layout allows ``max_draws_per_layout``
+    more draws, once they are used up the board is too crowded for rejection and
+    the remaining layouts are sampled from a ``UniformLayoutSampler`` instead.
+    If the layouts can't be counted within ``PLACEMENT_TIME_LIMIT`` seconds,
+    the remaining ones are built by ``generate_layouts``, which never dead-ends
+    but doesn't draw them uniformly.
+
+    Args:
+        count (int): number of layouts
+        board_size (int | None, optional): size of the board. Defaults to ``config.BOARD_SIZE``.
+        ship_sizes (list | None, optional): sizes of the ships. Defaults to ``default_ship_sizes()``.
+        rng (np.random.Generator | None, optional): random generator. Defaults to a new unseeded one.
+        blocked (np.ndarray | None, optional): ``board_size x board_size`` bool mask of cells no ship may occupy. Defaults to None.
+        max_draws_per_layout (int, optional): draws per kept layout after which rejection gives up. Defaults to 32 768.
+
+    Raises:
+        LayoutGenerationError: if the ships can't be placed on the board
+
+    Returns:
+        np.ndarray: ``(count, len(ship_sizes), 3)`` int16 array of ``(x, y, orientation)`` rows,
+        like the ones of ``generate_layouts``
+    """
+    board_size = board_size if board_size is not None else config.BOARD_SIZE
+    ship_sizes = list(ship_sizes) if ship_sizes is not None else default_ship_sizes()
+    rng = rng if rng is not None else np.random.default_rng()
+    if count == 0 or not ship_sizes:
+        return np.zeros((count, len(ship_sizes), 3), dtype=np.int16)
+    if max(ship_sizes) > board_size or min(ship_sizes) < 1:
+        raise LayoutGenerationError("Ships do not fit on the board")
+
+    blocks = []
+    accepted = drawn = 0
+    block_size = min(count * _FIRST_DRAWS_PER_LAYOUT, _CHUNK_SIZE)
+    while accepted < count and drawn < (accepted + 1) * max_draws_per_layout:
+        block_size = min(block_size, (accepted + 1) * max_draws_per_layout - drawn)
+        layouts = draw_layouts(block_size, board_size, ship_sizes, rng, blocked)
+        blocks.append(layouts)
+        accepted += len(layouts)
+        drawn += block_size
+        block_size = min(2 * block_size, _CHUNK_SIZE)
+    if accepted < count:
+        blocks.append(
+            _crowded_layouts(count - accepted, board_size, ship_sizes, rng, blocked)
+        )
+    return np.concatenate(blocks)[:count]
+
+
+def _crowded_layouts(
+    count: int,
+    board_size: int,
+    ship_sizes: list,
+    rng: np.random.Generator,
+    blocked: np.ndarray | None,
+) -> np.ndarray:
+    """Generates the layouts rejection can't find. See ``uniform_layouts``"""
+    try:
+        sampler = UniformLayoutSampler(
+            board_size,
+            ship_sizes,
+            blocked=blocked,
+            deadline=monotonic() + PLACEMENT_TIME_LIMIT,
+        )
+    except LayoutGenerationError:
+        # Too many layouts to count them in time
+        return generate_layouts(count, board_size, ship_sizes, rng, blocked=blocked)
+    if not sampler.total:
+        raise LayoutGenerationError(f"Could not place ships {ship_sizes} on the board")
+
+    # Sampling only walks the counted states, so the deadline can't pass anymore
+    return np.array(
+        [
+            [
+                (x, y, ORIENTATIONS.index(orientation))
+                for x, y, orientation in sampler.sample(rng)
+            ]
+            for _ in range(count)
+        ],
+        dtype=np.int16,
+    )
+
+
+def random_layout(
+    board_size: int | None = None,
+    ship_sizes: list | None = None,
+    rng: np.random.Generator | None = None,
+) -> list:
+    """Generates a single fleet layout, uniformly at random among the legal ones (see ``uniform_layouts``)
+
+    Args:
+        board_size (int | None, optional): size of the board. Defaults to ``config.BOARD_SIZE``.
+        ship_sizes (list | None, optional): sizes of the ships. Defaults to ``default_ship_sizes()``.
+        rng (np.random.Generator | None, optional): random generator. Defaults to a new unseeded one.
+
+    Raises:
+        LayoutGenerationError: if the ships can't be placed on the board
+
+    Returns:
+        list: ``(x, y, orientation)`` tuple for every ship
+    """
+    layout = uniform_layouts(1, board_size, ship_sizes, rng)[0]
+    return [(int(x), int(y), ORIENTATIONS[orientation]) for x, y, orientation in layout]
+
+
+class UniformLayoutSampler:
+    def __init__(
+        self,
+        board_size: int | None = None,
+        ship_sizes: list | None = None,
+        max_states: int = 2_000_000,
+        blocked: np.ndarray | None = None,
+        hits: np.ndarray | None = None,
+        deadline: float | None = None,
+    ) -> None:
+        """Samples fleet layouts uniformly from the space of all legal layouts.
+
+        Every set of ship footprints is enumerated exactly once by placing
+        the footprints in increasing order of their first cell. The number
+        of completions of every partial layout is counted once (memoized
+        by the remaining ships and the part of the forbidden cells mask
+        that can still matter), and sampling walks down that tree with
+        exact probabilities, so no draw is ever rejected.
+
+        Layouts can be restricted to the ones consistent with observed shots:
+        no ship on a blocked cell, every hit covered and no ship lying
+        entirely on hits (it would have been reported sunk).
+
+        The counting is exponential in the board size, so it is meant for
+        small boards, small fleets and heavily constrained endgames.
+
+        Args:
+            board_size (int | None, optional): size of the board. Defaults to ``config.BOARD_SIZE``.
+            ship_sizes (list | None, optional): sizes of the ships. Defaults to ``default_ship_sizes()``.
+            max_states (int, optional): memoized states after which counting gives up. Defaults to 2 000 000.
+            blocked (np.ndarray | None, optional): ``board_size x board_size`` bool mask of cells no ship may occupy. Defaults to None.
+            hits (np.ndarray | None, optional): ``board_size x board_size`` bool mask of cells every layout must cover. Defaults to None.
+            deadline (float | None, optional): ``time.monotonic()`` value after which counting gives up,
+                ``math.inf`` for no limit. Defaults to ``COUNT_TIME_LIMIT`` seconds from now.
+
+        Raises:
+            LayoutGenerationError: if the layout space is too large to be counted or the deadline has passed
+        """
+        self._board_size = board_size if board_size is not None else config.BOARD_SIZE
+        self._ship_sizes = (
+            list(ship_sizes) if ship_sizes is not None else default_ship_sizes()
+        )
+        self._max_states = max_states
+        self._deadline = (
+            deadline if deadline is not None else monotonic() + COUNT_TIME_LIMIT
+        )
+        self._sizes = sorted(set(self._ship_sizes))
+        self._initial = tuple(self._ship_sizes.count(size) for size in self._sizes)
+        blocked_mask = _bits(blocked) if blocked is not None else 0
+        self._hits = _bits(hits) if hits is not None else 0
+
+        # Canonical footprints, one per set of squares, sorted by their first cell
+        footprints = []
+        for size_index, size in enumerate(self._sizes):
+            for orientation in ("UP", "RIGHT") if size > 1 else ("UP",):
+                for anchor in placement_table(
+                    self._board_size, size, orientation
+                ).anchors:
+                    geometry = ship_geometry(
+                        self._board_size,
+                        size,
+                        orientation,
+                        tuple(int(v) for v in anchor),
+                    )
+                    if not self._consistent(geometry, blocked_mask):
+                        continue
+                    footprints.append(
+                        (geometry.square_indexes[0], size_index, orientation, geometry)
+                    )
+        footprints.sort(key=lambda footprint: footprint[0])
+
+        self._first_cells = [footprint[0] for footprint in footprints]
+        # Two footprints starting in the same cell can't both be used,
+        # so after using one the search continues from the next cell
+        self._next_starts = [
+            bisect_right(self._first_cells, first_cell)
+            for first_cell in self._first_cells
+        ]
+        self._size_indexes = [footprint[1] for footprint in footprints]
+        self._orientations = [footprint[2] for footprint in footprints]
+        self._geometries = [footprint[3] for footprint in footprints]
+        self._memo = {}
+        # Hits before the first footprint can't be covered by any layout
+        reachable = not self._hits & ((1 << self._threshold(0)) - 1)
+        self._total = self._count(self._initial, 0, 0) if reachable else 0
+        if deadline is None:
+            # The rest walks the counted states only, so it takes about as long as the counting
+            self._deadline = inf
+
+    @property
+    def total(self) -> int:
+        """Number of distinct legal layouts (as sets of ship footprints)
+
+        Returns:
+            int: layout count
+        """
+        return self._total
+
+    def _consistent(self, geometry: ShipGeometry, blocked: int) -> bool:
+        """Checks if a footprint agrees with the blocked cells and the hits"""
+        if geometry.square_mask & blocked:
+            return False
+        if self._hits:
+            # A ship lying entirely on hits would have been reported sunk
+            if not geometry.square_mask & ~self._hits:
+                return False
+            # A hit next to a ship can't belong to another ship
+            if geometry.surrounding_mask & ~geometry.square_mask & self._hits:
+                return False
+        return True
+
+    def _threshold(self, start: int) -> int:
+        """Returns the first cell that footprints from ``start`` on can cover"""
+        if start >= len(self._first_cells):
+            return self._board_size**2
+        return self._first_cells[start]
+
+    def _covers_hits(self, start: int, next_start: int, forbidden: int) -> bool:
+        """Checks that the hits no footprint from ``next_start`` on can reach are covered.
+        The hits before ``start`` are already known to be covered.
+        """
+        uncovered = self._relevant(self._hits, start) & ~forbidden
+        return not uncovered & ((1 << self._threshold(next_start)) - 1)
+
+    def _check_deadline(self) -> None:
+        """Raises ``LayoutGenerationError`` if the deadline has passed"""
+        if monotonic() > self._deadline:
+            raise LayoutGenerationError("Layout counting ran out of time")
+
+    def _relevant(self, forbidden: int, start: int) -> int:
+        """Drops the bits of the cells that no footprint from ``start`` on can cover"""
+        if start >= len(self._first_cells):
+            return 0
+        return forbidden >> self._first_cells[start] << self._first_cells[start]
+
+    def _count(self, remaining: tuple, start: int, forbidden: int) -> int:
+        """Counts the completions of a partial layout
+
+        Args:
+            remaining (tuple): number of ships left to place for every size
+            start (int): first footprint that may still be used
+            forbidden (int): bitmask of the forbidden cells
+
+        Raises:
+            LayoutGenerationError: if the memo grows over ``max_states`` or the deadline passes
+
+        Returns:
+            int: number of completions
+        """
+        if not any(remaining):
+            return int(not self._relevant(self._hits, start) & ~forbidden)
+
+        key = (remaining, start, forbidden)
+        if key in self._memo:
+            return self._memo[key]
+        if len(self._memo) >= self._max_states:
+            raise LayoutGenerationError(
+                "Layout space is too large to be counted exactly"
+            )
+        # Checking the clock on every state would slow the counting down
+        if not len(self._memo) % _DEADLINE_CHECK_INTERVAL:
+            self._check_deadline()
+
+        total = 0
+        for _, child in self._children(remaining, start, forbidden):
+            total += self._count(*child)
+
+        self._memo[key] = total
+        return total
+
+    def _children(self, remaining: tuple, start: int, forbidden: int):
+        """Yields every footprint that can be placed next and the state it leads to"""
+        # A hit left behind by the next footprint could never be covered
+        uncovered = self._relevant(self._hits, start) & ~forbidden
+        last_first_cell = (uncovered & -uncovered).bit_length() - 1
+        if last_first_cell < 0:
+            last_first_cell = self._board_size**2
+
+        for footprint in range(start, len(self._geometries)):
+            if self._first_cells[footprint] > last_first_cell:
+                break
+            size_index = self._size_indexes[footprint]
+            geometry = self._geometries[footprint]
+            if not remaining[size_index] or forbidden & geometry.square_mask:
+                continue
+
+            child_remaining = list(remaining)
+            child_remaining[size_index] -= 1
+            next_start = self._next_starts[footprint]
+            child_forbidden = forbidden | geometry.surrounding_mask
+            if not self._covers_hits(start, next_start, child_forbidden):
+                continue
+            yield footprint, (
+                tuple(child_remaining),
+                next_start,
+                self._relevant(child_forbidden, next_start),
+            )
+
+    def probabilities(self) -> np.ndarray:
+        """Returns the exact probability of every cell being occupied in a legal layout.
+
+        The number of ways to reach every memoized state is propagated forward
+        in order of the states' first usable footprint, so the number of layouts
+        using a footprint is the ways to reach a state times the completions
+        after choosing it.
+
+        Raises:
+            LayoutGenerationError: if the deadline passes
+
+        Returns:
+            np.ndarray: ``board_size x board_size`` float matrix indexed by ``[x, y]``,
+            all zeros if there is no legal layout
+        """
+        cell_count = self._board_size**2
+        probabilities = np.zeros(cell_count)
+        if not self._total:
+            return probabilities.reshape(self._board_size, self._board_size)
+
+        root = (self._initial, 0, 0)
+        ways = {root: 1}
+        pending = [[] for _ in range(len(self._geometries) + 1)]
+        pending[0].append(root)
+        layouts_using = [0] * len(self._geometries)
+        for states in pending:
+            self._check_deadline()
+            for state in states:
+                if not any(state[0]):
+                    continue
+                for footprint, child in self._children(*state):
+                    completions = self._count(*child)
+                    if not completions:
+                        continue
+                    layouts_using[footprint] += ways[state] * completions
+                    if child not in ways:
+                        ways[child] = 0
+                        pending[child[1]].append(child)
+                    ways[child] += ways[state]
+
+        cell_layouts = [0] * cell_count
+        for geometry, count in zip(self._geometries, layouts_using):
+            for index in geometry.square_indexes:
+                cell_layouts[index] += count
+        probabilities[:] = [count / self._total for count in cell_layouts]
+        return probabilities.reshape(self._board_size, self._board_size)
+
+    def sample(self, rng: np.random.Generator | None = None) -> list:
+        """Draws one layout uniformly at random
+
+        Args:
+            rng (np.random.Generator | None, optional): random generator. Defaults to a new unseeded one.
+
+        Raises:
+            LayoutGenerationError: if there is no legal layout
+
+        Returns:
+            list: ``(x, y, orientation)`` tuple for every ship in ``ship_sizes`` order
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        if not self._total:
+            raise LayoutGenerationError("There is no legal layout")
+
+        state = (self._initial, 0, 0)
+        chosen = {size_index: [] for size_index in range(len(self._sizes))}
+        while any(state[0]):
+            target = _below(rng, self._count(*state))
+            for footprint, child in self._children(*state):
+                target -= self._count(*child)
+                if target < 0:
+                    break
+            chosen[self._size_indexes[footprint]].append(footprint)
+            state = child
+
+        for footprints in chosen.values():
+            rng.shuffle(footprints)
+
+        layout = []
+        for size in self._ship_sizes:
+            footprint = chosen[self._sizes.index(size)].pop()
+            layout.append(self._oriented(footprint, rng))
+        return layout
+
+    def _oriented(self, footprint: int, rng: np.random.Generator) -> tuple:
+        """Picks one of the equivalent orientations of a footprint at random
+
+        Returns:
+            tuple: ``(x, y, orientation)``
+        """
+        squares = self._geometries[footprint].squares
+        if len(squares) == 1:
+            return (*squares[0], ORIENTATIONS[rng.integers(len(ORIENTATIONS))])
+
+        if rng.random() < 0.5:
+            return (*squares[0], self._orientations[footprint])
+        reversed_orientation = (
+            "DOWN" if self._orientations[footprint] == "UP" else "LEFT"
+        )
+        return (*squares[-1], reversed_orientation)
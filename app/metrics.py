@@ -0,0 +1,235 @@
+from bisect import bisect_left
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from time import perf_counter
+from typing import Callable
+import os
+
+# Instrumentation is switched on before the modules are imported, with BATTLESHIPS_METRICS=1.
+# Otherwise ``instrumented`` returns the functions unchanged and ``increment`` does nothing,
+# so the production code runs exactly as without instrumentation.
+ENABLED = os.environ.get("BATTLESHIPS_METRICS") == "1"
+
+# Upper bounds of the latency histogram buckets in seconds, from 1 us to 1 s
+BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3)
+BUCKETS += (2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0)
+
+# name -> (type, description)
+_descriptions = {}
+# (name, labels) -> [count of every bucket and of +Inf, sum]
+_histograms = {}
+# (name, labels) -> value
+_counters = {}
+# Guards the exports, which may run in the thread of the HTTP server
+_lock = Lock()
+
+
+def _describe(name: str, kind: str, description: str) -> None:
+    """Registers the type and help text of a metric"""
+    _descriptions.setdefault(name, (kind, description))
+
+
+def observe(name: str, seconds: float, labels: tuple = ()) -> None:
+    """Records a value in a histogram
+
+    Args:
+        name (str): name of the histogram
+        seconds (float): recorded latency
+        labels (tuple, optional): sorted ``(label, value)`` pairs. Defaults to ().
+    """
+    histogram = _histograms.get((name, labels))
+    if histogram is None:
+        histogram = _histograms[(name, labels)] = [[0] * (len(BUCKETS) + 1), 0.0]
+    histogram[0][bisect_left(BUCKETS, seconds)] += 1
+    histogram[1] += seconds
+
+
+def _increment(name: str, description: str, amount: float = 1, **labels) -> None:
+    """Adds to a counter
+
+    Args:
+        name (str): name of the counter, ending with ``_total``
+        description (str): help text of the counter
+        amount (float, optional): value added. Defaults to 1.
+        **labels: labels of the counter
+    """
+    _describe(name, "counter", description)
+    key = (name, tuple(sorted(labels.items())))
+    _counters[key] = _counters.get(key, 0) + amount
+
+
+def _ignore(name: str, description: str, amount: float = 1, **labels) -> None:
+    pass
+
+
+increment = _increment if ENABLED else _ignore
+
+
+def instrumented(
+    name: str, description: str, result_label: bool = False, **labels
+) -> Callable:
+    """Decorator recording the latency of every call of a function in a histogram.
+    It returns the function unchanged if the instrumentation is disabled.
+
+    Args:
+        name (str): name of the histogram, ending with ``_seconds``
+        description (str): help text of the histogram
+        result_label (bool, optional): if the calls are labeled with the name of the returned enum,
+            e.g. ``AttackResult``. Defaults to False.
+        **labels: labels of the histogram
+
+    Returns:
+        Callable: decorator
+    """
+
+    def decorator(function: Callable) -> Callable:
+        if not ENABLED:
+            return function
+
+        _describe(name, "histogram", description)
+        fixed_labels = tuple(sorted(labels.items()))
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            result = function(*args, **kwargs)
+            seconds = perf_counter() - start
+            if result_label:
+                observe(
+                    name,
+                    seconds,
+                    tuple(sorted(fixed_labels + (("result", result.name),))),
+                )
+            else:
+                observe(name, seconds, fixed_labels)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def snapshot(reset: bool = False) -> dict:
+    """Returns a copy of the recorded metrics, e.g. to send them from a worker process
+
+    Args:
+        reset (bool, optional): if the recorded metrics are cleared. Defaults to False.
+
+    Returns:
+        dict: metrics that can be added to another process with ``merge``
+    """
+    with _lock:
+        data = {
+            "descriptions": dict(_descriptions),
+            "histograms": {
+                key: [list(buckets), total]
+                for key, (buckets, total) in _histograms.items()
+            },
+            "counters": dict(_counters),
+        }
+        if reset:
+            _histograms.clear()
+            _counters.clear()
+    return data
+
+
+def merge(data: dict) -> None:
+    """Adds metrics recorded elsewhere to the metrics of this process
+
+    Args:
+        data (dict): metrics from ``snapshot``
+    """
+    with _lock:
+        for name, description in data["descriptions"].items():
+            _descriptions.setdefault(name, description)
+        for key, (buckets, total) in data["histograms"].items():
+            histogram = _histograms.setdefault(key, [[0] * len(buckets), 0.0])
+            histogram[0] = [a + b for a, b in zip(histogram[0], buckets)]
+            histogram[1] += total
+        for key, value in data["counters"].items():
+            _counters[key] = _counters.get(key, 0) + value
+
+
+def _format_labels(labels: tuple) -> str:
+    """Formats ``(label, value)`` pairs as ``{label="value",...}``"""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{label}="{value}"' for label, value in labels) + "}"
+
+
+def exposition() -> str:
+    """Returns the recorded metrics in the Prometheus text exposition format
+
+    Returns:
+        str: exposition text
+    """
+    lines = []
+    with _lock:
+        # Copied at once, the instrumented code records without taking the lock
+        counters = sorted(list(_counters.items()))
+        histograms = sorted(list(_histograms.items()))
+        for name, (kind, description) in sorted(list(_descriptions.items())):
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == "counter":
+                for (counter, labels), value in counters:
+                    if counter == name:
+                        lines.append(f"{name}{_format_labels(labels)} {value}")
+                continue
+
+            for (histogram, labels), (buckets, total) in histograms:
+                if histogram != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(BUCKETS + ("+Inf",), buckets):
+                    cumulative += count
+                    bucket_labels = _format_labels(labels + (("le", bound),))
+                    lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {total}")
+                lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+def write(path: str) -> None:
+    """Writes the metrics to a file, e.g. for the textfile collector of the node exporter.
+    The file is replaced at once, so it's never read half written.
+
+    Args:
+        path (str): path of the file
+    """
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w") as file:
+        file.write(exposition())
+    os.replace(temporary, path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.path not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = exposition().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+def serve(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serves the metrics on ``http://host:port/metrics`` from a background thread
+
+    Args:
+        port (int): port of the server, ``0`` picks a free one
+        host (str, optional): address of the server. Defaults to "127.0.0.1".
+
+    Returns:
+        ThreadingHTTPServer: running server, stopped with ``shutdown()``
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server
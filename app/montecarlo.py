@@ -0,0 +1,249 @@
+from concurrent.futures import Executor, ProcessPoolExecutor
+from time import monotonic
+import atexit
+from knowledge import KnowledgeBoard
+from layouts import draw_layouts
+from solver import ExactTargeting, constraint_masks
+from targeting import DensityTargeting
+import numpy as np
+import os
+
+# Layouts drawn per batch by a worker before checking the time limit (about 0.6 µs per draw).
+# Batches start small and double, so short time limits are not overshot.
+_FIRST_BATCH_SIZE = 1 << 10
+_BATCH_SIZE = 1 << 13
+
+# Process pools shared by all the Monte Carlo players, by number of workers
+_pools = {}
+
+
+def _get_pool(workers: int) -> Executor:
+    """Returns the shared process pool with the given number of workers, creating it if needed
+
+    Args:
+        workers (int): number of worker processes
+
+    Returns:
+        Executor: process pool
+    """
+    if workers not in _pools:
+        _pools[workers] = ProcessPoolExecutor(max_workers=workers)
+    return _pools[workers]
+
+
+@atexit.register
+def shutdown_pools() -> None:
+    """Stops the workers of the shared process pools, it's also called when the interpreter exits"""
+    for pool in _pools.values():
+        pool.shutdown(cancel_futures=True)
+    _pools.clear()
+
+
+def layout_cells(layouts: np.ndarray, board_size: int, ship_sizes: list) -> np.ndarray:
+    """Returns the flat indexes of the squares of every ship of every layout
+
+    Args:
+        layouts (np.ndarray): ``(count, ships, 3)`` layouts from ``layouts.draw_layouts``
+        board_size (int): size of the board
+        ship_sizes (list): sizes of the ships, in the order of the layouts
+
+    Returns:
+        np.ndarray: ``(count, ships, max(ship_sizes))`` int array, squares past the end
+        of a shorter ship are set to ``board_size ** 2``
+    """
+    # Flat index step of UP, DOWN, LEFT and RIGHT (see geometry.ORIENTATIONS)
+    steps = np.array([1, -1, -board_size, board_size])
+    sizes = np.asarray(ship_sizes)
+    along = np.arange(sizes.max())
+
+    anchors = layouts[..., 0].astype(np.int64) * board_size + layouts[..., 1]
+    cells = anchors[..., None] + along * steps[layouts[..., 2]][..., None]
+    return np.where(along < sizes[:, None], cells, board_size**2)
+
+
+def sample_occupancy(
+    board_size: int,
+    ship_sizes: list,
+    blocked: np.ndarray,
+    hits: np.ndarray,
+    samples: int,
+    time_limit: float,
+    seed: int | None = None,
+) -> tuple:
+    """Samples random layouts of the remaining fleet consistent with the observed shots
+    and counts how many of them occupy every cell.
+
+    Layouts are drawn uniformly among the legal layouts that avoid the blocked
+    cells, cover all the hits and have no ship lying entirely on hits (it would
+    have been reported sunk), see ``layouts.draw_layouts``. They are therefore
+    a sample of the exact posterior of the enemy layout given the shots.
+
+    Args:
+        board_size (int): size of the board
+        ship_sizes (list): sizes of the ships still afloat
+        blocked (np.ndarray): ``board_size x board_size`` bool mask of cells no ship may occupy
+        hits (np.ndarray): ``board_size x board_size`` bool mask of hits on ships still afloat
+        samples (int): number of accepted layouts after which sampling stops
+        time_limit (float): seconds after which sampling stops
+        seed (int | None, optional): seed of the random generator. Defaults to None.
+
+    Returns:
+        tuple: ``(counts, accepted)``, the flat ``board_size ** 2`` occupancy counts
+        and the number of accepted layouts
+    """
+    deadline = monotonic() + time_limit
+    rng = np.random.default_rng(seed)
+    cell_count = board_size**2
+
+    counts = np.zeros(cell_count, dtype=np.int64)
+    accepted = 0
+    batch_size = _FIRST_BATCH_SIZE
+    while accepted < samples and monotonic() < deadline:
+        layouts = draw_layouts(batch_size, board_size, ship_sizes, rng, blocked, hits)
+        layouts = layouts[: samples - accepted]
+        batch_size = min(2 * batch_size, _BATCH_SIZE)
+        if not len(layouts):
+            continue
+
+        cells = layout_cells(layouts, board_size, ship_sizes)
+        counts += np.bincount(cells.ravel(), minlength=cell_count + 1)[:cell_count]
+        accepted += len(layouts)
+
+    return counts, accepted
+
+
+class MonteCarloTargeting(ExactTargeting):
+    def __init__(
+        self,
+        board_size: int,
+        ship_sizes: list,
+        rng: np.random.Generator | None = None,
+        samples: int = 2000,
+        time_limit: float = 0.08,
+        workers: int | None = None,
+        threshold: float = 2e4,
+        max_states: int = 50_000,
+        knowledge: KnowledgeBoard | None = None,
+    ) -> None:
+        """Targeting that samples enemy fleet layouts consistent with all the observed shots
+        and shoots at the cell occupied in most of them.
+
+        Sampling is split evenly between the workers of a shared process pool.
+        Every worker stops when it has its share of the samples or when the time
+        limit has passed, so a move takes at most about ``time_limit`` seconds.
+        When there are few enough consistent layouts, they are enumerated
+        exactly instead (see ``solver.ExactTargeting``). If no consistent
+        layout is found in time, it falls back to the ``DensityTargeting`` heat map.
+
+        Args:
+            board_size (int): size of the enemy board
+            ship_sizes (list): sizes of the enemy ships
+            rng (np.random.Generator | None, optional): random generator used to break ties and seed the workers. Defaults to a new unseeded one.
+            samples (int, optional): number of consistent layouts sampled per move. Defaults to 2000.
+            time_limit (float, optional): sampling time limit per move in seconds. Defaults to 0.08.
+            workers (int | None, optional): number of worker processes, ``1`` samples in the current process. Defaults to the number of CPUs.
+            threshold (float, optional): estimated layout count under which the layouts are enumerated. Defaults to 2e4.
+            max_states (int, optional): memoized states after which the enumeration gives up. Defaults to 50 000.
+            knowledge (KnowledgeBoard | None, optional): board the shots are recorded on, shared with the player. Defaults to a new one.
+        """
+        super().__init__(board_size, ship_sizes, rng, threshold, max_states, knowledge)
+        self._samples = samples
+        self._time_limit = time_limit
+        self._workers = workers if workers is not None else os.cpu_count() or 1
+        self._accepted = 0
+
+    @property
+    def accepted(self) -> int:
+        """Returns the number of consistent layouts behind the last density
+
+        Returns:
+            int: number of accepted layouts
+        """
+        return self._accepted
+
+    def _sample_arguments(self) -> tuple:
+        """Returns the arguments of ``sample_occupancy`` shared by all the workers
+
+        Returns:
+            tuple: board size, remaining ship sizes, blocked cells and hits
+        """
+        ship_sizes = [
+            size for size, count in self._remaining.items() for _ in range(count)
+        ]
+        blocked, hits = constraint_masks(self._state)
+        return self._board_size, ship_sizes, blocked, hits
+
+    def _sample(self, time_limit: float) -> np.ndarray:
+        """Samples consistent layouts on all the workers and sets ``accepted``
+
+        Args:
+            time_limit (float): sampling time limit in seconds
+
+        Returns:
+            np.ndarray: ``size x size`` matrix of the number of sampled layouts occupying every cell
+        """
+        board_size, ship_sizes, blocked, hits = self._sample_arguments()
+        if not ship_sizes:
+            self._accepted = 0
+            return np.zeros((board_size, board_size))
+
+        shares = [
+            self._samples // self._workers + (worker < self._samples % self._workers)
+            for worker in range(self._workers)
+        ]
+        seeds = self._rng.integers(2**63, size=self._workers)
+        if not self._samples:
+            results = []
+        elif self._workers == 1:
+            results = [
+                sample_occupancy(
+                    board_size,
+                    ship_sizes,
+                    blocked,
+                    hits,
+                    shares[0],
+                    time_limit,
+                    seeds[0],
+                )
+            ]
+        else:
+            pool = _get_pool(self._workers)
+            futures = [
+                pool.submit(
+                    sample_occupancy,
+                    board_size,
+                    ship_sizes,
+                    blocked,
+                    hits,
+                    share,
+                    time_limit,
+                    seed,
+                )
+                for share, seed in zip(shares, seeds)
+                if share
+            ]
+            results = [future.result() for future in futures]
+
+        # Workers with no share of the samples are not run
+        counts = sum(
+            (counts for counts, _ in results),
+            np.zeros(board_size**2, dtype=np.int64),
+        )
+        self._accepted = sum(accepted for _, accepted in results)
+        return counts.reshape(board_size, board_size).astype(float)
+
+    def density(self) -> np.ndarray:
+        """Returns the number of sampled consistent layouts occupying every cell
+
+        Returns:
+            np.ndarray: ``size x size`` float matrix indexed by ``[x, y]``
+        """
+        exact = self._exact_density()
+        if exact is not None:
+            self._accepted = 0
+            return exact
+
+        counts = self._sample(self._time_limit)
+        if not self._accepted:
+            return DensityTargeting.density(self)
+        return counts
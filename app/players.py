@@ -1,10 +1,16 @@
 from boards import Board
+from knowledge import KnowledgeBoard
 from ships import Ship, get_default_ship_set
 from ui import CLI, ActionAborted
 from utils import AttackResult
-from random import choice
+from layouts import random_layout
+from metrics import instrumented
+from profiling import AI_DECISION, ATTACK, marked
+from strategies import get_strategy
+from typing import Callable
 from config import config
 import cli_config
+import numpy as np
 
 
 class EnemyUnsetError(Exception):
@@ -18,6 +24,8 @@ class Player:
         ships: list = None,
         side: int = config.DEFAULT_PLAYER_SIDE,
         ui: CLI | None = None,
+        board_class: type[Board] = Board,
+        rng: np.random.Generator | None = None,
     ) -> None:
         """Player class
 
@@ -26,16 +34,23 @@ class Player:
             ships (list, optional): initial ship list. If not set, default ship set will be used. Defaults to None.
             side (int, optional): side to display the board (0 - left, 1 - right)
             ui (CLI | None, optional): CLI object to use. (if not set CLI will not be used) Defaults to None
+            board_class (type[Board], optional): board engine to use. Defaults to Board
+            rng (np.random.Generator | None, optional): random generator of the random placement. Defaults to a new unseeded one.
         """
         ships = ships if ships else get_default_ship_set()
         self._ships = {ship.uuid: ship for ship in ships}
         self._name = name
-        self._board = Board(self)
+        self._board = board_class(self)
         self._side = side
         self._enemy = None
-        self._fleet_strength = sum([ship.size for ship in ships])
+        self._knowledge = None
+        # Player's fleet strength (sum of all ships' sizes), a plain attribute
+        # as the boards decrement it on every hit
+        self.fleet_strength = sum([ship.size for ship in ships])
         self._ui = ui
+        self._rng = rng if rng is not None else np.random.default_rng()
         self._last_attack_result = None
+        self._last_attack_location = None
 
     @property
     def ships(self) -> dict[int, Ship]:
@@ -64,6 +79,19 @@ class Player:
         """
         return self._side
 
+    @property
+    def rng(self) -> np.random.Generator:
+        """Returns the random generator of the player's decisions
+
+        Returns:
+            np.random.Generator: random generator
+        """
+        return self._rng
+
+    @rng.setter
+    def rng(self, value: np.random.Generator) -> None:
+        self._rng = value
+
     @property
     def board(self) -> Board:
         """Returns the player's board object
@@ -87,6 +115,20 @@ class Player:
             raise EnemyUnsetError("Enemy board is not set")
         return self._enemy.board
 
+    @property
+    def knowledge(self) -> KnowledgeBoard:
+        """Returns what the player knows about the enemy's board from the results of its attacks
+
+        Raises:
+            EnemyUnsetError: if the enemy is not set
+
+        Returns:
+            KnowledgeBoard: player's knowledge of the enemy's board
+        """
+        if self._knowledge is None:
+            raise EnemyUnsetError("Enemy board is not set")
+        return self._knowledge
+
     @property
     def last_attack_result(self) -> AttackResult:
         """Returns the last attack result
@@ -101,17 +143,13 @@ class Player:
         self._last_attack_result = value
 
     @property
-    def fleet_strength(self) -> int:
-        """Returns the player's fleet strength (sum of all ships' sizes)
+    def last_attack_location(self) -> tuple | None:
+        """Returns the location of the last attack
 
         Returns:
-            int: player's fleet strength
+            tuple | None: (x, y) location, None if the player hasn't attacked yet
         """
-        return self._fleet_strength
-
-    @fleet_strength.setter
-    def fleet_strength(self, value: int) -> None:
-        self._fleet_strength = value
+        return self._last_attack_location
 
     def set_enemy(self, enemy: "Player") -> None:
         """Sets the enemy
@@ -120,6 +158,9 @@ class Player:
             enemy (Player): enemy player
         """
         self._enemy = enemy
+        self._knowledge = KnowledgeBoard(
+            enemy.board.size, [ship.size for ship in enemy.ships.values()]
+        )
 
     def _edit_board(self):
         """Edits the board using the user input.
@@ -161,6 +202,24 @@ class Player:
             self.board,
         )()
 
+    def _randomize_board(self, placement: Callable = random_layout) -> None:
+        """Places all the ships randomly. Ships that are already on the board are placed again.
+
+        Args:
+            placement (Callable, optional): placement policy, see ``strategies.Strategy``. Defaults to ``layouts.random_layout``,
+                uniform among the legal layouts, with the backtracking ``layouts.generate_layouts`` as a fallback
+                on fleets too crowded to sample, so the ships can always be placed if there is room for them.
+        """
+        ships = list(self.ships.values())
+        for ship in ships:
+            if ship.location:
+                self.board.remove_ship(ship.uuid)
+
+        layout = placement(self.board.size, [ship.size for ship in ships], self._rng)
+        for ship, (x, y, orientation) in zip(ships, layout):
+            self.board.add_ship(ship.uuid, (x, y), orientation)
+            ship.under_edition = False
+
     def initialize_board(self) -> None:
         """Initializes the board using the user input"""
         i = 0
@@ -182,11 +241,7 @@ class Player:
                     i -= 1
 
         if randomize:
-            for ship in self.ships.values():
-                orientation = choice(["UP", "DOWN", "LEFT", "RIGHT"])
-                x, y = choice(self.board.get_possible_locations(ship.size, orientation))
-                self.board.move_ship(ship.uuid, (x, y), orientation)
-                ship.under_edition = False
+            self._randomize_board()
 
         self._ui.show_menu(
             "Do you confirm this ship placement?",
@@ -205,12 +260,33 @@ class Player:
 
         while True:
             x, y = self._ui.get_location(
-                self.enemy_board, self.board, True, cli_config.instructions["attacking"]
+                self.enemy_board,
+                self.board,
+                True,
+                cli_config.instructions["attacking"],
+                knowledge=self.knowledge,
             )
-            if self.enemy_board.cell(x, y) is None or self.enemy_board.cell(x, y).alive:
-                self.last_attack_result = self.enemy_board.attack(x, y)
+            if not self.knowledge.is_shot(x, y):
                 break
 
+        self._last_attack_location = (x, y)
+        self.last_attack_result = self._attack(x, y)
+        self.knowledge.record((x, y), self.last_attack_result)
+        return self.last_attack_result
+
+    @marked(ATTACK)
+    def _attack(self, x: int, y: int) -> AttackResult:
+        """Attacks the given location of the enemy board
+
+        Args:
+            x (int): x coordinate
+            y (int): y coordinate
+
+        Returns:
+            AttackResult: result of the attack
+        """
+        return self.enemy_board.attack(x, y)
+
 
 class AIPlayer(Player):
     def __init__(
@@ -218,6 +294,11 @@ class AIPlayer(Player):
         name: str = "AI",
         ships: list = None,
         side: int = config.DEFAULT_PLAYER_SIDE,
+        board_class: type[Board] = Board,
+        strategy: str = "hunt_target",
+        targeting_options: dict | None = None,
+        time_budget: float | None = None,
+        rng: np.random.Generator | None = None,
     ) -> None:
         """Player that makes smart moves on its own
 
@@ -225,72 +306,92 @@ class AIPlayer(Player):
             name (str, optional): player's name. Defaults to "Unnamed".
             ships (list, optional): initial ship list. If not set, default ship set will be used. Defaults to None.
             side (int, optional): side to display the board (0 - left, 1 - right)
+            board_class (type[Board], optional): board engine to use. Defaults to Board
+            strategy (str, optional): name of a strategy registered in ``strategies.STRATEGIES``. Defaults to "hunt_target"
+            targeting_options (dict | None, optional): keyword arguments of the targeting, added to the strategy's options, e.g. ``{"samples": 500}``. Defaults to None.
+            time_budget (float | None, optional): default time budget of a move in seconds, used by the anytime strategies. Defaults to None.
+            rng (np.random.Generator | None, optional): random generator of the placement and the targeting. Defaults to a new unseeded one.
+
+        Raises:
+            UnknownStrategyError: if the strategy is unknown
         """
-        self._target_list = []
-        self._previous_hit = None
-        self._previous_shots = []
-        super().__init__(name, ships, side, None)
+        self._strategy = get_strategy(strategy)
+        self._targeting = None
+        self._targeting_options = {
+            **self._strategy.options,
+            **(targeting_options or {}),
+        }
+        self._time_budget = time_budget
+        super().__init__(name, ships, side, None, board_class, rng)
 
     def set_enemy(self, enemy: "Player") -> None:
-        return super().set_enemy(enemy)
+        """Sets the enemy, the targeting starts over with the new knowledge board
+
+        Args:
+            enemy (Player): enemy player
+        """
+        super().set_enemy(enemy)
+        self._targeting = None
 
     def initialize_board(self) -> None:
-        """Initializes the board with random ship placement"""
-        for ship in self.ships.values():
-            orientation = choice(["UP", "DOWN", "LEFT", "RIGHT"])
-            x, y = choice(self.board.get_possible_locations(ship.size, orientation))
-            self.board.move_ship(ship.uuid, (x, y), orientation)
-            ship.under_edition = False
+        """Initializes the board with the placement policy of the strategy"""
+        self._randomize_board(self._strategy.placement)
 
-    def attack_enemy(self) -> AttackResult:
-        """Attacks the enemy using the hunt-target strategy.
-        Hunt mode: hitting random cells. If the last attack was a hit, the algorithm switches to target mode.
-        Target mode: hitting cells around the last hit cell. If the ship is sunk, the algorithm switches to hunt mode.
+    @instrumented(
+        "battleships_ai_attack_enemy_seconds",
+        "Latency of AIPlayer.attack_enemy, choosing the target included",
+        result_label=True,
+    )
+    def attack_enemy(self, time_budget: float | None = None) -> AttackResult:
+        """Attacks the enemy using the targeting of the selected strategy
+
+        Args:
+            time_budget (float | None, optional): time budget of the move in seconds. The anytime strategies
+                return the best target found in time. Defaults to the one given to the constructor.
+
+        Raises:
+            EnemyUnsetError: if the enemy is not set
 
         Returns:
             AttackResult: result of the attack
         """
         if self._enemy is None:
             raise EnemyUnsetError("Enemy is not set")
-        while True:
-            if len(self._target_list) > 0:
-                x, y = self._target_list.pop()
-            else:
-                possible_locations = []
-                for i in range(config.BOARD_SIZE):
-                    for j in range(config.BOARD_SIZE):
-                        if (i, j) not in self._previous_shots:
-                            possible_locations.append((i, j))
-                x, y = x, y = choice(possible_locations)
-
-            if self.enemy_board.cell(x, y) is None or self.enemy_board.cell(x, y).alive:
-                self._previous_shots.append((x, y))
-                self.last_attack_result = self.enemy_board.attack(x, y)
-                if self.last_attack_result == AttackResult.HIT:
-                    for i in range(-1, 2):
-                        for j in range(-1, 2):
-                            if (
-                                x + i in range(config.BOARD_SIZE)
-                                and y + j in range(config.BOARD_SIZE)
-                                and (x + i, y + j) not in self._target_list
-                            ):
-
-                                self._target_list.append((x + i, y + j))
-
-                    new_target_list = []
-                    for target in self._target_list:
-                        if target == self._previous_hit or target == (x, y):
-                            pass
-                        elif (target[0] == x or target[1] == y) and (
-                            self._previous_hit is None
-                            or target[0] == self._previous_hit[0]
-                            or target[1] == self._previous_hit[1]
-                        ):
-                            new_target_list.append(target)
-                    self._target_list = new_target_list
-                    self._previous_hit = (x, y)
-                elif self.last_attack_result == AttackResult.SUNK:
-                    self._target_list = []
-                    self._previous_hit = None
+        if self._targeting is None:
+            self._targeting = self._strategy.targeting(
+                self.knowledge.size,
+                list(self.knowledge.remaining.elements()),
+                **{"rng": self._rng, **self._targeting_options},
+                knowledge=self.knowledge,
+            )
 
-                break
+        x, y = self._choose_target(
+            time_budget if time_budget is not None else self._time_budget
+        )
+        self._last_attack_location = (x, y)
+        self.last_attack_result = self._attack(x, y)
+        # The targeting records the result on the player's knowledge board
+        self._observe((x, y), self.last_attack_result)
+        return self.last_attack_result
+
+    @marked(AI_DECISION)
+    def _choose_target(self, time_budget: float | None) -> tuple:
+        """Chooses the next target with the targeting
+
+        Args:
+            time_budget (float | None): time budget of the move in seconds
+
+        Returns:
+            tuple: (x, y) location
+        """
+        return self._targeting.choose_target(time_budget)
+
+    @marked(AI_DECISION)
+    def _observe(self, location: tuple, result: AttackResult) -> None:
+        """Records the result of an attack through the targeting, which shares the knowledge board
+
+        Args:
+            location (tuple): attacked location
+            result (AttackResult): result of the attack
+        """
+        self._targeting.observe(location, result)
@@ -0,0 +1,194 @@
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from cProfile import Profile
+from functools import wraps
+from pathlib import Path
+from time import perf_counter
+from typing import Callable
+import os
+import signal
+
+# Phases of the game marked in the code
+INITIALIZE_BOARDS = "initialize_boards"
+AI_DECISION = "ai_decision"
+ATTACK = "attack"
+RENDER = "render"
+
+# Phases are marked when switched on before the modules are imported, with BATTLESHIPS_PROFILE=1.
+# Otherwise ``marked`` returns the functions unchanged, so they cost nothing outside profiling.
+ENABLED = os.environ.get("BATTLESHIPS_PROFILE") == "1"
+
+# CPU time between two samples of the call stack, in seconds
+SAMPLING_INTERVAL = 0.001
+
+# Returned by ``phase`` when no profiler is running, so the markers cost almost nothing
+_NO_PHASE = nullcontext()
+_profiler = None
+
+
+class _Phase:
+    __slots__ = ("_name", "_profiler", "_start")
+
+    def __init__(self, name: str, profiler: "Profiler") -> None:
+        self._name = name
+        self._profiler = profiler
+
+    def __enter__(self) -> None:
+        self._profiler.phases.append(self._name)
+        self._start = perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self._profiler.phase_times[self._name] += perf_counter() - self._start
+        self._profiler.phase_counts[self._name] += 1
+        self._profiler.phases.pop()
+
+
+def phase(name: str) -> _Phase | nullcontext:
+    """Marks a phase of the game, to be used as ``with phase(ATTACK): ...``.
+    The time spent in every phase is measured and the samples of the call stack
+    taken during a phase are rooted at its name.
+
+    Args:
+        name (str): name of the phase
+
+    Returns:
+        _Phase | nullcontext: context manager of the phase, a no-op if no profiler is running
+    """
+    return _Phase(name, _profiler) if _profiler is not None else _NO_PHASE
+
+
+def marked(name: str) -> Callable:
+    """Decorator marking every call of a function as a phase of the game.
+    It returns the function unchanged if the phases are not marked (see ``ENABLED``).
+
+    Args:
+        name (str): name of the phase
+
+    Returns:
+        Callable: decorator
+    """
+
+    def decorator(function: Callable) -> Callable:
+        if not ENABLED:
+            return function
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            with phase(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _frame_name(frame) -> str:
+    """Returns the name of a frame in the collapsed stacks: ``function (file:line)``"""
+    code = frame.f_code
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class Profiler:
+    def __init__(self, path: str, sampling: bool = True) -> None:
+        """Profiles the code run between ``start`` and ``stop`` with ``cProfile``
+        and, where ``signal.setitimer`` is available, samples the call stack.
+
+        ``stop`` writes ``<path>.pstats`` for ``pstats``/snakeviz, ``<path>.collapsed``
+        in the collapsed stack format of flamegraph.pl and speedscope, with the
+        phases as root frames, and ``<path>.phases.txt`` with the time spent in every phase.
+
+        Args:
+            path (str): path of the output files, without the extension
+            sampling (bool, optional): if the call stack is sampled. Defaults to True.
+        """
+        self._path = path
+        self._sampling = sampling and hasattr(signal, "setitimer")
+        self._profile = Profile()
+        self.phases = []
+        self.phase_times = Counter()
+        self.phase_counts = Counter()
+        self.samples = Counter()
+
+    def _sample(self, signum, frame) -> None:
+        """Records the interrupted call stack, rooted at the current phases"""
+        stack = []
+        while frame is not None:
+            stack.append(_frame_name(frame))
+            frame = frame.f_back
+        self.samples[";".join(self.phases + stack[::-1])] += 1
+
+    def start(self) -> None:
+        """Starts profiling
+
+        Raises:
+            RuntimeError: if another profiler is running
+        """
+        global _profiler
+        if _profiler is not None:
+            raise RuntimeError("A profiler is already running")
+        _profiler = self
+        if self._sampling:
+            signal.signal(signal.SIGPROF, self._sample)
+            signal.setitimer(signal.ITIMER_PROF, SAMPLING_INTERVAL, SAMPLING_INTERVAL)
+        self._profile.enable()
+
+    def stop(self) -> list:
+        """Stops profiling and writes the output files
+
+        Returns:
+            list: paths of the written files
+        """
+        global _profiler
+        self._profile.disable()
+        if self._sampling:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, signal.SIG_DFL)
+        _profiler = None
+
+        paths = [f"{self._path}.pstats", f"{self._path}.phases.txt"]
+        self._profile.dump_stats(paths[0])
+        with open(paths[1], "w") as file:
+            file.write(self.phase_report())
+        if self._sampling:
+            paths.append(f"{self._path}.collapsed")
+            with open(paths[-1], "w") as file:
+                for stack, count in self.samples.items():
+                    file.write(f"{stack} {count}\n")
+        return paths
+
+    def phase_report(self) -> str:
+        """Returns a table of the time spent in every phase
+
+        Returns:
+            str: one line per phase with its number of calls, total and mean time
+        """
+        lines = [f"{'phase':<20} {'calls':>10} {'total s':>10} {'mean us':>10}"]
+        for name, seconds in self.phase_times.most_common():
+            calls = self.phase_counts[name]
+            lines.append(
+                f"{name:<20} {calls:>10} {seconds:>10.3f} {seconds / calls * 1e6:>10.1f}"
+            )
+        return "\n".join(lines) + "\n"
+
+
+@contextmanager
+def profiled(path: str | None, sampling: bool = True):
+    """Profiles the code run in the ``with`` block, see ``Profiler``
+
+    Args:
+        path (str | None): path of the output files, without the extension. Nothing is profiled if None.
+        sampling (bool, optional): if the call stack is sampled. Defaults to True.
+
+    Yields:
+        Profiler | None: the running profiler
+    """
+    if path is None:
+        yield None
+        return
+
+    profiler = Profiler(path, sampling)
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
@@ -0,0 +1,416 @@
+from functools import lru_cache
+from typing import BinaryIO, Iterator, NamedTuple
+from boards import Board, BitBoard
+from game import GameOverError
+from geometry import ORIENTATIONS
+from ships import Ship
+from utils import AttackResult
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from players import Player
+
+# Start of every replay file: the format name and its version
+MAGIC = b"BSR"
+VERSION = 1
+
+# A game record is a sequence of unsigned LEB128 varints:
+#   board size, number of ships, size of every ship,
+#   placement of every ship of player A, then of player B: ``cell * 4 + orientation``
+#   (``cell = x * board_size + y``, orientation index in ``geometry.ORIENTATIONS``),
+#   every attack in turn order (A, B, A, ...): ``cell + 1``, terminated by ``0``.
+_END = 0
+
+
+class ReplayFormatError(ValueError):
+    pass
+
+
+class GameRecord(NamedTuple):
+    """A recorded game: the board config, the fleets and the attacks"""
+
+    board_size: int
+    ship_sizes: tuple
+    # ``(x, y, orientation)`` of every ship of player A and of player B
+    layouts: tuple
+    # Flat indexes ``x * board_size + y`` of the attacked cells, player A attacks first
+    shots: tuple
+
+
+class ReplayTurn(NamedTuple):
+    """An attack replayed from a game record"""
+
+    # 0 - player A, 1 - player B
+    player: int
+    location: tuple
+    result: AttackResult
+
+
+@lru_cache(maxsize=4096)
+def varint(value: int) -> bytes:
+    """Encodes a non-negative int as an unsigned LEB128 varint, 7 bits per byte
+
+    Args:
+        value (int): value to encode
+
+    Returns:
+        bytes: the varint, one byte for values below 128
+    """
+    data = bytearray()
+    while value >= 0x80:
+        data.append(value & 0x7F | 0x80)
+        value >>= 7
+    data.append(value)
+    return bytes(data)
+
+
+def read_varint(data: bytes, position: int) -> tuple:
+    """Decodes a varint
+
+    Args:
+        data (bytes): encoded data
+        position (int): index of the first byte of the varint
+
+    Raises:
+        ReplayFormatError: if the data ends inside the varint
+
+    Returns:
+        tuple: the value and the index of the next byte
+    """
+    value = shift = 0
+    try:
+        while True:
+            byte = data[position]
+            position += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return value, position
+            shift += 7
+    except IndexError:
+        raise ReplayFormatError("Truncated game record") from None
+
+
+def fleet_layout(player: "Player") -> list:
+    """Returns the placed fleet of a player
+
+    Args:
+        player (Player): player whose ships are all on the board
+
+    Returns:
+        list: ``(x, y, orientation)`` of every ship, in ``player.ships`` order
+    """
+    return [(*ship.location, ship.orientation) for ship in player.ships.values()]
+
+
+def _header(board_size: int, ship_sizes: list, layouts: list) -> bytes:
+    """Encodes the config and the fleets of a game record
+
+    Args:
+        board_size (int): size of the boards
+        ship_sizes (list): sizes of the ships of every player
+        layouts (list): fleets of player A and player B, see ``fleet_layout``
+
+    Raises:
+        ValueError: if the fleets don't match the ship sizes
+
+    Returns:
+        bytes: start of the game record
+    """
+    data = bytearray(varint(board_size))
+    data += varint(len(ship_sizes))
+    for size in ship_sizes:
+        data += varint(size)
+    for layout in layouts:
+        if len(layout) != len(ship_sizes):
+            raise ValueError("Both players must have the recorded ship set")
+        for x, y, orientation in layout:
+            cell = x * board_size + y
+            data += varint(cell * 4 + ORIENTATIONS.index(orientation))
+    return bytes(data)
+
+
+def encode_record(record: GameRecord) -> bytes:
+    """Encodes a whole game record
+
+    Args:
+        record (GameRecord): the game
+
+    Returns:
+        bytes: the game record, without the file header
+    """
+    data = bytearray(_header(record.board_size, record.ship_sizes, record.layouts))
+    for cell in record.shots:
+        data += varint(cell + 1)
+    data += varint(_END)
+    return bytes(data)
+
+
+def decode_records(data: bytes, position: int = 0) -> Iterator[GameRecord]:
+    """Decodes consecutive game records
+
+    Args:
+        data (bytes): encoded game records, without the file header
+        position (int, optional): index of the first byte of the first record. Defaults to 0.
+
+    Raises:
+        ReplayFormatError: if a record is truncated
+
+    Yields:
+        GameRecord: every game
+    """
+    while position < len(data):
+        board_size, position = read_varint(data, position)
+        ship_count, position = read_varint(data, position)
+        ship_sizes = []
+        for _ in range(ship_count):
+            size, position = read_varint(data, position)
+            ship_sizes.append(size)
+
+        layouts = []
+        for _ in range(2):
+            layout = []
+            for _ in range(ship_count):
+                placement, position = read_varint(data, position)
+                x, y = divmod(placement >> 2, board_size)
+                layout.append((x, y, ORIENTATIONS[placement & 3]))
+            layouts.append(tuple(layout))
+
+        # Attacks are non-zero varints, whose bytes are never 0, so the first 0 byte ends the game
+        end = data.find(_END, position)
+        if end == -1:
+            raise ReplayFormatError("Truncated game record")
+        attacks = data[position:end]
+        position = end + 1
+        if attacks.isascii():
+            # Only single byte varints, on boards of up to 11x11
+            shots = tuple(map((-1).__add__, attacks))
+        else:
+            shots = []
+            index = 0
+            while index < len(attacks):
+                value, index = read_varint(attacks, index)
+                shots.append(value - 1)
+            shots = tuple(shots)
+
+        yield GameRecord(board_size, tuple(ship_sizes), tuple(layouts), shots)
+
+
+def read_records(file: BinaryIO) -> Iterator[GameRecord]:
+    """Reads the games of a replay file
+
+    Args:
+        file (BinaryIO): file opened in binary mode
+
+    Raises:
+        ReplayFormatError: if it's not a replay file of a supported version, or it's truncated
+
+    Yields:
+        GameRecord: every game of the file
+    """
+    data = file.read()
+    if data[: len(MAGIC)] != MAGIC:
+        raise ReplayFormatError("Not a replay file")
+    version, position = read_varint(data, len(MAGIC))
+    if version != VERSION:
+        raise ReplayFormatError(f"Unsupported replay version {version}")
+    yield from decode_records(data, position)
+
+
+def write_header(file: BinaryIO) -> None:
+    """Writes the header of a replay file, the game records follow it
+
+    Args:
+        file (BinaryIO): file opened in binary mode
+    """
+    file.write(MAGIC + varint(VERSION))
+
+
+class ReplayWriter:
+    def __init__(self, file: BinaryIO, header: bool = True) -> None:
+        """Writes game records to a binary file. It's passed to ``Game`` to record
+        the game as the turns happen: the fleets with the first attack, then every attack.
+
+        Args:
+            file (BinaryIO): file opened in binary mode
+            header (bool, optional): if the file header is written, records written
+                without it can be appended to another replay file. Defaults to True.
+        """
+        self._file = file
+        self._board_size = None
+        if header:
+            write_header(file)
+
+    def start(self, playerA: "Player", playerB: "Player") -> None:
+        """Starts the record of a game
+
+        Args:
+            playerA (Player): player attacking first, with the fleet on the board
+            playerB (Player): the other player
+
+        Raises:
+            ValueError: if the players don't have the same ship sizes or board size
+        """
+        ship_sizes = [ship.size for ship in playerA.ships.values()]
+        if ship_sizes != [ship.size for ship in playerB.ships.values()]:
+            raise ValueError("Both players must have the same ship set")
+        if playerA.board.size != playerB.board.size:
+            raise ValueError("Both players must have the same board size")
+        self._board_size = playerA.board.size
+        layouts = [fleet_layout(playerA), fleet_layout(playerB)]
+        self._file.write(_header(self._board_size, ship_sizes, layouts))
+
+    def attack(self, location: tuple) -> None:
+        """Records an attack of the player whose turn it is
+
+        Args:
+            location (tuple): attacked location
+        """
+        x, y = location
+        self._file.write(varint(x * self._board_size + y + 1))
+
+    def finish(self) -> None:
+        """Ends the record of the game"""
+        self._file.write(varint(_END))
+        self._board_size = None
+
+    def write(self, record: GameRecord) -> None:
+        """Writes a whole game record
+
+        Args:
+            record (GameRecord): the game
+        """
+        self._file.write(encode_record(record))
+
+
+class _Fleet:
+    """Owner of a replayed board, in place of a ``Player``"""
+
+    __slots__ = ("ships", "fleet_strength")
+
+    def __init__(self, ship_sizes: tuple, board_size: int) -> None:
+        ships = [Ship(size, board_size) for size in ship_sizes]
+        self.ships = {ship.uuid: ship for ship in ships}
+        self.fleet_strength = sum(ship_sizes)
+
+
+class Replay:
+    def __init__(self, record: GameRecord, board_class: type[Board] = BitBoard) -> None:
+        """Replays a recorded game on bare boards, without players and UI
+
+        Args:
+            record (GameRecord): the game
+            board_class (type[Board], optional): board engine to use. Defaults to BitBoard.
+        """
+        self._record = record
+        self._board_class = board_class
+        self.reset()
+
+    def reset(self) -> None:
+        """Goes back to the state before the first attack
+
+        Raises:
+            CellAlreadyOccupiedError: if the recorded fleets break the placement rules
+        """
+        boards = []
+        board_size = self._record.board_size
+        for layout in self._record.layouts:
+            fleet = _Fleet(self._record.ship_sizes, board_size)
+            board = self._board_class(fleet, board_size)
+            for ship, (x, y, orientation) in zip(fleet.ships.values(), layout):
+                board.add_ship(ship.uuid, (x, y), orientation)
+            boards.append(board)
+        self._boards = tuple(boards)
+        self._turn = 0
+
+    @property
+    def record(self) -> GameRecord:
+        """Replayed game
+
+        Returns:
+            GameRecord: the game
+        """
+        return self._record
+
+    @property
+    def boards(self) -> tuple:
+        """Boards of player A and player B in the current state
+
+        Returns:
+            tuple: the two boards
+        """
+        return self._boards
+
+    @property
+    def turn(self) -> int:
+        """Number of replayed attacks
+
+        Returns:
+            int: the next attack index
+        """
+        return self._turn
+
+    @property
+    def finished(self) -> bool:
+        """Checks if all the recorded attacks have been replayed
+
+        Returns:
+            bool: True at the end of the record
+        """
+        return self._turn == len(self._record.shots)
+
+    @property
+    def winner(self) -> int | None:
+        """Returns the winner of the game
+
+        Returns:
+            int | None: 0 - player A, 1 - player B, None if both fleets are afloat
+        """
+        board_a, board_b = self._boards
+        if not board_b.player.fleet_strength:
+            return 0
+        if not board_a.player.fleet_strength:
+            return 1
+        return None
+
+    def step(self) -> ReplayTurn:
+        """Replays the next attack
+
+        Raises:
+            GameOverError: if all the recorded attacks have been replayed
+
+        Returns:
+            ReplayTurn: attacking player, location and result of the attack
+        """
+        if self.finished:
+            raise GameOverError("All the attacks have been replayed")
+
+        player = self._turn & 1
+        x, y = divmod(self._record.shots[self._turn], self._record.board_size)
+        result = self._boards[1 - player].attack(x, y)
+        self._turn += 1
+        return ReplayTurn(player, (x, y), result)
+
+    def steps(self) -> Iterator[ReplayTurn]:
+        """Replays the remaining attacks one by one
+
+        Yields:
+            ReplayTurn: attacking player, location and result of every attack
+        """
+        while not self.finished:
+            yield self.step()
+
+    def seek(self, turn: int) -> None:
+        """Rebuilds the state after the given number of attacks
+
+        Args:
+            turn (int): number of attacks, from 0 to the number of recorded attacks
+
+        Raises:
+            IndexError: if the record has fewer attacks
+        """
+        if not 0 <= turn <= len(self._record.shots):
+            raise IndexError("Turn out of the record")
+        if turn < self._turn:
+            self.reset()
+        while self._turn < turn:
+            self.step()
@@ -27,12 +27,29 @@ class HitDestroyedSquareError(IndexError):
 class Ship(Sequence):
     """Ship base object
 
+    Destroyed squares are kept as a bitmask, the strength is derived from it,
+    so ships are cheap to keep in memory and to hit.
+
     Args:
         size (int): size of the ship
+        board_size (int | None, optional): size of the board the ship is placed on.
+            Defaults to ``config.BOARD_SIZE`` when the location is set.
     """
 
-    def __init__(self, size: int) -> None:
-        self._squares = [True for _ in range(size)]
+    __slots__ = (
+        "_size",
+        "_damage",
+        "_uuid",
+        "_location",
+        "_orientation",
+        "_under_edition",
+        "_board_size",
+    )
+
+    def __init__(self, size: int, board_size: int | None = None) -> None:
+        self._size = size
+        self._board_size = board_size
+        self._damage = 0
         self._uuid = get_uuid()
         self._location = None
         self._orientation = config.DEFAULT_ORIENTATION
@@ -41,11 +58,17 @@ class Ship(Sequence):
 
     def __getitem__(self, i):
         """Returns the ship's square at index ``i``"""
-        return self._squares[i]
+        if isinstance(i, slice):
+            return self.squares[i]
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError("Ship square index out of range")
+        return not self._damage >> i & 1
 
     def __len__(self):
         """Returns the ship's size"""
-        return self.size
+        return self._size
 
     @property
     def squares(self) -> list:
@@ -54,7 +77,13 @@ class Ship(Sequence):
         Returns:
             list: squares
         """
-        return self._squares
+        return [not self._damage >> i & 1 for i in range(self._size)]
+
+    @squares.setter
+    def squares(self, value: list) -> None:
+        squares = list(value)
+        self._size = len(squares)
+        self._damage = sum(1 << i for i, alive in enumerate(squares) if not alive)
 
     @property
     def size(self) -> int:
@@ -63,7 +92,7 @@ class Ship(Sequence):
         Returns:
             int: size
         """
-        return len(self._squares)
+        return self._size
 
     @property
     def strength(self) -> int:
@@ -72,7 +101,7 @@ class Ship(Sequence):
         Returns:
             int: strength
         """
-        return sum(self._squares)
+        return self._size - self._damage.bit_count()
 
     @property
     def uuid(self) -> int:
@@ -97,11 +126,14 @@ class Ship(Sequence):
 
     @location.setter
     def location(self, value: tuple) -> None:
+        board_size = (
+            self._board_size if self._board_size is not None else config.BOARD_SIZE
+        )
         if value is not None and any(
-            index not in range(0, config.BOARD_SIZE) for index in value
+            index not in range(0, board_size) for index in value
         ):
             raise LocationOutsideOfRangeError(
-                f"Given location {value} does not fit on a {config.BOARD_SIZE}x{config.BOARD_SIZE} matrix"
+                f"Given location {value} does not fit on a {board_size}x{board_size} matrix"
             )
 
         self._location = value
@@ -153,23 +185,48 @@ class Ship(Sequence):
         Returns:
             int: strength after the hit (``0`` is destroyed)
         """
-        if not self.location:
+        if not self._location:
             raise UnlocatedShipHitError("You cannot hit an unlocated ship")
-        if targetIndex >= self.size:
+        if not 0 <= targetIndex < self._size:
             raise HitOutsideOfRangeError(
-                f"{targetIndex} is not within 0-{self.size-1} range"
+                f"{targetIndex} is not within 0-{self._size-1} range"
             )
-        if not self.squares[targetIndex]:
+        if self._damage >> targetIndex & 1:
             raise HitDestroyedSquareError(
                 f"ship: {self._uuid} square: {targetIndex} is already destroyed"
             )
-        self.squares[targetIndex] = False
-        return self.strength
+        self._damage |= 1 << targetIndex
+        return self._size - self._damage.bit_count()
+
+    def hit_mask(self, mask: int) -> int:
+        """Destroys the square of a one bit mask. It's ``take_a_hit`` for boards
+        that keep the square bits and already checked the square is on the ship.
+
+        Args:
+            mask (int): ``1 << index`` of the square to be destroyed
+
+        Raises:
+            UnlocatedShipHitError: if the ship is not located
+            HitDestroyedSquareError: if the targeted square already is ``False``
+
+        Returns:
+            int: strength after the hit (``0`` is destroyed)
+        """
+        if not self._location:
+            raise UnlocatedShipHitError("You cannot hit an unlocated ship")
+        if self._damage & mask:
+            raise HitDestroyedSquareError(
+                f"ship: {self._uuid} square: {mask.bit_length() - 1} is already destroyed"
+            )
+        self._damage |= mask
+        return self._size - self._damage.bit_count()
 
 
 class Carrier(Ship):
     """Ship with ``self.size = BOAT_SIZES['Carrier']`` (Default: ``5``)"""
 
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(config.BOAT_SIZES["Carrier"])
 
@@ -180,6 +237,8 @@ class Carrier(Ship):
 class Battleship(Ship):
     """Ship with ``self.size = BOAT_SIZES['Battleship']`` (Default: ``4``)"""
 
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(config.BOAT_SIZES["Battleship"])
 
@@ -190,6 +249,8 @@ class Battleship(Ship):
 class Destroyer(Ship):
     """Ship with ``self.size = BOAT_SIZES['Destroyer']`` (Default: ``3``)"""
 
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(config.BOAT_SIZES["Destroyer"])
 
@@ -200,6 +261,8 @@ class Destroyer(Ship):
 class Submarine(Ship):
     """Ship with ``self.size = BOAT_SIZES['Submarine']`` (Default: ``3``)"""
 
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(config.BOAT_SIZES["Submarine"])
 
@@ -210,6 +273,8 @@ class Submarine(Ship):
 class PatrolBoat(Ship):
     """Ship with self.size = ``BOAT_SIZES['PatrolBoat']`` (Default: ``2``)"""
 
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(config.BOAT_SIZES["PatrolBoat"])
 
@@ -0,0 +1,360 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import nullcontext
+from io import BytesIO
+from time import perf_counter
+from typing import BinaryIO, Callable, NamedTuple
+import argparse
+import os
+import sys
+from boards import BitBoard
+from config import config
+from game import Game
+from knowledge import MISS, HIT, SUNK
+import metrics
+from players import AIPlayer
+import profiling
+from replay import ReplayWriter, write_header
+from strategies import STRATEGIES, get_strategy
+import numpy as np
+
+
+class GameResult(NamedTuple):
+    """Result of a game between strategies A and B"""
+
+    a_won: bool
+    a_shots: int
+    b_shots: int
+
+
+class SimulationResult(NamedTuple):
+    """Totals of a series of games between strategies A and B"""
+
+    games: int
+    a_wins: int
+    # Shots made by the winner, summed over the games won by A and by B
+    a_win_shots: int
+    b_win_shots: int
+    seconds: float
+    # Seed of the simulation, game ``i`` is replayed with ``play_game(..., seed=game_seed(seed, i))``
+    seed: int
+
+    @property
+    def games_per_second(self) -> float:
+        """Returns the throughput of the simulation
+
+        Returns:
+            float: games played per second
+        """
+        return self.games / self.seconds if self.seconds else 0.0
+
+
+def _shots(player: AIPlayer) -> int:
+    """Returns the number of attacks made by a player
+
+    Args:
+        player (AIPlayer): the player
+
+    Returns:
+        int: number of attacked cells
+    """
+    return int(np.isin(player.knowledge.state, (MISS, HIT, SUNK)).sum())
+
+
+def game_seed(seed: int, game: int) -> np.random.SeedSequence:
+    """Returns the seed of a game of a simulation, independent of the seeds of the other games.
+    It's the ``game``-th child of ``SeedSequence(seed).spawn``, without spawning the previous ones.
+
+    Args:
+        seed (int): seed of the simulation
+        game (int): number of the game
+
+    Returns:
+        np.random.SeedSequence: seed of the game
+    """
+    return np.random.SeedSequence(seed, spawn_key=(game,))
+
+
+def play_game(
+    strategy_a: str,
+    strategy_b: str,
+    a_first: bool = True,
+    seed: int | np.random.SeedSequence | None = None,
+    recorder: ReplayWriter | None = None,
+) -> GameResult:
+    """Plays a game between two AI strategies without any UI
+
+    Args:
+        strategy_a (str): name of the strategy of player A
+        strategy_b (str): name of the strategy of player B
+        a_first (bool, optional): if player A attacks first. Defaults to True.
+        seed (int | np.random.SeedSequence | None, optional): seed of the game, the same seed replays the
+            same game unless a strategy depends on time. Defaults to None.
+        recorder (ReplayWriter | None, optional): writes the game to a replay file. Defaults to None.
+
+    Returns:
+        GameResult: winner and number of shots of both players
+    """
+    player_a = AIPlayer(side=0, name="A", board_class=BitBoard, strategy=strategy_a)
+    player_b = AIPlayer(side=1, name="B", board_class=BitBoard, strategy=strategy_b)
+    if a_first:
+        game = Game(player_a, player_b, seed, recorder)
+    else:
+        game = Game(player_b, player_a, seed, recorder)
+    game.initialize_boards()
+    first_won = game.start()
+
+    return GameResult(first_won == a_first, _shots(player_a), _shots(player_b))
+
+
+def _init_worker(config_path: str | None) -> None:
+    """Loads the board config in a worker process
+
+    Args:
+        config_path (str | None): path to a config file, the default config is used if None
+    """
+    if config_path is not None:
+        config.load_file(config_path)
+
+
+def _play_chunk(
+    strategy_a: str,
+    strategy_b: str,
+    seed: int,
+    first_game: int,
+    games: int,
+    record: bool = False,
+) -> tuple:
+    """Plays a chunk of games, the players take turns in attacking first
+
+    Args:
+        strategy_a (str): name of the strategy of player A
+        strategy_b (str): name of the strategy of player B
+        seed (int): seed of the simulation
+        first_game (int): number of the first game of the chunk
+        games (int): number of games in the chunk
+        record (bool, optional): if the games are recorded. Defaults to False.
+
+    Returns:
+        tuple: ``(games, a_wins, a_win_shots, b_win_shots)`` totals of the chunk,
+        the metrics recorded while playing it (see ``metrics.snapshot``)
+        and the game records without the replay file header (empty if not recorded)
+    """
+    records = BytesIO()
+    recorder = ReplayWriter(records, header=False) if record else None
+    a_wins = a_win_shots = b_win_shots = 0
+    for game in range(first_game, first_game + games):
+        result = play_game(
+            strategy_a, strategy_b, game % 2 == 0, game_seed(seed, game), recorder
+        )
+        if result.a_won:
+            a_wins += 1
+            a_win_shots += result.a_shots
+        else:
+            b_win_shots += result.b_shots
+    totals = (games, a_wins, a_win_shots, b_win_shots)
+    return totals, metrics.snapshot(reset=True), records.getvalue()
+
+
+def simulate(
+    games: int,
+    strategy_a: str = "hunt_target",
+    strategy_b: str | None = None,
+    workers: int | None = None,
+    chunk_size: int | None = None,
+    config_path: str | None = None,
+    progress: Callable | None = None,
+    seed: int | None = None,
+    replay_file: BinaryIO | None = None,
+) -> SimulationResult:
+    """Plays AI vs AI games on a process pool
+
+    The games are split in chunks played by the workers, so the results
+    are sent back once per chunk rather than once per game.
+
+    Args:
+        games (int): number of games
+        strategy_a (str, optional): name of the strategy of player A. Defaults to "hunt_target".
+        strategy_b (str | None, optional): name of the strategy of player B. Defaults to ``strategy_a``.
+        workers (int | None, optional): number of worker processes, ``1`` plays in the current process. Defaults to the number of CPUs.
+        chunk_size (int | None, optional): games per chunk. Defaults to about four chunks per worker.
+        config_path (str | None, optional): path to a config file with the board size and the ship set. Defaults to the current config.
+        progress (Callable | None, optional): called as ``progress(games_done, games, seconds)`` after every chunk,
+            when the metrics of the workers have been merged into the ones of this process. Defaults to None.
+        seed (int | None, optional): seed of the simulation, every game gets its own seed spawned from it
+            (see ``game_seed``). Defaults to a random one, returned in the result.
+        replay_file (BinaryIO | None, optional): binary file the games are recorded to, see ``replay``.
+            The games are written in the order the chunks finish. Defaults to None.
+
+    Raises:
+        UnknownStrategyError: if a strategy is unknown
+
+    Returns:
+        SimulationResult: totals of the games
+    """
+    strategy_b = strategy_b if strategy_b is not None else strategy_a
+    get_strategy(strategy_a)
+    get_strategy(strategy_b)
+    seed = seed if seed is not None else np.random.SeedSequence().entropy
+    workers = workers if workers is not None else os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, games // (4 * workers))
+    chunks = [
+        (
+            strategy_a,
+            strategy_b,
+            seed,
+            first,
+            min(chunk_size, games - first),
+            replay_file is not None,
+        )
+        for first in range(0, games, chunk_size)
+    ]
+
+    totals = [0, 0, 0, 0]
+    start = perf_counter()
+    if replay_file is not None:
+        write_header(replay_file)
+
+    def add(chunk_result: tuple) -> None:
+        chunk_totals, chunk_metrics, chunk_records = chunk_result
+        for i, value in enumerate(chunk_totals):
+            totals[i] += value
+        metrics.merge(chunk_metrics)
+        if replay_file is not None:
+            replay_file.write(chunk_records)
+        if progress is not None:
+            progress(totals[0], games, perf_counter() - start)
+
+    if workers == 1:
+        # The config of the current process is only changed for the simulation
+        saved_config = vars(config).copy()
+        try:
+            _init_worker(config_path)
+            for chunk in chunks:
+                add(_play_chunk(*chunk))
+        finally:
+            vars(config).update(saved_config)
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(config_path,)
+        ) as pool:
+            futures = [pool.submit(_play_chunk, *chunk) for chunk in chunks]
+            for future in as_completed(futures):
+                add(future.result())
+
+    return SimulationResult(*totals, perf_counter() - start, seed)
+
+
+def _print_progress(done: int, games: int, seconds: float) -> None:
+    rate = done / seconds if seconds else 0.0
+    print(f"\r{done}/{games} games, {rate:.1f} games/s", end="", file=sys.stderr)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Plays AI vs AI games without the UI")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument(
+        "--strategies",
+        nargs="+",
+        default=["hunt_target"],
+        choices=list(STRATEGIES),
+        metavar="STRATEGY",
+        help="strategy of player A and optionally of player B, see strategies.STRATEGIES",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="worker processes, all CPUs by default",
+    )
+    parser.add_argument("--chunk-size", type=int, default=None, help="games per chunk")
+    parser.add_argument(
+        "--config", default=None, help="config file with the board size and ship set"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="seed of the simulation, random by default",
+    )
+    parser.add_argument(
+        "--profile",
+        default=None,
+        metavar="PATH",
+        help="play in one process under the profiler, needs BATTLESHIPS_PROFILE=1, "
+        "writes PATH.pstats, PATH.collapsed and PATH.phases.txt",
+    )
+    parser.add_argument(
+        "--metrics",
+        default=None,
+        metavar="PATH",
+        help="write Prometheus metrics to PATH after every chunk, needs BATTLESHIPS_METRICS=1",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        metavar="PORT",
+        help="serve Prometheus metrics on http://127.0.0.1:PORT/metrics, needs BATTLESHIPS_METRICS=1",
+    )
+    parser.add_argument(
+        "--record",
+        default=None,
+        metavar="PATH",
+        help="record the games to the binary replay file PATH",
+    )
+    parser.add_argument("--quiet", action="store_true", help="don't show the progress")
+    args = parser.parse_args()
+    if len(args.strategies) > 2:
+        parser.error("at most two strategies can play")
+    if args.profile is not None and not profiling.ENABLED:
+        parser.error("the game is only profiled with BATTLESHIPS_PROFILE=1")
+    exporting = args.metrics is not None or args.metrics_port is not None
+    if exporting and not metrics.ENABLED:
+        parser.error("the metrics are only recorded with BATTLESHIPS_METRICS=1")
+    if args.metrics_port is not None:
+        metrics.serve(args.metrics_port)
+
+    def report(done: int, games: int, seconds: float) -> None:
+        if args.metrics is not None:
+            metrics.write(args.metrics)
+        if not args.quiet:
+            _print_progress(done, games, seconds)
+
+    strategy_a = args.strategies[0]
+    strategy_b = args.strategies[-1]
+    # The profiler only sees the current process
+    workers = 1 if args.profile is not None else args.workers
+    recording = open(args.record, "wb") if args.record is not None else nullcontext()
+    with recording as replay_file, profiling.profiled(args.profile) as profiler:
+        result = simulate(
+            args.games,
+            strategy_a,
+            strategy_b,
+            workers,
+            args.chunk_size,
+            args.config,
+            report,
+            args.seed,
+            replay_file,
+        )
+    if not args.quiet:
+        print(file=sys.stderr)
+    if profiler is not None:
+        print(profiler.phase_report(), file=sys.stderr)
+
+    print(f"{'player':<8} {'strategy':<20} {'wins':>8} {'shots/win':>10}")
+    for player, strategy, wins, shots in (
+        ("A", strategy_a, result.a_wins, result.a_win_shots),
+        ("B", strategy_b, result.games - result.a_wins, result.b_win_shots),
+    ):
+        shots_per_win = shots / wins if wins else float("nan")
+        print(f"{player:<8} {strategy:<20} {wins:>8} {shots_per_win:>10.1f}")
+    print(f"seed {result.seed}")
+    print(
+        f"{result.games} games in {result.seconds:.1f} s, {result.games_per_second:.1f} games/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
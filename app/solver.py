@@ -0,0 +1,171 @@
+from math import lgamma, log
+from time import monotonic
+from knowledge import EMPTY, HIT, MISS, SUNK, KnowledgeBoard
+from layouts import (
+    LayoutGenerationError,
+    UniformLayoutSampler,
+    consistent_placements,
+    fleet_table,
+)
+from targeting import DensityTargeting
+from utils import dilate
+import numpy as np
+
+# Positions whose exact probabilities (or the failure to compute them) are kept by a targeting
+_MEMO_SIZE = 64
+
+
+def constraint_masks(state: np.ndarray) -> tuple:
+    """Returns the cells the remaining ships can't occupy and the cells they must cover
+
+    Args:
+        state (np.ndarray): ``size x size`` matrix of ``knowledge`` cell codes
+
+    Returns:
+        tuple: ``(blocked, hits)`` bool masks, ships can't touch the sunk ones
+    """
+    blocked = (state == MISS) | (state == EMPTY) | dilate(state == SUNK)
+    return blocked, state == HIT
+
+
+def estimate_layout_count(state: np.ndarray, ship_sizes: list) -> float:
+    """Estimates the number of layouts of the remaining ships consistent with the shots.
+    It counts the placements of every ship consistent with the shots on their own
+    (see ``layouts.consistent_placements``) and ignores the interactions between
+    the ships, so it is an upper bound. With hits, one of the ships covers the
+    first hit, which leaves it only the placements covering that hit.
+
+    Args:
+        state (np.ndarray): ``size x size`` matrix of ``knowledge`` cell codes
+        ship_sizes (list): sizes of the ships still afloat
+
+    Returns:
+        float: estimated layout count, ``0`` if a ship has no placement
+    """
+    board_size = len(state)
+    if max(ship_sizes) > board_size:
+        return 0.0
+    blocked, hits = constraint_masks(state)
+    placements = consistent_placements(board_size, ship_sizes, blocked, hits)
+    table = fleet_table(board_size, tuple(sorted(set(ship_sizes))))
+    hit_indexes = np.flatnonzero(hits)
+
+    log_count = 0.0
+    covering_share = 0.0
+    for size, rows in placements.items():
+        quantity = ship_sizes.count(size)
+        # Every footprint appears once per orientation giving it
+        footprints = len(rows) // (4 if size == 1 else 2)
+        if footprints < quantity:
+            return 0.0
+        # Unordered choice of the placements of identical ships
+        log_count += quantity * log(footprints) - lgamma(quantity + 1)
+        if hit_indexes.size:
+            covering = (table.square_indexes[rows] == hit_indexes[0]).any(axis=1)
+            # One of the identical ships takes a covering placement instead
+            covering_share += quantity * np.count_nonzero(covering) / len(rows)
+    if hit_indexes.size:
+        if not covering_share:
+            return 0.0
+        log_count += log(covering_share)
+    return float(np.exp(log_count))
+
+
+class ExactTargeting(DensityTargeting):
+    def __init__(
+        self,
+        board_size: int,
+        ship_sizes: list,
+        rng: np.random.Generator | None = None,
+        threshold: float = 2e4,
+        max_states: int = 50_000,
+        knowledge: KnowledgeBoard | None = None,
+    ) -> None:
+        """Targeting that computes the exact probability of every cell holding a ship
+        by enumerating all the layouts consistent with the shots (see
+        ``layouts.UniformLayoutSampler``).
+
+        The enumeration is only tried when ``estimate_layout_count`` is at most
+        ``threshold``, which happens on small boards and in the endgame.
+        Otherwise, or if it needs more than ``max_states`` memoized states,
+        the ``DensityTargeting`` heat map is used. The probabilities of the last
+        positions are kept, so a position seen again isn't enumerated again.
+
+        Args:
+            board_size (int): size of the enemy board
+            ship_sizes (list): sizes of the enemy ships
+            rng (np.random.Generator | None, optional): random generator used to break ties. Defaults to a new unseeded one.
+            threshold (float, optional): estimated layout count under which the layouts are enumerated. Defaults to 2e4.
+            max_states (int, optional): memoized states after which the enumeration gives up. Defaults to 50 000.
+            knowledge (KnowledgeBoard | None, optional): board the shots are recorded on, shared with the player. Defaults to a new one.
+        """
+        super().__init__(board_size, ship_sizes, rng, knowledge)
+        self._threshold = threshold
+        self._max_states = max_states
+        self._exact = False
+        # (ship sizes, blocked cells, hits) -> exact probabilities or None if there are too many layouts
+        self._memo = {}
+
+    @property
+    def exact(self) -> bool:
+        """Returns True if the last density was computed by enumerating the layouts
+
+        Returns:
+            bool: True if the last density is exact
+        """
+        return self._exact
+
+    def _exact_density(self, deadline: float | None = None) -> np.ndarray | None:
+        """Enumerates the consistent layouts if there are few enough of them
+
+        Args:
+            deadline (float | None, optional): ``time.monotonic()`` value after which the enumeration gives up. Defaults to None.
+
+        Returns:
+            np.ndarray | None: exact occupancy probabilities or None if they were not computed
+        """
+        ship_sizes = [
+            size for size, count in self._remaining.items() for _ in range(count)
+        ]
+        self._exact = False
+        if not ship_sizes:
+            return None
+
+        blocked, hits = constraint_masks(self._state)
+        key = (tuple(ship_sizes), blocked.tobytes(), hits.tobytes())
+        if key not in self._memo:
+            if estimate_layout_count(self._state, ship_sizes) > self._threshold:
+                return None
+            try:
+                sampler = UniformLayoutSampler(
+                    self._board_size,
+                    ship_sizes,
+                    self._max_states,
+                    blocked,
+                    hits,
+                    deadline,
+                )
+                probabilities = sampler.probabilities() if sampler.total else None
+            except LayoutGenerationError:
+                # Running out of the move's time doesn't mean the next move will
+                if deadline is not None and monotonic() >= deadline:
+                    return None
+                probabilities = None
+            if len(self._memo) >= _MEMO_SIZE:
+                del self._memo[next(iter(self._memo))]
+            self._memo[key] = probabilities
+
+        probabilities = self._memo[key]
+        if probabilities is None:
+            return None
+        self._exact = True
+        return probabilities.copy()
+
+    def density(self) -> np.ndarray:
+        """Returns the exact occupancy probabilities or the heat map if there are too many layouts
+
+        Returns:
+            np.ndarray: ``size x size`` float matrix indexed by ``[x, y]``
+        """
+        exact = self._exact_density()
+        return exact if exact is not None else super().density()
@@ -0,0 +1,143 @@
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Callable, NamedTuple
+from anytime import AnytimeTargeting
+from config import config
+from layouts import random_layout
+from montecarlo import MonteCarloTargeting
+from solver import ExactTargeting
+from targeting import (
+    DensityTargeting,
+    HuntTargetTargeting,
+    IncrementalDensityTargeting,
+    ParityTargeting,
+)
+
+
+class UnknownStrategyError(ValueError):
+    pass
+
+
+class Strategy(NamedTuple):
+    """AI strategy: how the AI places its fleet and how it chooses its shots.
+
+    ``placement(board_size, ship_sizes, rng)`` returns an ``(x, y, orientation)`` tuple for every ship.
+    The default ``layouts.random_layout`` falls back to the backtracking generator on crowded fleets,
+    so it never dead-ends.
+    ``targeting(board_size, ship_sizes, rng=rng, **options, knowledge=knowledge)`` creates an object with
+    ``choose_target(time_budget=None) -> (x, y)`` and ``observe(location, result)`` methods.
+    ``observe`` records the result on ``knowledge``, the player's ``KnowledgeBoard``.
+    """
+
+    description: str
+    targeting: Callable
+    placement: Callable = random_layout
+    # Read-only, so the default isn't shared as a mutable dict by all the strategies
+    options: Mapping = MappingProxyType({})
+
+
+STRATEGIES = {}
+
+# Difficulty levels offered to the players -> strategy name
+DIFFICULTIES = {
+    "Easy": "hunt_target",
+    "Medium": "incremental_density",
+    "Hard": "anytime",
+}
+
+
+def difficulty_name(strategy: str) -> str:
+    """Returns the difficulty level of a strategy, or its name if it's not offered as a level
+
+    Args:
+        strategy (str): name of the strategy
+
+    Returns:
+        str: difficulty level
+    """
+    for difficulty, name in DIFFICULTIES.items():
+        if name == strategy:
+            return difficulty
+    return strategy
+
+
+def register_strategy(name: str, strategy: Strategy) -> None:
+    """Registers an AI strategy, replacing the one registered with the same name
+
+    Args:
+        name (str): name of the strategy, used as ``AIPlayer(strategy=name)``
+        strategy (Strategy): the strategy
+    """
+    STRATEGIES[name] = strategy
+
+
+def get_strategy(name: str) -> Strategy:
+    """Returns a registered AI strategy
+
+    Args:
+        name (str): name of the strategy
+
+    Raises:
+        UnknownStrategyError: if no strategy is registered with this name
+
+    Returns:
+        Strategy: the strategy
+    """
+    try:
+        return STRATEGIES[name]
+    except KeyError:
+        raise UnknownStrategyError(f"Unknown AI strategy: {name}") from None
+
+
+register_strategy(
+    "hunt_target",
+    Strategy(
+        "Random shots, then the neighbours of every hit",
+        HuntTargetTargeting,
+    ),
+)
+register_strategy(
+    "parity",
+    Strategy(
+        "Hunt-target shooting only on a lattice spaced by the smallest ship",
+        ParityTargeting,
+    ),
+)
+register_strategy(
+    "density",
+    Strategy(
+        "Shoots where most placements of the remaining ships fit",
+        DensityTargeting,
+    ),
+)
+register_strategy(
+    "incremental_density",
+    Strategy(
+        "Density with placement counts updated after every shot",
+        IncrementalDensityTargeting,
+    ),
+)
+register_strategy(
+    "exact",
+    Strategy(
+        "Exact layout probabilities in the endgame, density otherwise",
+        ExactTargeting,
+    ),
+)
+register_strategy(
+    "monte_carlo",
+    Strategy(
+        "Samples layouts consistent with the shots on a process pool",
+        MonteCarloTargeting,
+    ),
+)
+register_strategy(
+    "anytime",
+    Strategy(
+        "Best of density, sampling and exact counting within a time budget",
+        AnytimeTargeting,
+    ),
+)
+
+# The AI strategy of the user config can only be checked now
+config.use_strategies(STRATEGIES)
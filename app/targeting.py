@@ -0,0 +1,540 @@
+from collections import Counter
+from functools import lru_cache
+from typing import NamedTuple
+from geometry import placement_table
+from knowledge import UNKNOWN, MISS, HIT, SUNK, EMPTY, KnowledgeBoard
+from utils import AttackResult, CellPool, window_sums
+import numpy as np
+
+# Weight multiplier of a placement for every unsunk hit it covers
+HIT_WEIGHT = 1000.0
+
+
+def spread(weights: np.ndarray, size: int, axis: int) -> np.ndarray:
+    """Adds the weight of every anchor to all the cells covered by the ship placed there
+
+    Args:
+        weights (np.ndarray): weights of the anchors, shorter by ``size - 1`` along ``axis``
+        size (int): size of the ship
+        axis (int): axis along which the ship lies
+
+    Returns:
+        np.ndarray: per-cell sums
+    """
+    shape = list(weights.shape)
+    shape[axis] += 2 * (size - 1)
+    padded = np.zeros(shape, dtype=weights.dtype)
+    if axis == 0:
+        padded[size - 1 : shape[0] - size + 1] = weights
+    else:
+        padded[:, size - 1 : shape[1] - size + 1] = weights
+    return window_sums(padded, size, axis)
+
+
+def shared_knowledge(
+    board_size: int, ship_sizes: list, knowledge: KnowledgeBoard | None
+) -> KnowledgeBoard:
+    """Returns the knowledge board a targeting records the shots on
+
+    Args:
+        board_size (int): size of the enemy board
+        ship_sizes (list): sizes of the enemy ships
+        knowledge (KnowledgeBoard | None): board shared with the player, None for a new one
+
+    Raises:
+        ValueError: if the shared board has shots recorded already, the targeting would not know them
+
+    Returns:
+        KnowledgeBoard: knowledge board
+    """
+    if knowledge is None:
+        return KnowledgeBoard(board_size, ship_sizes)
+    if (knowledge.state != UNKNOWN).any():
+        raise ValueError("The targeting must see all the shots of the knowledge board")
+    return knowledge
+
+
+class HuntTargetTargeting:
+    def __init__(
+        self,
+        board_size: int,
+        ship_sizes: list,
+        rng: np.random.Generator | None = None,
+        knowledge: KnowledgeBoard | None = None,
+    ) -> None:
+        """Hunt-target targeting.
+        Hunt mode: hitting random cells. If the last attack was a hit, the algorithm switches to target mode.
+        Target mode: hitting cells around the last hit cell. If the ship is sunk, the algorithm switches to hunt mode.
+
+        Args:
+            board_size (int): size of the enemy board
+            ship_sizes (list): sizes of the enemy ships
+            rng (np.random.Generator | None, optional): random generator of the hunt shots. Defaults to a new unseeded one.
+            knowledge (KnowledgeBoard | None, optional): board the shots are recorded on, shared with the player. Defaults to a new one.
+        """
+        self._board_size = board_size
+        self._rng = rng if rng is not None else np.random.default_rng()
+        self._knowledge = shared_knowledge(board_size, ship_sizes, knowledge)
+        self._target_list = []
+        self._previous_hit = None
+        # Cells not attacked yet and not known to be empty
+        self._unshot = CellPool(board_size**2)
+
+    def choose_target(self, time_budget: float | None = None) -> tuple:
+        """Chooses the next queued target or a random unshot cell
+
+        Args:
+            time_budget (float | None, optional): seconds the choice may take. Unused, the choice takes constant time. Defaults to None.
+
+        Returns:
+            tuple: (x, y) location
+        """
+        size = self._board_size
+        while self._target_list:
+            x, y = self._target_list.pop()
+            if x * size + y in self._unshot:
+                return x, y
+        return divmod(self._hunt_pool().choice(self._rng), size)
+
+    def _hunt_pool(self) -> CellPool:
+        """Returns the cells the hunt shots are drawn from
+
+        Returns:
+            CellPool: unshot cells
+        """
+        return self._unshot
+
+    def _discard(self, cell: int) -> None:
+        """Removes a shot or empty cell from the candidates
+
+        Args:
+            cell (int): flat index of the cell
+        """
+        if cell in self._unshot:
+            self._unshot.remove(cell)
+
+    def observe(self, location: tuple, result: AttackResult) -> None:
+        """Records the result of a shot and updates the queued targets
+
+        Args:
+            location (tuple): (x, y) location of the shot
+            result (AttackResult): result of the shot
+        """
+        size = self._board_size
+        x, y = location
+        observation = self._knowledge.record(location, result)
+        for cx, cy in (location, *observation.empty):
+            self._discard(cx * size + cy)
+
+        if result == AttackResult.HIT:
+            targets = set(self._target_list)
+            for i in range(-1, 2):
+                for j in range(-1, 2):
+                    target = (x + i, y + j)
+                    if (
+                        0 <= target[0] < size
+                        and 0 <= target[1] < size
+                        and target not in targets
+                        and target[0] * size + target[1] in self._unshot
+                    ):
+                        self._target_list.append(target)
+                        targets.add(target)
+
+            new_target_list = []
+            for target in self._target_list:
+                if target == self._previous_hit or target == (x, y):
+                    pass
+                elif (target[0] == x or target[1] == y) and (
+                    self._previous_hit is None
+                    or target[0] == self._previous_hit[0]
+                    or target[1] == self._previous_hit[1]
+                ):
+                    new_target_list.append(target)
+            self._target_list = new_target_list
+            self._previous_hit = (x, y)
+        elif result == AttackResult.SUNK:
+            self._target_list = []
+            self._previous_hit = None
+
+
+@lru_cache(maxsize=None)
+def lattice(board_size: int, stride: int, offset: int) -> tuple:
+    """Returns the cells of the diagonal lattice ``(x + y) % stride == offset``.
+    Every ship of size ``stride`` or more covers at least one of them.
+
+    Args:
+        board_size (int): size of the board
+        stride (int): spacing of the lattice
+        offset (int): diagonal of the lattice, from ``0`` to ``stride - 1``
+
+    Returns:
+        tuple: flat indexes of the cells
+    """
+    return tuple(
+        x * board_size + y
+        for x in range(board_size)
+        for y in range(board_size)
+        if (x + y) % stride == offset
+    )
+
+
+class ParityTargeting(HuntTargetTargeting):
+    def __init__(
+        self,
+        board_size: int,
+        ship_sizes: list,
+        rng: np.random.Generator | None = None,
+        knowledge: KnowledgeBoard | None = None,
+    ) -> None:
+        """Hunt-target targeting that hunts only on a lattice of cells spaced by the smallest
+        remaining ship, since every ship covers at least one of them. The lattice widens
+        when the smallest ships sink. Target mode is the same as in ``HuntTargetTargeting``.
+
+        Args:
+            board_size (int): size of the enemy board
+            ship_sizes (list): sizes of the enemy ships
+            rng (np.random.Generator | None, optional): random generator of the hunt shots. Defaults to a new unseeded one.
+            knowledge (KnowledgeBoard | None, optional): board the shots are recorded on, shared with the player. Defaults to a new one.
+        """
+        super().__init__(board_size, ship_sizes, rng, knowledge)
+        self._stride = None
+        self._lattice = None
+        self._update_lattice()
+
+    @property
+    def stride(self) -> int:
+        """Returns the spacing of the hunt lattice
+
+        Returns:
+            int: size of the smallest remaining ship
+        """
+        return self._stride
+
+    def _update_lattice(self) -> None:
+        """Rebuilds the pool of unshot lattice cells if the smallest remaining ship has changed"""
+        sizes = [size for size, count in self._knowledge.remaining.items() if count > 0]
+        stride = min(sizes) if sizes else 1
+        if stride == self._stride:
+            return
+
+        self._stride = stride
+        # A random diagonal, so the hunt shots are not predictable
+        offset = int(self._rng.integers(stride))
+        self._lattice = CellPool(
+            self._board_size**2,
+            [
+                cell
+                for cell in lattice(self._board_size, stride, offset)
+                if cell in self._unshot
+            ],
+        )
+
+    def _hunt_pool(self) -> CellPool:
+        """Returns the cells the hunt shots are drawn from
+
+        Returns:
+            CellPool: unshot lattice cells, or all the unshot cells once they are all shot
+        """
+        return self._lattice if len(self._lattice) else self._unshot
+
+    def _discard(self, cell: int) -> None:
+        """Removes a shot or empty cell from the candidates and the lattice
+
+        Args:
+            cell (int): flat index of the cell
+        """
+        super()._discard(cell)
+        if cell in self._lattice:
+            self._lattice.remove(cell)
+
+    def observe(self, location: tuple, result: AttackResult) -> None:
+        """Records the result of a shot, updates the queued targets and the lattice
+
+        Args:
+            location (tuple): (x, y) location of the shot
+            result (AttackResult): result of the shot
+        """
+        super().observe(location, result)
+        if result == AttackResult.SUNK:
+            self._update_lattice()
+
+
+class DensityTargeting:
+    def __init__(
+        self,
+        board_size: int,
+        ship_sizes: list,
+        rng: np.random.Generator | None = None,
+        knowledge: KnowledgeBoard | None = None,
+    ) -> None:
+        """Probability density targeting.
+
+        Every turn it counts, for each cell, how many placements of the remaining
+        enemy ships cover it, given the observed misses, hits and sunk ships,
+        and shoots at the most covered cell. Placements covering unsunk hits
+        are weighted up by ``HIT_WEIGHT`` per hit, so hits are finished off first.
+        All anchors of a ship size and axis are counted at once with window sums.
+
+        Args:
+            board_size (int): size of the enemy board
+            ship_sizes (list): sizes of the enemy ships
+            rng (np.random.Generator | None, optional): random generator used to break ties. Defaults to a new unseeded one.
+            knowledge (KnowledgeBoard | None, optional): board the shots are recorded on, shared with the player. Defaults to a new one.
+        """
+        self._board_size = board_size
+        self._knowledge = shared_knowledge(board_size, ship_sizes, knowledge)
+        # Shortcuts to the arrays of the knowledge board
+        self._state = self._knowledge.state
+        self._remaining = self._knowledge.remaining
+        self._rng = rng if rng is not None else np.random.default_rng()
+
+    @property
+    def knowledge(self) -> KnowledgeBoard:
+        """What the targeting knows about the enemy board
+
+        Returns:
+            KnowledgeBoard: knowledge board
+        """
+        return self._knowledge
+
+    @property
+    def state(self) -> np.ndarray:
+        """Matrix of observed cell codes (``UNKNOWN``, ``MISS``, ``HIT``, ``SUNK``, ``EMPTY``)
+
+        Returns:
+            np.ndarray: ``size x size`` int8 matrix indexed by ``[x, y]``
+        """
+        return self._state
+
+    @property
+    def remaining(self) -> Counter:
+        """Sizes of the enemy ships that are not sunk yet
+
+        Returns:
+            Counter: size -> number of ships
+        """
+        return self._remaining
+
+    def observe(self, location: tuple, result: AttackResult) -> None:
+        """Records the result of a shot
+
+        Args:
+            location (tuple): (x, y) location of the shot
+            result (AttackResult): result of the shot
+        """
+        observation = self._knowledge.record(location, result)
+        if observation.empty:
+            self._on_empty(observation.empty)
+        if observation.sunk:
+            self._on_sunk(observation.sunk)
+
+    def _on_empty(self, cells: list) -> None:
+        """Called after cells have been inferred to be empty on the knowledge board
+
+        Args:
+            cells (list): (x, y) empty cells
+        """
+
+    def _on_sunk(self, cells: list) -> None:
+        """Called after a ship has been sunk and recorded on the knowledge board
+
+        Args:
+            cells (list): (x, y) cells of the sunk ship
+        """
+
+    def density(self) -> np.ndarray:
+        """Computes the weighted number of placements covering every cell
+
+        Returns:
+            np.ndarray: ``size x size`` float matrix indexed by ``[x, y]``
+        """
+        blocked = (self._state == MISS) | (self._state == SUNK) | (self._state == EMPTY)
+        hits = self._state == HIT
+        any_hits = hits.any()
+        density = np.zeros((self._board_size, self._board_size))
+
+        for size, count in self._remaining.items():
+            if count <= 0 or size > self._board_size:
+                continue
+            # A single square ship has only one footprint per cell
+            for axis in (0, 1) if size > 1 else (1,):
+                weights = count * (window_sums(blocked, size, axis) == 0)
+                if any_hits:
+                    weights = weights * HIT_WEIGHT ** window_sums(hits, size, axis)
+                density += spread(weights, size, axis)
+
+        return density
+
+    def choose_target(self, time_budget: float | None = None) -> tuple:
+        """Chooses the unshot cell with the highest density. Ties are broken at random.
+
+        Args:
+            time_budget (float | None, optional): seconds the choice may take. The heat map takes
+                a bounded time, so it is only used by the anytime strategies. Defaults to None.
+
+        Returns:
+            tuple: (x, y) location
+        """
+        density = np.where(self._state == UNKNOWN, self.density(), -1.0)
+        candidates = np.flatnonzero(density == density.max())
+        x, y = divmod(int(self._rng.choice(candidates)), self._board_size)
+        return x, y
+
+
+class Coverage(NamedTuple):
+    """Placements of one ship size (one per footprint) and, for every cell,
+    the placements covering it in CSR form: ``placements[starts[cell] : starts[cell + 1]]``
+    """
+
+    squares: np.ndarray
+    placements: np.ndarray
+    starts: np.ndarray
+
+
+@lru_cache(maxsize=None)
+def coverage(board_size: int, size: int) -> Coverage:
+    """Builds the coverage index of a ship size from ``geometry.placement_table``
+
+    Args:
+        board_size (int): size of the board
+        size (int): size of the ship
+
+    Returns:
+        Coverage: footprints ``(P, size)`` and the inverted cell -> placements index
+    """
+    orientations = ("UP", "RIGHT") if size > 1 else ("UP",)
+    squares = np.concatenate(
+        [
+            placement_table(board_size, size, orientation).square_indexes
+            for orientation in orientations
+        ]
+    )
+    cells = squares.ravel()
+    order = np.argsort(cells, kind="stable")
+    starts = np.searchsorted(cells[order], np.arange(board_size**2 + 1))
+    return Coverage(squares=squares, placements=order // size, starts=starts)
+
+
+class IncrementalDensityTargeting(DensityTargeting):
+    def __init__(
+        self,
+        board_size: int,
+        ship_sizes: list,
+        rng: np.random.Generator | None = None,
+        knowledge: KnowledgeBoard | None = None,
+    ) -> None:
+        """Probability density targeting with incrementally maintained counts.
+
+        It computes the same density as ``DensityTargeting``, but keeps the
+        weight of every placement and the per-cell sums between turns.
+        A shot only touches the placements that cover the shot cell:
+        they are subtracted on a miss and re-weighted on a hit, so a move
+        costs time proportional to the number of affected placements.
+        When a ship sinks, the counts of the sizes are rebuilt from the
+        placement weights, which also drops the rounding error of the
+        large hit weights.
+
+        Args:
+            board_size (int): size of the enemy board
+            ship_sizes (list): sizes of the enemy ships
+            rng (np.random.Generator | None, optional): random generator used to break ties. Defaults to a new unseeded one.
+            knowledge (KnowledgeBoard | None, optional): board the shots are recorded on, shared with the player. Defaults to a new one.
+        """
+        super().__init__(board_size, ship_sizes, rng, knowledge)
+        self._coverages = {
+            size: coverage(board_size, size)
+            for size in self._remaining
+            if size <= board_size
+        }
+        self._weights = {
+            size: np.ones(len(table.squares)) for size, table in self._coverages.items()
+        }
+        self._size_densities = {}
+        self._density = np.zeros(board_size**2)
+        for size in self._coverages:
+            self._rebuild(size)
+
+    def _rebuild(self, size: int) -> None:
+        """Recomputes the per-cell counts of a ship size from the placement weights
+
+        Args:
+            size (int): size of the ship
+        """
+        table = self._coverages[size]
+        size_density = self._remaining[size] * np.bincount(
+            table.squares.ravel(),
+            weights=np.repeat(self._weights[size], size),
+            minlength=self._board_size**2,
+        )
+        self._density += size_density - self._size_densities.get(size, 0)
+        self._size_densities[size] = size_density
+
+    def _update(self, cell: int, factor: float) -> None:
+        """Multiplies the weights of the placements covering a cell and updates the counts
+
+        Args:
+            cell (int): flat index of the cell
+            factor (float): weight multiplier, ``0`` invalidates the placements
+        """
+        for size, table in self._coverages.items():
+            weights = self._weights[size]
+            placements = table.placements[table.starts[cell] : table.starts[cell + 1]]
+            placements = placements[weights[placements] > 0]
+            if not placements.size:
+                continue
+
+            delta = weights[placements] * (factor - 1)
+            weights[placements] *= factor
+            if self._remaining[size] <= 0:
+                continue
+
+            cells = table.squares[placements].ravel()
+            cell_delta = np.repeat(self._remaining[size] * delta, size)
+            np.add.at(self._size_densities[size], cells, cell_delta)
+            np.add.at(self._density, cells, cell_delta)
+
+    def observe(self, location: tuple, result: AttackResult) -> None:
+        """Records the result of a shot and updates the counts of the affected placements
+
+        Args:
+            location (tuple): (x, y) location of the shot
+            result (AttackResult): result of the shot
+        """
+        super().observe(location, result)
+        x, y = location
+
+        if result == AttackResult.MISS:
+            self._update(x * self._board_size + y, 0.0)
+        elif result == AttackResult.HIT:
+            self._update(x * self._board_size + y, HIT_WEIGHT)
+
+    def _on_empty(self, cells: list) -> None:
+        """Invalidates the placements covering the empty cells
+
+        Args:
+            cells (list): (x, y) empty cells
+        """
+        for x, y in cells:
+            self._update(x * self._board_size + y, 0.0)
+
+    def _on_sunk(self, cells: list) -> None:
+        """Invalidates the placements covering the sunk ship and rebuilds the counts
+
+        Args:
+            cells (list): (x, y) cells of the sunk ship
+        """
+        for x, y in cells:
+            self._update(x * self._board_size + y, 0.0)
+        for size in self._coverages:
+            self._rebuild(size)
+        self._density = sum(
+            self._size_densities.values(), np.zeros(self._board_size**2)
+        )
+
+    def density(self) -> np.ndarray:
+        """Returns the maintained weighted number of placements covering every cell
+
+        Returns:
+            np.ndarray: ``size x size`` float matrix indexed by ``[x, y]``
+        """
+        return self._density.reshape(self._board_size, self._board_size).copy()
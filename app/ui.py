@@ -1,5 +1,10 @@
 from boards import Board
+from knowledge import KnowledgeBoard, HIT, SUNK
+from metrics import instrumented
+from profiling import RENDER, marked
+from geometry import ship_geometry
 from ships import Ship
+from strategies import DIFFICULTIES, difficulty_name
 from config import config
 import cli_config
 from typing import Callable, Literal
@@ -108,7 +113,7 @@ class CLI:
         self,
         ship: Ship,
         board: Board,
-        ship_square_locations: list,
+        ship_square_locations: tuple,
         possible_location: bool = True,
     ) -> None:
         """Draws a ship on the board. It clolors the ship ``cli_config.colors["error"]``
@@ -117,7 +122,7 @@ class CLI:
         Args:
             ship (Ship): ship object
             board (Board): board object
-            ship_square_locations (list): list of (x, y) locations of the ship
+            ship_square_locations (tuple): (x, y) locations of the ship
             possible_location (bool, optional): indicates if it's possible to place
             the ship in that location. Defaults to True.
         """
@@ -293,6 +298,12 @@ class CLI:
             config.save()
             self.show_settings()
 
+        def change_ai_difficulty():
+            strategy = self.show_menu("AI difficulty", DIFFICULTIES)
+            config.AI_STRATEGY = strategy
+            config.save()
+            self.show_settings()
+
         def ship_sizes_subsettings():
             def change_ship_size(display_name: str, ship_name: str):
                 size = self.show_menu(
@@ -363,6 +374,7 @@ class CLI:
                 f"Board size: {config.BOARD_SIZE}x{config.BOARD_SIZE}": change_board_size,
                 f"Default ship orientation: {config.DEFAULT_ORIENTATION}": change_default_orientation,
                 f"Player side: {['LEFT', 'RIGHT'][config.DEFAULT_PLAYER_SIDE]}": change_default_player_side,
+                f"AI difficulty: {difficulty_name(config.AI_STRATEGY)}": change_ai_difficulty,
                 "Ship sizes": ship_sizes_subsettings,
                 "Ship set ": ship_set_subsettings,
                 "↺ Restore defaults": restore_defaults,
@@ -379,6 +391,8 @@ class CLI:
         self.screen.addstr(config.BOARD_SIZE + 3, 0, data["title"], curses.A_BOLD)
         self.screen.addstr(config.BOARD_SIZE + 4, 0, data["instructions"])
 
+    @instrumented("battleships_cli_show_board_seconds", "Latency of CLI.show_board")
+    @marked(RENDER)
     def show_board(
         self,
         board: Board,
@@ -387,6 +401,7 @@ class CLI:
         skip_refresh: bool = False,
         show_hits_only: bool = False,
         display_strength: bool = False,
+        knowledge: KnowledgeBoard | None = None,
     ) -> None:
         """Prints board to the console.
 
@@ -397,6 +412,7 @@ class CLI:
             skip_refresh (bool, optional): Decides of the function will skip the screen refresh. Defaults to False.
             show_hits_only (bool, optional): Decides if only hits will be shown. Defaults to False.
             display_strength (bool, optional): Decides if the ships strength will be shown. Defaults to False.
+            knowledge (KnowledgeBoard | None, optional): What the attacking player knows about the board. If set, hits are shown from it instead of the board's cells. Defaults to None.
         """
         horizontal_offset = (
             config.BOARD_SIZE + cli_config.DEFAULT_SPACE_BETWEEN_BOARDS + 1
@@ -413,11 +429,22 @@ class CLI:
             header = board.player.name
         self.screen.addstr(0, (horizontal_offset - 1) * 2, header)
 
+        state = knowledge.state if knowledge is not None and show_hits_only else None
         for i in range(board.size):
             for j in range(board.size):
-                cell = board.cell(i, j)
+                cell = board.cell(i, j) if state is None else None
                 color = Styles.GRID
-                if ommit_locations and (i, j) in ommit_locations or not cell:
+                if state is not None:
+                    bold = False
+                    if state[i, j] == SUNK:
+                        color = Styles.SUNK
+                        symbol = cli_config.symbols["shipHit"]
+                    elif state[i, j] == HIT:
+                        color = Styles.DESTROYED
+                        symbol = cli_config.symbols["shipHit"]
+                    else:
+                        symbol = cli_config.symbols["cell"]
+                elif ommit_locations and (i, j) in ommit_locations or not cell:
                     bold = False
                     symbol = cli_config.symbols["cell"]
                 else:
@@ -457,6 +484,7 @@ class CLI:
         show_hits_only: bool = False,
         instructions: dict | None = None,
         abortable: bool = False,
+        knowledge: KnowledgeBoard | None = None,
     ) -> tuple:
         """Gets a location from the user
 
@@ -466,6 +494,7 @@ class CLI:
             show_hits_only (bool, optional): Decides if only hits will be shown on the ``board``. Defaults to False.
             instructions (dict | None, optional): Instructions from ``cli_config.instructions`` to be shown to the user. Defaults to None.
             abortable (bool, optional): Decides if the user can abort the action. Defaults to False.
+            knowledge (KnowledgeBoard | None, optional): What the user knows about the ``board``, used to show the hits. Defaults to None.
         Returns:
             tuple: (x, y) location
         Raises:
@@ -482,6 +511,7 @@ class CLI:
                     skip_refresh=True,
                     show_hits_only=show_hits_only,
                     display_strength=True,
+                    knowledge=knowledge,
                 )
                 self.show_board(
                     additional_board,
@@ -547,11 +577,11 @@ class CLI:
 
         x, y = 0, 0
 
-        ommit_locations = []
+        ommit_locations = ()
         if location:
-            ommit_locations = board.calculate_square_locations(
-                location, orientation, ship.size
-            )[0]
+            ommit_locations = ship_geometry(
+                board.size, ship.size, orientation, location
+            ).squares
             x, y = location
 
         while True:
@@ -564,20 +594,14 @@ class CLI:
                 ]
             )
 
-            square_locations = board.calculate_square_locations(
-                (x, y), orientation, size
-            )
+            geometry = ship_geometry(board.size, size, orientation, (x, y))
 
             # Check if the ship can be placed there
-            if any(
-                board.cell(*square) is not None and square not in ommit_locations
-                for square in square_locations[1]
-            ):
-                possible_location = False
-            else:
-                possible_location = True
+            possible_location = board.is_valid_location(
+                size, (x, y), orientation, ship.uuid
+            )
 
-            self._draw_ship(ship, board, square_locations[0], possible_location)
+            self._draw_ship(ship, board, geometry.squares, possible_location)
 
             # Read user input
             key = self.screen.getch()
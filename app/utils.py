@@ -1,4 +1,5 @@
 from enum import Enum
+import numpy as np
 
 
 def uuid_generator():
@@ -30,3 +31,102 @@ class AttackResult(Enum):
     MISS = 0
     HIT = 1
     SUNK = 2
+
+
+def dilate(mask: np.ndarray) -> np.ndarray:
+    """Grows a 2D boolean mask by one cell in every direction (including diagonals)
+
+    Args:
+        mask (np.ndarray): 2D boolean mask
+
+    Returns:
+        np.ndarray: dilated mask of the same shape
+    """
+    width, height = mask.shape
+    padded = np.pad(mask, 1)
+    dilated = np.zeros_like(mask)
+    for dx in range(3):
+        for dy in range(3):
+            dilated |= padded[dx : dx + width, dy : dy + height]
+    return dilated
+
+
+def window_sums(mask: np.ndarray, size: int, axis: int) -> np.ndarray:
+    """Sums every ``size`` long window of a 2D array along the given axis using prefix sums
+
+    Args:
+        mask (np.ndarray): 2D boolean or numeric array
+        size (int): window length
+        axis (int): axis along which the windows slide
+
+    Returns:
+        np.ndarray: array of window sums. Its length along ``axis`` is ``mask.shape[axis] - size + 1``
+    """
+    shape = list(mask.shape)
+    shape[axis] += 1
+    prefix = np.zeros(shape, dtype=np.result_type(mask.dtype, np.int32))
+    if axis == 0:
+        np.cumsum(mask, axis=0, out=prefix[1:])
+        return prefix[size:] - prefix[:-size]
+    np.cumsum(mask, axis=1, out=prefix[:, 1:])
+    return prefix[:, size:] - prefix[:, :-size]
+
+
+class CellPool:
+    __slots__ = ("_cells", "_positions")
+
+    def __init__(self, cell_count: int, cells: list | None = None) -> None:
+        """Set of flat cell indexes with O(1) membership test, removal and random draw.
+        A removed cell is swapped with the last one, so the order of the pool is not kept.
+
+        Args:
+            cell_count (int): number of cells of the board
+            cells (list | None, optional): cells the pool starts with. Defaults to ``range(cell_count)``.
+        """
+        self._cells = list(cells) if cells is not None else list(range(cell_count))
+        # Position of every cell in _cells, -1 for cells outside of the pool
+        self._positions = [-1] * cell_count
+        for position, cell in enumerate(self._cells):
+            self._positions[cell] = position
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def __contains__(self, cell: int) -> bool:
+        return self._positions[cell] >= 0
+
+    def remove(self, cell: int) -> None:
+        """Removes a cell from the pool
+
+        Args:
+            cell (int): flat index of the cell
+
+        Raises:
+            KeyError: if the cell is not in the pool
+        """
+        position = self._positions[cell]
+        if position < 0:
+            raise KeyError(cell)
+
+        last = self._cells.pop()
+        if last != cell:
+            self._cells[position] = last
+            self._positions[last] = position
+        self._positions[cell] = -1
+
+    def choice(self, rng: np.random.Generator | None = None) -> int:
+        """Returns a random cell of the pool without removing it
+
+        Args:
+            rng (np.random.Generator | None, optional): random generator. Defaults to a new unseeded one.
+
+        Raises:
+            IndexError: if the pool is empty
+
+        Returns:
+            int: flat index of the cell
+        """
+        if not self._cells:
+            raise IndexError("Cannot choose from an empty pool")
+        rng = rng if rng is not None else np.random.default_rng()
+        return self._cells[int(rng.integers(len(self._cells)))]
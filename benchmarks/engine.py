@@ -0,0 +1,372 @@
+"""Speed of the game engine operations across board sizes.
+
+Every operation is timed one call at a time on the fleet layouts of a stored
+corpus, with fixed seeds, for both board engines. The report is printed as
+JSON: operations per second and latency percentiles of every operation.
+
+Run from the repository root::
+
+    python benchmarks/engine.py --sizes 10 15 20 50 > report.json
+
+The corpus is ``benchmarks/corpus/layouts.json``, rebuild it with ``--write-corpus``.
+"""
+
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Callable, Iterator
+import argparse
+import json
+import platform
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "app"))
+
+from boards import Board, BitBoard  # noqa: E402
+from config import config  # noqa: E402
+from game import Game  # noqa: E402
+from geometry import ORIENTATIONS  # noqa: E402
+from layouts import default_ship_sizes, random_layout  # noqa: E402
+from players import AIPlayer, Player  # noqa: E402
+import numpy as np  # noqa: E402
+
+CORPUS_PATH = Path(__file__).resolve().parent / "corpus" / "layouts.json"
+# 10, 15 and 20 are playable sizes, 50 is a synthetic stress size
+DEFAULT_SIZES = (10, 15, 20, 50)
+ENGINES = (Board, BitBoard)
+PERCENTILES = (50, 90, 99)
+
+
+def write_corpus(sizes: list, layouts: int, seed: int) -> dict:
+    """Generates the fleet layouts of the default ship set on every board size and stores them
+
+    Args:
+        sizes (list): board sizes
+        layouts (int): layouts per board size
+        seed (int): seed of the layout generator
+
+    Returns:
+        dict: board size (as a string) -> list of ``(x, y, orientation)`` layouts
+    """
+    rng = np.random.default_rng(seed)
+    corpus = {
+        str(size): [
+            random_layout(size, default_ship_sizes(), rng) for _ in range(layouts)
+        ]
+        for size in sizes
+    }
+    CORPUS_PATH.parent.mkdir(exist_ok=True)
+    with open(CORPUS_PATH, "w") as file:
+        json.dump(corpus, file)
+    return corpus
+
+
+def load_corpus() -> dict:
+    """Loads the stored fleet layouts
+
+    Returns:
+        dict: board size (as a string) -> list of ``(x, y, orientation)`` layouts
+    """
+    with open(CORPUS_PATH) as file:
+        return json.load(file)
+
+
+def place(player: Player, layout: list) -> None:
+    """Places the ships of a player as in a corpus layout
+
+    Args:
+        player (Player): player with the default ship set
+        layout (list): ``(x, y, orientation)`` of every ship
+    """
+    for ship, (x, y, orientation) in zip(player.ships.values(), layout):
+        player.board.add_ship(ship.uuid, (x, y), orientation)
+
+
+def timed(call: Callable, *args) -> int:
+    """Calls a function once
+
+    Args:
+        call (Callable): function to call
+        *args: arguments of the call
+
+    Returns:
+        int: duration of the call in nanoseconds
+    """
+    start = perf_counter_ns()
+    call(*args)
+    return perf_counter_ns() - start
+
+
+def bench_add_ship(engine: type[Board], corpus: list, seed: int) -> Iterator[int]:
+    """Adds every ship of every layout to an empty board
+
+    Args:
+        engine (type[Board]): board engine
+        corpus (list): fleet layouts
+        seed (int): seed of the random choices
+
+    Yields:
+        int: duration of every operation in nanoseconds
+    """
+    for layout in corpus:
+        board = Player(board_class=engine).board
+        for ship, (x, y, orientation) in zip(board.player.ships.values(), layout):
+            yield timed(board.add_ship, ship.uuid, (x, y), orientation)
+
+
+def bench_move_ship(engine: type[Board], corpus: list, seed: int) -> Iterator[int]:
+    """Moves every placed ship back to its own location
+
+    Args:
+        engine (type[Board]): board engine
+        corpus (list): fleet layouts
+        seed (int): seed of the random choices
+
+    Yields:
+        int: duration of every operation in nanoseconds
+    """
+    for layout in corpus:
+        player = Player(board_class=engine)
+        place(player, layout)
+        for ship, (x, y, orientation) in zip(player.ships.values(), layout):
+            yield timed(player.board.move_ship, ship.uuid, (x, y), orientation)
+
+
+def bench_get_possible_locations(
+    engine: type[Board], corpus: list, seed: int
+) -> Iterator[int]:
+    """Lists the legal anchors of every ship size and orientation on every layout
+
+    Args:
+        engine (type[Board]): board engine
+        corpus (list): fleet layouts
+        seed (int): seed of the random choices
+
+    Yields:
+        int: duration of every operation in nanoseconds
+    """
+    for layout in corpus:
+        player = Player(board_class=engine)
+        place(player, layout)
+        for size in sorted({ship.size for ship in player.ships.values()}):
+            for orientation in ORIENTATIONS:
+                yield timed(player.board.get_possible_locations, size, orientation)
+
+
+def bench_calculate_square_locations(
+    engine: type[Board], corpus: list, seed: int
+) -> Iterator[int]:
+    """Computes the squares of every ship of every layout
+
+    Args:
+        engine (type[Board]): board engine
+        corpus (list): fleet layouts
+        seed (int): seed of the random choices
+
+    Yields:
+        int: duration of every operation in nanoseconds
+    """
+    board = Player(board_class=engine).board
+    sizes = default_ship_sizes()
+    for layout in corpus:
+        for size, (x, y, orientation) in zip(sizes, layout):
+            yield timed(board.calculate_square_locations, (x, y), orientation, size)
+
+
+def bench_attack(engine: type[Board], corpus: list, seed: int) -> Iterator[int]:
+    """Attacks every cell of every layout once, in a random order
+
+    Args:
+        engine (type[Board]): board engine
+        corpus (list): fleet layouts
+        seed (int): seed of the random choices
+
+    Yields:
+        int: duration of every operation in nanoseconds
+    """
+    rng = np.random.default_rng(seed)
+    for layout in corpus:
+        player = Player(board_class=engine)
+        place(player, layout)
+        for cell in rng.permutation(player.board.size**2):
+            x, y = divmod(int(cell), player.board.size)
+            yield timed(player.board.attack, x, y)
+
+
+def bench_initialize_board(
+    engine: type[Board], corpus: list, seed: int
+) -> Iterator[int]:
+    """Places a random fleet of an AI player, once per layout
+
+    Args:
+        engine (type[Board]): board engine
+        corpus (list): fleet layouts
+        seed (int): seed of the random choices
+
+    Yields:
+        int: duration of every operation in nanoseconds
+    """
+    for game in range(len(corpus)):
+        player = AIPlayer(board_class=engine, rng=np.random.default_rng([seed, game]))
+        yield timed(player.initialize_board)
+
+
+def bench_attack_enemy(engine: type[Board], corpus: list, seed: int) -> Iterator[int]:
+    """Lets an AI player attack every layout until its fleet sinks
+
+    Args:
+        engine (type[Board]): board engine
+        corpus (list): fleet layouts
+        seed (int): seed of the random choices
+
+    Yields:
+        int: duration of every operation in nanoseconds
+    """
+    for game, layout in enumerate(corpus):
+        player = AIPlayer(board_class=engine, rng=np.random.default_rng([seed, game]))
+        enemy = Player(board_class=engine)
+        player.set_enemy(enemy)
+        place(enemy, layout)
+        while enemy.fleet_strength:
+            yield timed(player.attack_enemy)
+
+
+def bench_game_start(engine: type[Board], corpus: list, seed: int) -> Iterator[int]:
+    """Plays whole AI vs AI games
+
+    Args:
+        engine (type[Board]): board engine
+        corpus (list): fleet layouts
+        seed (int): seed of the random choices
+
+    Yields:
+        int: duration of every operation in nanoseconds
+    """
+    # Whole games are slow on the large boards, a few of them are enough
+    for number in range(min(len(corpus), 8)):
+        game = Game(
+            AIPlayer(side=0, board_class=engine),
+            AIPlayer(side=1, board_class=engine),
+            np.random.SeedSequence([seed, number]),
+        )
+        game.initialize_boards()
+        yield timed(game.start)
+
+
+BENCHMARKS = {
+    "add_ship": bench_add_ship,
+    "move_ship": bench_move_ship,
+    "get_possible_locations": bench_get_possible_locations,
+    "calculate_square_locations": bench_calculate_square_locations,
+    "attack": bench_attack,
+    "AIPlayer.initialize_board": bench_initialize_board,
+    "AIPlayer.attack_enemy": bench_attack_enemy,
+    "Game.start": bench_game_start,
+}
+
+
+def run(name: str, engine: type[Board], size: int, corpus: list, seed: int) -> dict:
+    """Runs a benchmark on a board size
+
+    Args:
+        name (str): name of the benchmark in ``BENCHMARKS``
+        engine (type[Board]): board engine
+        size (int): board size
+        corpus (list): fleet layouts of the board size
+        seed (int): seed of the random choices of the benchmark
+
+    Returns:
+        dict: operation count, operations per second and latency percentiles in microseconds
+    """
+    durations = np.fromiter(BENCHMARKS[name](engine, corpus, seed), dtype=np.int64)
+    percentiles = np.percentile(durations, PERCENTILES) / 1e3
+    return {
+        "benchmark": name,
+        "engine": engine.__name__,
+        "board_size": size,
+        "ops": len(durations),
+        "ops_per_sec": len(durations) / durations.sum() * 1e9,
+        **{f"p{p}_us": value for p, value in zip(PERCENTILES, percentiles)},
+    }
+
+
+def run_all(
+    corpus: dict,
+    sizes: list,
+    benchmarks: list | None = None,
+    layouts: int | None = None,
+    seed: int = 0,
+) -> list:
+    """Runs benchmarks on every engine and board size
+
+    Args:
+        corpus (dict): board size (as a string) -> fleet layouts, see ``load_corpus``
+        sizes (list): board sizes
+        benchmarks (list | None, optional): names of the benchmarks. Defaults to all of ``BENCHMARKS``.
+        layouts (int | None, optional): corpus layouts used per size. Defaults to all of them.
+        seed (int, optional): seed of the random choices of the benchmarks. Defaults to 0.
+
+    Raises:
+        KeyError: if the corpus has no layouts of a board size
+
+    Returns:
+        list: results of ``run``
+    """
+    benchmarks = benchmarks if benchmarks is not None else list(BENCHMARKS)
+    board_size = config.BOARD_SIZE
+    results = []
+    try:
+        for size in sizes:
+            size_layouts = corpus[str(size)][:layouts]
+            config.BOARD_SIZE = size
+            for name in benchmarks:
+                for engine in ENGINES:
+                    # Warm up the caches shared by all boards (geometry, placement tables)
+                    for _ in BENCHMARKS[name](engine, size_layouts[:1], seed):
+                        pass
+                    results.append(run(name, engine, size, size_layouts, seed))
+    finally:
+        config.BOARD_SIZE = board_size
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument(
+        "--benchmarks",
+        nargs="+",
+        default=list(BENCHMARKS),
+        choices=list(BENCHMARKS),
+        metavar="BENCHMARK",
+    )
+    parser.add_argument("--layouts", type=int, default=None, help="corpus layouts used")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--write-corpus",
+        action="store_true",
+        help="regenerate the corpus (32 layouts per size) from the seed",
+    )
+    args = parser.parse_args()
+
+    if args.write_corpus:
+        corpus = write_corpus(args.sizes, 32, args.seed)
+    else:
+        corpus = load_corpus()
+    missing = [size for size in args.sizes if str(size) not in corpus]
+    if missing:
+        parser.error(f"no layouts of sizes {missing} in the corpus, use --write-corpus")
+
+    report = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "seed": args.seed,
+        "results": run_all(
+            corpus, args.sizes, args.benchmarks, args.layouts, args.seed
+        ),
+    }
+    json.dump(report, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
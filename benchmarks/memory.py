@@ -0,0 +1,114 @@
+"""Memory footprint of in-memory game states and of ships.
+
+Run from the repository root::
+
+    python benchmarks/memory.py --games 2000
+"""
+
+from pathlib import Path
+import argparse
+import sys
+import tracemalloc
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "app"))
+
+from typing import Callable  # noqa: E402
+from boards import Board, BitBoard  # noqa: E402
+from config import config  # noqa: E402
+from game import Game  # noqa: E402
+from players import AIPlayer  # noqa: E402
+from ships import Ship  # noqa: E402
+from utils import get_uuid  # noqa: E402
+
+
+class DictShip:
+    """Ship stored as before ``__slots__``: attributes in an instance ``__dict__``
+    and the squares as a list of bools"""
+
+    def __init__(self, size: int) -> None:
+        self._squares = [True] * size
+        self._uuid = get_uuid()
+        self._location = None
+        self._orientation = config.DEFAULT_ORIENTATION
+        self._under_edition = True
+
+
+def new_game(board_class: type[Board]) -> Game:
+    """Creates a game between two AI players with initialized boards
+
+    Args:
+        board_class (type[Board]): board engine to use
+
+    Returns:
+        Game: game object
+    """
+    game = Game(
+        AIPlayer(side=0, board_class=board_class),
+        AIPlayer(side=1, board_class=board_class),
+    )
+    game.initialize_boards()
+    return game
+
+
+def bytes_per_game(board_class: type[Board], games: int) -> float:
+    """Measures the average number of bytes allocated for one game state
+
+    Args:
+        board_class (type[Board]): board engine to use
+        games (int): number of game states kept alive at the same time
+
+    Returns:
+        float: bytes per game
+    """
+    # Warm up the caches shared by all games (geometry, placement tables)
+    new_game(board_class)
+
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    states = [new_game(board_class) for _ in range(games)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del states
+    return (current - baseline) / games
+
+
+def bytes_per_ship(ship_class: Callable, ships: int, size: int = 3) -> float:
+    """Measures the average number of bytes allocated for one ship
+
+    Args:
+        ship_class (Callable): ship class, called with the ship size
+        ships (int): number of ships kept alive at the same time
+        size (int, optional): size of the ships. Defaults to 3.
+
+    Returns:
+        float: bytes per ship
+    """
+    ship_class(size)
+
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    states = [ship_class(size) for _ in range(ships)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del states
+    return (current - baseline) / ships
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--ships", type=int, default=100_000)
+    args = parser.parse_args()
+
+    for board_class in (Board, BitBoard):
+        size = bytes_per_game(board_class, args.games)
+        print(f"{board_class.__name__:<10} {size:>10.0f} bytes/game")
+    for ship_class in (DictShip, Ship):
+        size = bytes_per_ship(ship_class, args.ships)
+        print(f"{ship_class.__name__:<10} {size:>10.0f} bytes/ship")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""Performance regression gate of the game engine hot paths.
+
+It runs the ``engine.py`` benchmarks several times and stores the median
+latencies of every run as a baseline, or compares fresh runs against it.
+A benchmark regresses if it got slower by more than its tolerance and a
+one-sided Mann-Whitney U test over the runs finds the slowdown significant.
+The command exits with status 1 if any benchmark regressed.
+
+Baselines are only comparable on the machine they were recorded on, so they
+are not committed, and ``check`` refuses a baseline recorded with another
+Python or numpy version or on another platform.
+Run from the repository root::
+
+    python benchmarks/regression.py record
+    python benchmarks/regression.py check --tolerance Game.start=0.3
+"""
+
+from functools import lru_cache
+from math import comb
+from pathlib import Path
+import argparse
+import json
+import platform
+import sys
+
+from engine import BENCHMARKS, load_corpus, run_all
+import numpy as np
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines" / "default.json"
+SIZES = (10, 15, 20)
+# Slowdown allowed before a benchmark counts as regressed, as a fraction of the baseline
+DEFAULT_TOLERANCE = 0.1
+TOLERANCES = {
+    # Few, long and noisy operations
+    "AIPlayer.initialize_board": 0.25,
+    "Game.start": 0.2,
+}
+
+
+def environment() -> dict:
+    """Returns the versions and the platform the benchmarks run on
+
+    Returns:
+        dict: Python and numpy versions and platform description
+    """
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+    }
+
+
+def key(result: dict) -> str:
+    """Returns the name of a benchmark result in the baselines
+
+    Args:
+        result (dict): result of ``engine.run``
+
+    Returns:
+        str: ``benchmark/engine/board_size``
+    """
+    return f"{result['benchmark']}/{result['engine']}/{result['board_size']}"
+
+
+def measure(repeats: int, sizes: list, layouts: int, seed: int) -> dict:
+    """Runs all the benchmarks several times
+
+    Args:
+        repeats (int): number of runs
+        sizes (list): board sizes
+        layouts (int): corpus layouts used per size
+        seed (int): seed of the benchmarks
+
+    Returns:
+        dict: benchmark name -> median latency in microseconds of every run
+    """
+    corpus = load_corpus()
+    samples = {}
+    for _ in range(repeats):
+        for result in run_all(corpus, sizes, layouts=layouts, seed=seed):
+            samples.setdefault(key(result), []).append(result["p50_us"])
+    return samples
+
+
+@lru_cache(maxsize=None)
+def _u_counts(m: int, n: int) -> tuple:
+    """Counts the orderings of two samples of sizes m and n by their U statistic
+
+    Args:
+        m (int): size of the first sample
+        n (int): size of the second sample
+
+    Returns:
+        tuple: number of orderings with ``U = 0, 1, ..., m * n``
+    """
+    if m == 0 or n == 0:
+        return (1,)
+    # The largest value comes either from the first sample (beating all n values
+    # of the second one) or from the second sample
+    with_first = _u_counts(m - 1, n)
+    with_second = _u_counts(m, n - 1)
+    counts = [0] * (m * n + 1)
+    for u, count in enumerate(with_first):
+        counts[u + n] += count
+    for u, count in enumerate(with_second):
+        counts[u] += count
+    return tuple(counts)
+
+
+def slower_p_value(baseline: list, current: list) -> float:
+    """Exact one-sided Mann-Whitney U test of the current samples being larger than the baseline ones
+
+    Args:
+        baseline (list): baseline samples
+        current (list): current samples
+
+    Returns:
+        float: probability of a U statistic at least as large if both samples came from the same distribution
+    """
+    # Ties count as half a win
+    u = sum((c > b) + 0.5 * (c == b) for c in current for b in baseline)
+    counts = _u_counts(len(current), len(baseline))
+    tail = sum(count for value, count in enumerate(counts) if value >= u)
+    return tail / comb(len(current) + len(baseline), len(current))
+
+
+def compare(
+    baseline: dict, current: dict, tolerances: dict, alpha: float = 0.05
+) -> list:
+    """Compares fresh samples against the baseline
+
+    Args:
+        baseline (dict): benchmark name -> baseline samples
+        current (dict): benchmark name -> current samples
+        tolerances (dict): benchmark (without engine and size) -> allowed slowdown
+        alpha (float, optional): significance level of the test. Defaults to 0.05.
+
+    Returns:
+        list: ``(name, change, p_value, regressed)`` tuples of the benchmarks in both
+    """
+    rows = []
+    for name in sorted(baseline.keys() & current.keys()):
+        change = np.median(current[name]) / np.median(baseline[name]) - 1
+        p_value = slower_p_value(baseline[name], current[name])
+        tolerance = tolerances.get(name.split("/")[0], DEFAULT_TOLERANCE)
+        rows.append((name, change, p_value, change > tolerance and p_value < alpha))
+    return rows
+
+
+def parse_tolerance(value: str) -> tuple:
+    """Parses a ``BENCHMARK=FRACTION`` command line tolerance"""
+    name, _, fraction = value.partition("=")
+    if name not in BENCHMARKS:
+        raise argparse.ArgumentTypeError(f"unknown benchmark {name}")
+    try:
+        return name, float(fraction)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid tolerance {value}") from None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=["record", "check"])
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--layouts", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument(
+        "--tolerance",
+        type=parse_tolerance,
+        action="append",
+        default=[],
+        metavar="BENCHMARK=FRACTION",
+        help=f"allowed slowdown of a benchmark, {DEFAULT_TOLERANCE} by default",
+    )
+    args = parser.parse_args()
+
+    if args.command == "record":
+        samples = measure(args.repeats, args.sizes, args.layouts, args.seed)
+        args.baseline.parent.mkdir(exist_ok=True)
+        with open(args.baseline, "w") as file:
+            json.dump(
+                {
+                    **environment(),
+                    "sizes": args.sizes,
+                    "layouts": args.layouts,
+                    "seed": args.seed,
+                    "samples": samples,
+                },
+                file,
+                indent=2,
+            )
+        print(f"Recorded {len(samples)} benchmarks in {args.baseline}")
+        return
+
+    try:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+    except FileNotFoundError:
+        parser.error(f"no baseline in {args.baseline}, record one first")
+    mismatched = [
+        f"{name} {baseline.get(name)} (now {value})"
+        for name, value in environment().items()
+        if baseline.get(name) != value
+    ]
+    if mismatched:
+        parser.error(
+            "the baseline was recorded with another "
+            + ", ".join(mismatched)
+            + ", record it again"
+        )
+    # The benchmarks must run on the same workload as the baseline
+    samples = measure(
+        args.repeats, baseline["sizes"], baseline["layouts"], baseline["seed"]
+    )
+    tolerances = {**TOLERANCES, **dict(args.tolerance)}
+    rows = compare(baseline["samples"], samples, tolerances, args.alpha)
+
+    print(f"{'benchmark':<45} {'change':>8} {'p-value':>8}")
+    for name, change, p_value, regressed in rows:
+        flag = "  REGRESSED" if regressed else ""
+        print(f"{name:<45} {change:>+8.1%} {p_value:>8.3f}{flag}")
+
+    regressions = sum(regressed for *_, regressed in rows)
+    print(f"{regressions} of {len(rows)} benchmarks regressed")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
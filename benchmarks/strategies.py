@@ -0,0 +1,84 @@
+"""Strength and cost of every registered AI strategy.
+
+Every strategy plays against random fleets until they sink. It reports the
+average number of shots needed to win and the average time of a move.
+
+Run from the repository root::
+
+    python benchmarks/strategies.py --games 50
+"""
+
+from pathlib import Path
+from time import perf_counter
+import argparse
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "app"))
+
+from boards import BitBoard  # noqa: E402
+from players import AIPlayer  # noqa: E402
+from strategies import STRATEGIES  # noqa: E402
+
+
+def play(strategy: str) -> tuple:
+    """Plays one game of a strategy against a random fleet
+
+    Args:
+        strategy (str): name of the strategy
+
+    Returns:
+        tuple: number of shots and seconds spent choosing and making them
+    """
+    player = AIPlayer(board_class=BitBoard, strategy=strategy)
+    enemy = AIPlayer(board_class=BitBoard)
+    player.set_enemy(enemy)
+    enemy.initialize_board()
+
+    shots = 0
+    start = perf_counter()
+    while enemy.fleet_strength:
+        player.attack_enemy()
+        shots += 1
+    return shots, perf_counter() - start
+
+
+def benchmark(strategy: str, games: int) -> tuple:
+    """Measures a strategy over several games
+
+    Args:
+        strategy (str): name of the strategy
+        games (int): number of games
+
+    Returns:
+        tuple: average shots to win and microseconds per move
+    """
+    # Warm up the caches shared by all games (geometry, placement tables)
+    play(strategy)
+
+    total_shots, total_time = 0, 0.0
+    for _ in range(games):
+        shots, time = play(strategy)
+        total_shots += shots
+        total_time += time
+    return total_shots / games, total_time / total_shots * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument(
+        "strategies",
+        nargs="*",
+        default=list(STRATEGIES),
+        help="strategies to measure, all the registered ones by default",
+    )
+    args = parser.parse_args()
+
+    print(f"{'strategy':<20} {'shots/win':>10} {'us/move':>12}")
+    for strategy in args.strategies:
+        shots, micros = benchmark(strategy, args.games)
+        print(f"{strategy:<20} {shots:>10.1f} {micros:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+from anytime import AnytimeTargeting, HEURISTIC, SAMPLED, EXACT
+from utils import AttackResult
+import numpy as np
+
+
+def test_anytime_targeting_no_time():
+    targeting = AnytimeTargeting(3, [2], np.random.default_rng(0))
+    targeting.choose_target(time_budget=0)
+
+    assert targeting.quality == HEURISTIC
+    assert targeting.accepted == 0
+
+
+def test_anytime_targeting_exact():
+    targeting = AnytimeTargeting(4, [2], np.random.default_rng(0))
+    targeting.observe((1, 1), AttackResult.HIT)
+    target = targeting.choose_target(time_budget=5.0)
+
+    assert targeting.quality == EXACT
+    assert target in [(0, 1), (2, 1), (1, 0), (1, 2)]
+
+
+def test_anytime_targeting_sampled():
+    targeting = AnytimeTargeting(
+        10, [5, 4, 3], np.random.default_rng(0), samples=200, threshold=0
+    )
+    targeting.choose_target(time_budget=5.0)
+
+    assert targeting.quality == SAMPLED
+    assert targeting.accepted == 200
+
+
+def test_anytime_targeting_too_few_samples():
+    targeting = AnytimeTargeting(
+        10,
+        [5, 4, 3],
+        np.random.default_rng(0),
+        time_budget=0.01,
+        min_samples=10**6,
+        threshold=0,
+    )
+    density = targeting.density()
+
+    assert targeting.quality == HEURISTIC
+    assert targeting.accepted == 0
+    assert density[0, 0] > 0
@@ -1,5 +1,6 @@
 from boards import (
     Board,
+    BitBoard,
     Cell,
     DoubleDestructionError,
     CellAlreadyOccupiedError,
@@ -36,6 +37,13 @@ def test_cell_repr():
     assert cell.__repr__() == "Cell(57, 2, True)"
 
 
+def test_cell_slots():
+    cell = Cell(shipUUID=57, squareIndex=2, alive=True)
+
+    with pytest.raises(AttributeError):
+        cell.__dict__
+
+
 def test_cell_destroy_dead():
     cell = Cell(shipUUID=57, squareIndex=2, alive=False)
 
@@ -210,7 +218,7 @@ def test_board_add_ship_with_damage():
     # for implementing custom game modes in the future
 
     ship = Ship(4)
-    ship._squares = [True, False, True, True]
+    ship.squares = [True, False, True, True]
 
     player = Player(ships=[ship])
     board = Board(player=player)
@@ -406,11 +414,10 @@ def test_board_get_possible_locations_2(monkeypatch):
 
 def test_board_get_possible_locations_occupied_squares_1(monkeypatch):
     monkeypatch.setattr("config.config.BOARD_SIZE", 10)
-    player = Player()
+    ship = Ship(3)
+    player = Player(ships=[ship])
     board = Board(player=player)
-    board._matrix[3, 4] = Cell(shipUUID=1, squareIndex=0, alive=True)
-    board._matrix[3, 5] = Cell(shipUUID=1, squareIndex=1, alive=True)
-    board._matrix[3, 6] = Cell(shipUUID=1, squareIndex=3, alive=True)
+    board.add_ship(shipUUID=ship.uuid, location=(3, 4), orientation="UP")
 
     assert board.get_possible_locations(size=10, orientation="RIGHT") == [
         (0, i) for i in chain(range(3), range(8, board._size))
@@ -419,11 +426,10 @@ def test_board_get_possible_locations_occupied_squares_1(monkeypatch):
 
 def test_board_get_possible_locations_occupied_squares_2(monkeypatch):
     monkeypatch.setattr("config.config.BOARD_SIZE", 10)
-    player = Player()
+    ship = Ship(3)
+    player = Player(ships=[ship])
     board = Board(player=player)
-    board._matrix[0, 0] = Cell(shipUUID=1, squareIndex=0, alive=True)
-    board._matrix[1, 0] = Cell(shipUUID=1, squareIndex=1, alive=True)
-    board._matrix[2, 0] = Cell(shipUUID=1, squareIndex=3, alive=True)
+    board.add_ship(shipUUID=ship.uuid, location=(0, 0), orientation="RIGHT")
 
     assert board.get_possible_locations(size=10, orientation="RIGHT") == [
         (0, i) for i in range(2, board._size)
@@ -432,9 +438,10 @@ def test_board_get_possible_locations_occupied_squares_2(monkeypatch):
 
 def test_board_get_possible_locations_occupied_squares_3(monkeypatch):
     monkeypatch.setattr("config.config.BOARD_SIZE", 10)
-    player = Player()
+    ship = Ship(1)
+    player = Player(ships=[ship])
     board = Board(player=player)
-    board._matrix[0, 0] = Cell(shipUUID=1, squareIndex=0, alive=True)
+    board.add_ship(shipUUID=ship.uuid, location=(0, 0), orientation="UP")
 
     assert board.get_possible_locations(size=10, orientation="RIGHT") == [
         (0, i) for i in range(2, board._size)
@@ -484,3 +491,215 @@ def test_board_attack_destroyed_cell():
 
     with pytest.raises(HitDestroyedSquareError):
         board.attack(3, 4)
+
+
+def test_bit_board_constructor():
+    player = Player()
+    board = BitBoard(player=player)
+
+    assert board._player == player
+    assert board._size == config.BOARD_SIZE
+    assert board._occupied_rows == [0] * config.BOARD_SIZE
+    assert board._hit_rows == [0] * config.BOARD_SIZE
+    assert board._cell_ships == [None] * config.BOARD_SIZE**2
+
+
+def test_bit_board_add_ship():
+    ship = Ship(4)
+    ship.squares = [True, False, True, True]
+    player = Player(ships=[ship])
+    board = BitBoard(player=player)
+
+    board.add_ship(shipUUID=ship.uuid, location=(3, 4), orientation="RIGHT")
+
+    for index in range(4):
+        cell = board.cell(3 + index, 4)
+        assert cell.shipUUID == ship.uuid
+        assert cell.squareIndex == index
+        assert cell.alive is (index != 1)
+    assert board.cell(2, 4) is None
+    assert ship.location == (3, 4)
+    assert ship.orientation == "RIGHT"
+
+
+def test_bit_board_add_ship_cell_already_occupied():
+    ship = Ship(4)
+    player = Player(ships=[ship])
+    board = BitBoard(player=player)
+    board.add_ship(shipUUID=ship.uuid, location=(3, 4), orientation="RIGHT")
+
+    with pytest.raises(CellAlreadyOccupiedError):
+        board.add_ship(shipUUID=ship.uuid, location=(2, 5), orientation="UP")
+
+
+def test_bit_board_move_ship():
+    ship = Ship(4)
+    player = Player(ships=[ship])
+    board = BitBoard(player=player)
+    board.add_ship(shipUUID=ship.uuid, location=(3, 4), orientation="RIGHT")
+    board.attack(3, 4)
+    board.move_ship(shipUUID=ship.uuid, location=(4, 4), orientation="UP")
+
+    assert board.cell(3, 4) is None
+    assert board.cell(4, 4).alive is False
+    assert board.cell(4, 5).alive is True
+    assert np.count_nonzero(board.occupancy_mask()) == 4
+    assert ship.location == (4, 4)
+
+
+def test_bit_board_remove_ship_unlocated():
+    ship = Ship(4)
+    player = Player(ships=[ship])
+    board = BitBoard(player=player)
+
+    with pytest.raises(UnlocatedShipRemovalError):
+        board.remove_ship(shipUUID=ship.uuid)
+
+
+def test_bit_board_get_cell_index_error():
+    board = BitBoard(player=Player())
+
+    with pytest.raises(LocationOutsideOfRangeError):
+        board.cell(123, 1)
+    with pytest.raises(LocationOutsideOfRangeError):
+        board.attack(-1, 1)
+
+
+def test_bit_board_attack():
+    ship = Ship(2)
+    player = Player(ships=[ship])
+    board = BitBoard(player=player)
+    board.add_ship(shipUUID=ship.uuid, location=(3, 4), orientation="RIGHT")
+
+    assert board.attack(3, 3) == AttackResult.MISS
+    assert board.attack(3, 4) == AttackResult.HIT
+    with pytest.raises(HitDestroyedSquareError):
+        board.attack(3, 4)
+    assert board.attack(4, 4) == AttackResult.SUNK
+    assert ship.strength == 0
+    assert player.fleet_strength == 0
+
+
+@pytest.mark.parametrize("orientation", ["UP", "DOWN", "LEFT", "RIGHT"])
+def test_bit_board_get_possible_locations_matches_board(orientation):
+    ship = Ship(3)
+    player = Player(ships=[ship])
+    board = Board(player=player)
+    bit_board = BitBoard(player=player)
+    board.add_ship(shipUUID=ship.uuid, location=(4, 4), orientation="UP")
+    bit_board.add_ship(shipUUID=ship.uuid, location=(4, 4), orientation="UP")
+
+    assert board.get_possible_locations(
+        4, orientation
+    ) == bit_board.get_possible_locations(4, orientation)
+
+
+def test_board_get_possible_locations_mask(monkeypatch):
+    monkeypatch.setattr("config.config.BOARD_SIZE", 10)
+    ship = Ship(1)
+    player = Player(ships=[ship])
+    board = Board(player=player)
+    board.add_ship(shipUUID=ship.uuid, location=(0, 0), orientation="UP")
+
+    anchors = board.get_possible_locations_mask(size=3, orientation="DOWN")
+
+    assert anchors.shape == (10, 10)
+    assert not anchors[:, :2].any()
+    assert not anchors[0, 3] and not anchors[1, 3]
+    assert anchors[0, 4] and anchors[2, 2]
+    assert np.count_nonzero(anchors) == 10 * 8 - 4
+
+
+def test_board_get_possible_locations_mask_after_removal():
+    ships = [Ship(3), Ship(2)]
+    player = Player(ships=ships)
+    board = Board(player=player)
+    board.add_ship(shipUUID=ships[0].uuid, location=(2, 2), orientation="UP")
+    board.add_ship(shipUUID=ships[1].uuid, location=(2, 6), orientation="UP")
+    board.remove_ship(shipUUID=ships[0].uuid)
+
+    # Only the surrounding of the remaining ship blocks the anchors
+    anchors = board.get_possible_locations_mask(size=2, orientation="UP")
+    assert anchors[2, 2] and anchors[2, 3]
+    assert not anchors[2, 4] and not anchors[1, 5]
+
+
+def test_board_get_possible_locations_too_big():
+    board = Board(player=Player())
+
+    assert board.get_possible_locations(size=board.size + 1, orientation="UP") == []
+
+
+def test_bit_board_occupancy_mask():
+    ship = Ship(3)
+    player = Player(ships=[ship])
+    board = BitBoard(player=player)
+    board.add_ship(shipUUID=ship.uuid, location=(1, 2), orientation="UP")
+
+    expected = np.zeros((board.size, board.size), dtype=bool)
+    expected[1, 2:5] = True
+    assert np.array_equal(board.occupancy_mask(), expected)
+
+
+@pytest.mark.parametrize("board_class", [Board, BitBoard])
+def test_board_forbidden_mask(board_class):
+    ship_1 = Ship(2)
+    ship_2 = Ship(2)
+    player = Player(ships=[ship_1, ship_2])
+    board = board_class(player=player)
+    board.add_ship(shipUUID=ship_1.uuid, location=(0, 0), orientation="UP")
+    board.add_ship(shipUUID=ship_2.uuid, location=(0, 4), orientation="UP")
+
+    expected = np.zeros((board.size, board.size), dtype=bool)
+    expected[0:2, 0:7] = True
+    assert np.array_equal(board.forbidden_mask(), expected)
+
+    board.remove_ship(shipUUID=ship_1.uuid)
+    expected[0:2, 0:3] = False
+    assert np.array_equal(board.forbidden_mask(), expected)
+
+    board.remove_ship(shipUUID=ship_2.uuid)
+    assert not board.forbidden_mask().any()
+    assert not any(board._forbidden)
+
+
+@pytest.mark.parametrize("board_class", [Board, BitBoard])
+def test_board_add_ship_forbidden_after_removal(board_class):
+    ship_1 = Ship(2)
+    ship_2 = Ship(2)
+    player = Player(ships=[ship_1, ship_2])
+    board = board_class(player=player)
+    board.add_ship(shipUUID=ship_1.uuid, location=(0, 0), orientation="UP")
+    board.add_ship(shipUUID=ship_2.uuid, location=(0, 4), orientation="UP")
+    board.remove_ship(shipUUID=ship_1.uuid)
+
+    with pytest.raises(CellAlreadyOccupiedError):
+        board.add_ship(shipUUID=ship_1.uuid, location=(1, 2), orientation="UP")
+    board.add_ship(shipUUID=ship_1.uuid, location=(1, 1), orientation="DOWN")
+
+
+@pytest.mark.parametrize("board_class", [Board, BitBoard])
+def test_board_is_valid_location(board_class):
+    ship = Ship(3)
+    player = Player(ships=[ship])
+    board = board_class(player=player)
+    board.add_ship(shipUUID=ship.uuid, location=(2, 2), orientation="UP")
+
+    assert board.is_valid_location(3, (4, 2), "UP")
+    assert not board.is_valid_location(3, (3, 2), "UP")
+    assert not board.is_valid_location(3, (0, 0), "DOWN")
+    assert board.is_valid_location(3, (3, 2), "UP", ignored_shipUUID=ship.uuid)
+    assert board.is_valid_location(3, (2, 3), "UP", ignored_shipUUID=ship.uuid)
+
+
+@pytest.mark.parametrize("board_class", [Board, BitBoard])
+def test_board_list_location(board_class):
+    ship = Ship(3)
+    player = Player(ships=[ship])
+    board = board_class(player=player)
+
+    assert board.is_valid_location(3, [2, 2], "UP")
+    board.add_ship(shipUUID=ship.uuid, location=[2, 2], orientation="UP")
+    board.move_ship(shipUUID=ship.uuid, location=[5, 5], orientation="RIGHT")
+
+    assert ship.location == (5, 5)
@@ -1,4 +1,6 @@
-from config import config
+from config import config, DEFAULT_AI_STRATEGY
+from io import StringIO
+import json
 
 
 def test_config_board_size():
@@ -71,3 +73,49 @@ def test_config_restore_to_default():
     config.__init__()
     config.restore_defaults()
     assert config.BOARD_SIZE == 10
+
+
+def test_config_ai_strategy_missing():
+    pre_val = config.AI_STRATEGY
+    data = {
+        "BOARD_SIZE": config.BOARD_SIZE,
+        "DEFAULT_ORIENTATION": config.DEFAULT_ORIENTATION,
+        "BOAT_SIZES": config.BOAT_SIZES,
+        "DEFAULT_SHIP_SET": config.DEFAULT_SHIP_SET,
+        "DEFAULT_PLAYER_SIDE": config.DEFAULT_PLAYER_SIDE,
+    }
+    config.AI_STRATEGY = "density"
+    config._load(StringIO(json.dumps(data)))
+    assert config.AI_STRATEGY == DEFAULT_AI_STRATEGY
+
+    config.AI_STRATEGY = pre_val
+
+
+def test_config_load_file(tmp_path):
+    pre_val = config.BOARD_SIZE
+    with open("configs/default_config.json") as file:
+        data = json.load(file)
+    data["BOARD_SIZE"] = 12
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps(data))
+
+    config.load_file(str(path))
+    assert config.BOARD_SIZE == 12
+
+    config.BOARD_SIZE = pre_val
+
+
+def test_config_unknown_ai_strategy():
+    import strategies  # noqa: F401 registers the strategies the config is checked against
+
+    pre_val = config.BOARD_SIZE
+    config.BOARD_SIZE = 11
+    config.AI_STRATEGY = "densty"
+    config.save()
+    config.__init__()
+
+    # The user config is dropped like any other invalid one
+    assert config.AI_STRATEGY == DEFAULT_AI_STRATEGY
+    assert config.BOARD_SIZE == 10
+
+    config.BOARD_SIZE = pre_val
@@ -1,6 +1,7 @@
-from game import Game
+from game import Game, GameOverError, Turn
 from players import Player, AIPlayer
 import numpy as np
+import pytest
 
 
 def test_game_constructor():
@@ -37,3 +38,58 @@ def test_game_start():
 
     assert player.fleet_strength == 0 or enemy.fleet_strength == 0
     assert result == (player.fleet_strength > enemy.fleet_strength)
+
+
+def test_game_seed_replays_game():
+    def play(seed):
+        player = AIPlayer(side=0, name="AI1", strategy="parity")
+        enemy = AIPlayer(side=1, name="AI2", strategy="density")
+        game = Game(player, enemy, seed)
+        game.initialize_boards()
+        game.start()
+        return player.knowledge.state.copy(), enemy.knowledge.state.copy()
+
+    first = play(42)
+    second = play(np.random.SeedSequence(42))
+    other = play(43)
+
+    assert np.array_equal(first[0], second[0])
+    assert np.array_equal(first[1], second[1])
+    assert not np.array_equal(first[0], other[0])
+
+
+def test_game_step():
+    player = AIPlayer(side=0, name="AI1")
+    enemy = AIPlayer(side=1, name="AI2")
+    game = Game(player, enemy, 1)
+    game.initialize_boards()
+
+    first = game.step()
+    second = game.step()
+
+    assert isinstance(first, Turn)
+    assert first.player is player and second.player is enemy
+    assert first.location == player.last_attack_location
+    assert first.result == player.last_attack_result
+    assert not game.finished
+    assert game.winner is None
+
+
+def test_game_steps_stop_when_fleet_sunk():
+    player = AIPlayer(side=0, name="AI1", strategy="density")
+    enemy = AIPlayer(side=1, name="AI2")
+    game = Game(player, enemy, 2)
+    game.initialize_boards()
+
+    turns = list(game.steps())
+
+    assert game.finished
+    loser = enemy if game.winner is player else player
+    assert loser.fleet_strength == 0
+    # The last attack sank the fleet, the loser doesn't get another turn
+    assert turns[-1].player is game.winner
+    shots = [sum(turn.player is p for turn in turns) for p in (player, enemy)]
+    assert shots[0] - shots[1] == (1 if game.winner is player else 0)
+
+    with pytest.raises(GameOverError):
+        game.step()
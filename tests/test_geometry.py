@@ -0,0 +1,51 @@
+from geometry import ship_geometry, placement_table, ORIENTATIONS
+from ships import LocationOutsideOfRangeError
+import pytest
+import numpy as np
+
+
+def test_ship_geometry():
+    geometry = ship_geometry(10, 3, "RIGHT", (1, 2))
+
+    assert geometry.squares == ((1, 2), (2, 2), (3, 2))
+    assert set(geometry.surrounding) == set(
+        (x, y) for x in range(0, 5) for y in range(1, 4)
+    )
+    assert geometry.square_indexes == (12, 22, 32)
+    assert geometry.square_mask == (1 << 12) | (1 << 22) | (1 << 32)
+    assert geometry.surrounding_mask.bit_count() == 15
+    assert set(geometry.surrounding_indexes) == set(
+        x * 10 + y for x, y in geometry.surrounding
+    )
+
+
+def test_ship_geometry_cached():
+    assert ship_geometry(10, 3, "UP", (0, 0)) is ship_geometry(10, 3, "UP", (0, 0))
+
+
+def test_ship_geometry_outside_of_range():
+    with pytest.raises(LocationOutsideOfRangeError):
+        ship_geometry(10, 3, "DOWN", (0, 1))
+
+    with pytest.raises(LocationOutsideOfRangeError):
+        ship_geometry(10, 3, "UP", (0, -2))
+
+
+@pytest.mark.parametrize("orientation", ORIENTATIONS)
+def test_placement_table(orientation):
+    table = placement_table(10, 4, orientation)
+
+    assert table.anchors.shape == (70, 2)
+    assert table.square_indexes.shape == (70, 4)
+    assert len(table.square_masks) == len(table.surrounding_masks) == 70
+    for anchor, indexes in zip(table.anchors, table.square_indexes):
+        geometry = ship_geometry(10, 4, orientation, tuple(int(v) for v in anchor))
+        assert tuple(indexes) == geometry.square_indexes
+
+
+def test_placement_table_read_only():
+    table = placement_table(10, 2, "UP")
+
+    with pytest.raises(ValueError):
+        table.square_indexes[0, 0] = 1
+    assert np.array_equal(table.anchors[0], (0, 0))
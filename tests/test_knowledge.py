@@ -0,0 +1,94 @@
+from knowledge import (
+    KnowledgeBoard,
+    sunk_ship_cells,
+    UNKNOWN,
+    MISS,
+    HIT,
+    SUNK,
+    EMPTY,
+)
+from utils import AttackResult
+import numpy as np
+
+
+def test_sunk_ship_cells():
+    state = np.zeros((5, 5), dtype=np.int8)
+    state[1, 1:4] = HIT
+    state[3, 3] = HIT
+
+    assert sorted(sunk_ship_cells(state, (1, 2))) == [(1, 1), (1, 2), (1, 3)]
+
+
+def test_knowledge_board_constructor():
+    knowledge = KnowledgeBoard(5, [2, 3, 3])
+
+    assert knowledge.size == 5
+    assert knowledge.state.dtype == np.int8
+    assert np.all(knowledge.state == UNKNOWN)
+    assert knowledge.remaining == {2: 1, 3: 2}
+
+
+def test_knowledge_board_record():
+    knowledge = KnowledgeBoard(5, [2, 3])
+
+    assert knowledge.record((0, 0), AttackResult.MISS) == ([], [])
+    assert knowledge.record((2, 2), AttackResult.HIT).sunk == []
+    assert sorted(knowledge.record((2, 3), AttackResult.SUNK).sunk) == [
+        (2, 2),
+        (2, 3),
+    ]
+
+    assert knowledge.state[0, 0] == MISS
+    assert knowledge.state[2, 2] == SUNK
+    assert knowledge.state[2, 3] == SUNK
+    assert knowledge.remaining[2] == 0
+    assert knowledge.remaining[3] == 1
+
+
+def test_knowledge_board_record_hit_diagonals():
+    knowledge = KnowledgeBoard(5, [3])
+
+    observation = knowledge.record((0, 2), AttackResult.HIT)
+
+    # Ships can't touch, so the diagonal neighbours of a hit are empty
+    assert sorted(observation.empty) == [(1, 1), (1, 3)]
+    assert knowledge.state[1, 1] == EMPTY
+    assert knowledge.state[1, 2] == UNKNOWN
+
+
+def test_knowledge_board_record_sunk_halo():
+    knowledge = KnowledgeBoard(5, [2, 3])
+    knowledge.record((0, 0), AttackResult.MISS)
+    knowledge.record((1, 1), AttackResult.HIT)
+
+    observation = knowledge.record((1, 2), AttackResult.SUNK)
+
+    # The halo of the ship, without the miss and the diagonals of the first hit
+    assert sorted(observation.empty) == [
+        (0, 1),
+        (0, 3),
+        (1, 0),
+        (1, 3),
+        (2, 1),
+        (2, 3),
+    ]
+    halo = np.zeros((5, 5), dtype=bool)
+    halo[0:3, 0:4] = True
+    halo[1, 1:3] = False
+    halo[0, 0] = False
+    assert np.all(knowledge.state[halo] == EMPTY)
+    assert np.count_nonzero(knowledge.state == EMPTY) == 9
+
+
+def test_knowledge_board_is_shot():
+    knowledge = KnowledgeBoard(5, [2])
+    knowledge.record((1, 4), AttackResult.MISS)
+    knowledge.record((3, 3), AttackResult.HIT)
+
+    assert knowledge.is_shot(1, 4)
+    assert knowledge.is_shot(3, 3)
+    assert not knowledge.is_shot(4, 1)
+    # Inferred empty cells are known, but not shot
+    assert not knowledge.is_shot(4, 4)
+    assert knowledge.is_known(4, 4)
+    assert not knowledge.is_known(4, 1)
@@ -0,0 +1,385 @@
+from time import monotonic
+from layouts import (
+    generate_layouts,
+    random_layout,
+    default_ship_sizes,
+    fleet_table,
+    LayoutGenerationError,
+    UniformLayoutSampler,
+    draw_layouts,
+    uniform_layouts,
+)
+from geometry import ORIENTATIONS, ship_geometry
+from ships import LocationOutsideOfRangeError
+from collections import Counter
+from itertools import product
+from boards import BitBoard
+from players import Player
+from ships import Ship
+from config import config
+import layouts
+import numpy as np
+import pytest
+
+
+def place_layout(layout, sizes, board_size):
+    ships = [Ship(size) for size in sizes]
+    player = Player(ships=ships, board_class=BitBoard)
+    assert player.board.size == board_size
+    for ship, (x, y, orientation) in zip(ships, layout):
+        player.board.add_ship(ship.uuid, (int(x), int(y)), ORIENTATIONS[orientation])
+    return player.board
+
+
+def test_default_ship_sizes(monkeypatch):
+    monkeypatch.setattr(
+        "config.config.DEFAULT_SHIP_SET", {"Carrier": 1, "PatrolBoat": 2}
+    )
+
+    assert default_ship_sizes() == [
+        config.BOAT_SIZES["Carrier"],
+        config.BOAT_SIZES["PatrolBoat"],
+        config.BOAT_SIZES["PatrolBoat"],
+    ]
+
+
+def test_fleet_table():
+    table = fleet_table(10, (2, 3))
+
+    assert table.group_count[2] == 4 * 90
+    assert table.group_count[3] == 4 * 80
+    assert table.group_start[3] == table.group_count[2]
+    assert table.square_indexes.shape == (680, 3)
+    # Padding of the smaller ship
+    assert table.square_indexes[0, 2] == 100
+
+
+def test_generate_layouts_valid():
+    sizes = default_ship_sizes()
+    layouts = generate_layouts(200, config.BOARD_SIZE, sizes, np.random.default_rng(0))
+
+    assert layouts.shape == (200, len(sizes), 3)
+    assert layouts.dtype == np.int16
+    for layout in layouts:
+        board = place_layout(layout, sizes, config.BOARD_SIZE)
+        assert np.count_nonzero(board.occupancy_mask()) == sum(sizes)
+
+
+def test_generate_layouts_crowded():
+    sizes = [5, 4, 4, 3, 3, 3, 3, 2, 2, 2, 2]
+    layouts = generate_layouts(50, 10, sizes, np.random.default_rng(1))
+
+    for layout in layouts:
+        place_layout(layout, sizes, 10)
+
+
+def test_generate_layouts_seeded():
+    first = generate_layouts(10, rng=np.random.default_rng(5))
+    second = generate_layouts(10, rng=np.random.default_rng(5))
+
+    assert np.array_equal(first, second)
+
+
+def test_generate_layouts_impossible():
+    with pytest.raises(LayoutGenerationError):
+        generate_layouts(1, 10, [11])
+
+    with pytest.raises(LayoutGenerationError):
+        generate_layouts(1, 10, [10] * 6, max_attempts=4, max_restarts=3)
+
+
+def test_generate_layouts_empty():
+    assert generate_layouts(0).shape == (0, len(default_ship_sizes()), 3)
+
+
+def test_random_layout():
+    layout = random_layout(10, [4, 2], np.random.default_rng(3))
+
+    assert len(layout) == 2
+    for x, y, orientation in layout:
+        assert type(x) is int and type(y) is int
+        assert orientation in ORIENTATIONS
+
+
+def brute_force_layouts(board_size, sizes):
+    footprints = {}
+    for size in set(sizes):
+        footprints[size] = []
+        for orientation in ("UP", "RIGHT") if size > 1 else ("UP",):
+            for x in range(board_size):
+                for y in range(board_size):
+                    try:
+                        footprints[size].append(
+                            ship_geometry(board_size, size, orientation, (x, y))
+                        )
+                    except LocationOutsideOfRangeError:
+                        pass
+
+    layouts = set()
+    for combination in product(*(footprints[size] for size in sizes)):
+        forbidden = 0
+        for geometry in combination:
+            if forbidden & geometry.square_mask:
+                break
+            forbidden |= geometry.surrounding_mask
+        else:
+            layouts.add(frozenset(geometry.square_mask for geometry in combination))
+    return layouts
+
+
+@pytest.mark.parametrize(
+    "board_size, sizes", [(4, [2, 2]), (5, [3, 2, 1]), (5, [2, 2, 2])]
+)
+def test_uniform_sampler_total(board_size, sizes):
+    sampler = UniformLayoutSampler(board_size, sizes)
+
+    assert sampler.total == len(brute_force_layouts(board_size, sizes))
+
+
+def test_uniform_sampler_uniform():
+    sampler = UniformLayoutSampler(4, [2, 2])
+    rng = np.random.default_rng(0)
+    draws = 400 * sampler.total
+
+    counts = Counter()
+    for _ in range(draws):
+        layout = sampler.sample(rng)
+        counts[
+            frozenset(
+                ship_geometry(4, 2, orientation, (x, y)).square_mask
+                for x, y, orientation in layout
+            )
+        ] += 1
+
+    assert len(counts) == sampler.total
+    assert max(counts.values()) < 1.5 * 400
+    assert min(counts.values()) > 0.5 * 400
+
+
+def test_uniform_sampler_layout_order():
+    sampler = UniformLayoutSampler(6, [1, 3, 2])
+    layout = sampler.sample(np.random.default_rng(1))
+
+    for (x, y, orientation), size in zip(layout, [1, 3, 2]):
+        assert len(ship_geometry(6, size, orientation, (x, y)).squares) == size
+
+
+def test_uniform_sampler_no_layout():
+    sampler = UniformLayoutSampler(3, [3, 3, 3])
+
+    assert sampler.total == 0
+    with pytest.raises(LayoutGenerationError):
+        sampler.sample()
+
+
+def test_uniform_sampler_too_large():
+    with pytest.raises(LayoutGenerationError):
+        UniformLayoutSampler(10, [5, 4, 3, 3, 2, 2], max_states=1000)
+
+
+def test_generate_layouts_blocked():
+    blocked = np.zeros((10, 10), dtype=bool)
+    blocked[:, :5] = True
+    layouts = generate_layouts(
+        50, 10, [4, 3, 2], np.random.default_rng(2), blocked=blocked
+    )
+
+    for layout in layouts:
+        board = place_layout(layout, [4, 3, 2], 10)
+        assert not board.occupancy_mask()[blocked].any()
+
+
+def layout_key(layout, board_size, sizes):
+    return frozenset(
+        ship_geometry(board_size, size, ORIENTATIONS[orientation], (x, y)).square_mask
+        for (x, y, orientation), size in zip(layout.tolist(), sizes)
+    )
+
+
+def test_draw_layouts_uniform():
+    sizes = [2, 2]
+    layouts = draw_layouts(200_000, 4, sizes, np.random.default_rng(6))
+    counts = Counter(layout_key(layout, 4, sizes) for layout in layouts)
+
+    expected = len(layouts) / len(brute_force_layouts(4, sizes))
+    assert len(counts) == len(brute_force_layouts(4, sizes))
+    assert max(counts.values()) < 1.2 * expected
+    assert min(counts.values()) > 0.8 * expected
+
+
+def test_uniform_layouts_valid():
+    sizes = default_ship_sizes()
+    layouts = uniform_layouts(20, 10, sizes, np.random.default_rng(7))
+
+    assert layouts.shape == (20, len(sizes), 3)
+    assert layouts.dtype == np.int16
+    for layout in layouts:
+        board = place_layout(layout, sizes, 10)
+        assert np.count_nonzero(board.occupancy_mask()) == sum(sizes)
+
+
+def test_uniform_layouts_blocked():
+    blocked = np.zeros((10, 10), dtype=bool)
+    blocked[:, :5] = True
+    layouts = uniform_layouts(20, 10, [4, 3, 2], np.random.default_rng(8), blocked)
+
+    for layout in layouts:
+        board = place_layout(layout, [4, 3, 2], 10)
+        assert not board.occupancy_mask()[blocked].any()
+
+
+def test_uniform_layouts_crowded():
+    # About 1 in 100 000 draws is legal, so the layouts are counted instead
+    sizes = [3, 3, 2, 1, 1, 1]
+    layouts = uniform_layouts(6000, 5, sizes, np.random.default_rng(9))
+
+    keys = Counter(layout_key(layout, 5, sizes) for layout in layouts)
+    assert len(keys) == UniformLayoutSampler(5, sizes).total
+    assert max(keys.values()) < 3 * len(layouts) / len(keys)
+
+
+def test_uniform_layouts_draws_per_layout():
+    # The budget grows with every kept layout, 300 default fleets take about 140 000 draws
+    sizes = default_ship_sizes()
+    layouts = uniform_layouts(
+        300, 10, sizes, np.random.default_rng(10), max_draws_per_layout=2048
+    )
+
+    assert len({layout_key(layout, 10, sizes) for layout in layouts}) == 300
+
+
+@pytest.mark.parametrize(
+    "sizes",
+    [
+        [5, 4, 4, 3, 3, 3, 2, 2, 2, 2],
+        [5, 5, 4, 4, 3, 3, 3, 2, 2, 2, 2],
+        [4, 4, 4, 3, 3, 3, 3, 2, 2, 2, 2, 2],
+    ],
+)
+def test_random_layout_crowded(monkeypatch, sizes):
+    # Too many layouts to count them, the backtracking generator places the ships
+    monkeypatch.setattr(layouts, "PLACEMENT_TIME_LIMIT", 0)
+    layout = random_layout(10, sizes, np.random.default_rng(11))
+
+    rows = [(x, y, ORIENTATIONS.index(orientation)) for x, y, orientation in layout]
+    board = place_layout(rows, sizes, 10)
+    assert np.count_nonzero(board.occupancy_mask()) == sum(sizes)
+
+
+def test_uniform_layouts_impossible():
+    with pytest.raises(LayoutGenerationError):
+        uniform_layouts(1, 10, [11])
+
+    with pytest.raises(LayoutGenerationError):
+        uniform_layouts(1, 10, [10] * 6)
+
+
+def test_uniform_layouts_seeded():
+    first = uniform_layouts(3, rng=np.random.default_rng(5))
+    second = uniform_layouts(3, rng=np.random.default_rng(5))
+
+    assert np.array_equal(first, second)
+
+
+def consistent_layouts(board_size, sizes, blocked, hits):
+    blocked_mask = sum(1 << int(i) for i in np.flatnonzero(blocked))
+    hit_mask = sum(1 << int(i) for i in np.flatnonzero(hits))
+    layouts = []
+    for layout in brute_force_layouts(board_size, sizes):
+        occupied = 0
+        for square_mask in layout:
+            occupied |= square_mask
+        if (
+            not occupied & blocked_mask
+            and hit_mask & occupied == hit_mask
+            and all(square_mask & ~hit_mask for square_mask in layout)
+        ):
+            layouts.append(layout)
+    return layouts
+
+
+@pytest.mark.parametrize(
+    "sizes, blocked_cells, hit_cells",
+    [
+        ([3, 2], [0, 7], [12]),
+        ([2, 2, 1], [6], [3, 4]),
+        ([3, 1], [], [10, 15]),
+        ([1, 1], [13, 18], [3, 5]),
+    ],
+)
+def test_uniform_sampler_constrained(sizes, blocked_cells, hit_cells):
+    blocked = np.zeros(25, dtype=bool)
+    blocked[blocked_cells] = True
+    hits = np.zeros(25, dtype=bool)
+    hits[hit_cells] = True
+    layouts = consistent_layouts(5, sizes, blocked, hits)
+    sampler = UniformLayoutSampler(
+        5, sizes, blocked=blocked.reshape(5, 5), hits=hits.reshape(5, 5)
+    )
+
+    assert sampler.total == len(layouts)
+    expected = np.zeros(25)
+    for layout in layouts:
+        for square_mask in layout:
+            expected += [square_mask >> cell & 1 for cell in range(25)]
+    if layouts:
+        expected /= len(layouts)
+    assert np.allclose(sampler.probabilities().ravel(), expected)
+
+
+@pytest.mark.parametrize(
+    "sizes, blocked_cells, hit_cells",
+    [([3, 2], [0, 7], [12]), ([3, 1], [], [10, 15]), ([2, 2, 1], [6], [3, 14])],
+)
+def test_draw_layouts_hits(sizes, blocked_cells, hit_cells):
+    blocked = np.zeros(25, dtype=bool)
+    blocked[blocked_cells] = True
+    hits = np.zeros(25, dtype=bool)
+    hits[hit_cells] = True
+    expected = set(consistent_layouts(5, sizes, blocked, hits))
+    layouts = draw_layouts(
+        100_000,
+        5,
+        sizes,
+        np.random.default_rng(10),
+        blocked.reshape(5, 5),
+        hits.reshape(5, 5),
+    )
+    counts = Counter(layout_key(layout, 5, sizes) for layout in layouts)
+
+    assert set(counts) == expected
+    mean = len(layouts) / len(expected)
+    assert max(counts.values()) < 1.25 * mean
+    assert min(counts.values()) > 0.75 * mean
+
+
+def test_uniform_sampler_probabilities():
+    sampler = UniformLayoutSampler(3, [2])
+
+    # 12 placements, corners are covered by 2 of them, the center by 4
+    assert np.allclose(sampler.probabilities() * 12, [[2, 3, 2], [3, 4, 3], [2, 3, 2]])
+
+
+def test_uniform_sampler_deadline():
+    with pytest.raises(LayoutGenerationError):
+        UniformLayoutSampler(6, [3, 2], deadline=0.0)
+
+
+def test_uniform_sampler_default_deadline(monkeypatch):
+    monkeypatch.setattr(layouts, "COUNT_TIME_LIMIT", 0.05)
+    start = monotonic()
+
+    # The default fleet on the default board can't be counted
+    with pytest.raises(LayoutGenerationError):
+        UniformLayoutSampler(10, [5, 4, 3, 3, 3, 2, 2])
+    assert monotonic() - start < 1
+
+
+def test_uniform_sampler_huge_count():
+    rng = np.random.default_rng(4)
+
+    draws = [layouts._below(rng, 3 * 2**64) for _ in range(100)]
+
+    assert all(0 <= draw < 3 * 2**64 for draw in draws)
+    # Not truncated to 64 bits
+    assert max(draws) >= 2**64
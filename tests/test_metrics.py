@@ -0,0 +1,92 @@
+from urllib.request import urlopen
+import metrics
+import pytest
+
+
+@pytest.fixture
+def enabled(monkeypatch):
+    monkeypatch.setattr(metrics, "ENABLED", True)
+    monkeypatch.setattr(metrics, "_descriptions", {})
+    monkeypatch.setattr(metrics, "_histograms", {})
+    monkeypatch.setattr(metrics, "_counters", {})
+
+
+def test_instrumented_disabled(monkeypatch):
+    monkeypatch.setattr(metrics, "ENABLED", False)
+
+    def function():
+        pass
+
+    assert metrics.instrumented("test_seconds", "Test")(function) is function
+
+
+def test_instrumented(enabled):
+    @metrics.instrumented("test_seconds", "Test latency", kind="test")
+    def function(value):
+        return value * 2
+
+    assert function(2) == 4
+    function(3)
+
+    text = metrics.exposition()
+    assert "# HELP test_seconds Test latency" in text
+    assert "# TYPE test_seconds histogram" in text
+    assert 'test_seconds_bucket{kind="test",le="+Inf"} 2' in text
+    assert 'test_seconds_count{kind="test"} 2' in text
+
+
+def test_exposition_buckets_are_cumulative(enabled):
+    metrics._describe("test_seconds", "histogram", "Test")
+    metrics.observe("test_seconds", 2e-6)
+    metrics.observe("test_seconds", 0.3)
+
+    text = metrics.exposition()
+    assert 'test_seconds_bucket{le="1e-06"} 0' in text
+    assert 'test_seconds_bucket{le="2.5e-06"} 1' in text
+    assert 'test_seconds_bucket{le="0.25"} 1' in text
+    assert 'test_seconds_bucket{le="0.5"} 2' in text
+    assert 'test_seconds_bucket{le="+Inf"} 2' in text
+    assert "test_seconds_sum 0.300002" in text
+
+
+def test_increment(enabled):
+    metrics._increment("test_total", "Test count", result="HIT")
+    metrics._increment("test_total", "Test count", 2, result="HIT")
+
+    text = metrics.exposition()
+    assert "# TYPE test_total counter" in text
+    assert 'test_total{result="HIT"} 3' in text
+
+
+def test_snapshot_merge(enabled):
+    metrics._increment("test_total", "Test count")
+    metrics._describe("test_seconds", "histogram", "Test")
+    metrics.observe("test_seconds", 1e-3)
+    data = metrics.snapshot(reset=True)
+
+    assert metrics.snapshot()["counters"] == {}
+    metrics.merge(data)
+    metrics.merge(data)
+    assert metrics._counters[("test_total", ())] == 2
+    assert metrics._histograms[("test_seconds", ())][1] == 2e-3
+
+
+def test_write(enabled, tmp_path):
+    metrics._increment("test_total", "Test count")
+    path = tmp_path / "battleships.prom"
+    metrics.write(str(path))
+
+    assert path.read_text() == metrics.exposition()
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_serve(enabled):
+    metrics._increment("test_total", "Test count")
+    server = metrics.serve(0)
+    try:
+        port = server.server_address[1]
+        with urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+            assert response.read().decode() == metrics.exposition()
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,140 @@
+from knowledge import MISS
+from layouts import UniformLayoutSampler
+from montecarlo import MonteCarloTargeting, layout_cells, sample_occupancy
+from utils import AttackResult
+import montecarlo
+import numpy as np
+import pytest
+
+
+def test_layout_cells():
+    # UP, LEFT and RIGHT ships on a 5x5 board
+    layouts = np.array([[[0, 0, 0], [4, 4, 2], [1, 2, 3]]], dtype=np.int16)
+    cells = layout_cells(layouts, 5, [3, 2, 1])
+
+    assert cells.tolist() == [[[0, 1, 2], [24, 19, 25], [7, 25, 25]]]
+
+
+def test_sample_occupancy_consistent():
+    blocked = np.zeros((6, 6), dtype=bool)
+    blocked[0, :] = True
+    hits = np.zeros((6, 6), dtype=bool)
+    hits[3, 3] = True
+    counts, accepted = sample_occupancy(6, [3, 2], blocked, hits, 200, 5.0, seed=0)
+
+    assert accepted == 200
+    counts = counts.reshape(6, 6)
+    assert counts[3, 3] == accepted
+    assert not counts[0, :].any()
+
+
+def test_sample_occupancy_posterior():
+    blocked = np.zeros((5, 5), dtype=bool)
+    blocked[0, 1] = True
+    hits = np.zeros((5, 5), dtype=bool)
+    hits[2, 2] = True
+    counts, accepted = sample_occupancy(5, [3, 2], blocked, hits, 20_000, 30.0, seed=1)
+
+    # Uniform among the consistent layouts, like the exact enumeration
+    exact = UniformLayoutSampler(5, [3, 2], blocked=blocked, hits=hits)
+    assert accepted == 20_000
+    assert np.allclose(
+        counts.reshape(5, 5) / accepted, exact.probabilities(), atol=0.02
+    )
+
+
+def test_sample_occupancy_no_lone_hit_ship():
+    hits = np.zeros((4, 4), dtype=bool)
+    hits[1, 1] = hits[1, 2] = True
+    blocked = np.zeros((4, 4), dtype=bool)
+    counts, accepted = sample_occupancy(4, [2], blocked, hits, 10, 1.0, seed=0)
+
+    # The only layout covering both hits would be a sunk ship
+    assert accepted == 0
+    assert not counts.any()
+
+
+def test_monte_carlo_targeting_follows_hits():
+    targeting = MonteCarloTargeting(
+        10,
+        [3],
+        np.random.default_rng(0),
+        samples=300,
+        time_limit=5.0,
+        workers=1,
+        threshold=0,
+    )
+    targeting.observe((5, 5), AttackResult.HIT)
+    targeting.observe((5, 6), AttackResult.HIT)
+
+    assert targeting.choose_target() in [(5, 4), (5, 7)]
+    assert targeting.accepted == 300
+
+
+def test_monte_carlo_targeting_fallback():
+    targeting = MonteCarloTargeting(
+        3,
+        [3],
+        np.random.default_rng(0),
+        samples=10,
+        time_limit=0.0,
+        workers=1,
+        threshold=0,
+    )
+    targeting.observe((1, 1), AttackResult.MISS)
+
+    density = targeting.density()
+    assert targeting.accepted == 0
+    assert density[0, 0] == 2
+    assert targeting.state[1, 1] == MISS
+
+
+@pytest.mark.parametrize("samples, workers", [(0, 1), (0, 2), (1, 3)])
+def test_monte_carlo_targeting_few_samples(samples, workers):
+    targeting = MonteCarloTargeting(
+        10,
+        [5, 4],
+        np.random.default_rng(0),
+        samples=samples,
+        time_limit=5.0,
+        workers=workers,
+        threshold=0,
+    )
+    density = targeting.density()
+
+    assert targeting.accepted == samples
+    assert density.shape == (10, 10)
+    montecarlo.shutdown_pools()
+
+
+def test_monte_carlo_targeting_process_pool():
+    targeting = MonteCarloTargeting(
+        10,
+        [5, 4],
+        np.random.default_rng(0),
+        samples=100,
+        time_limit=5.0,
+        workers=2,
+        threshold=0,
+    )
+    density = targeting.density()
+
+    assert targeting.accepted == 100
+    # Every layout occupies 9 cells
+    assert density.sum() == 900
+
+    pool = montecarlo._pools[2]
+    montecarlo.shutdown_pools()
+    assert not montecarlo._pools
+    with pytest.raises(RuntimeError):
+        pool.submit(sum, [])
+
+
+def test_monte_carlo_targeting_exact_endgame():
+    targeting = MonteCarloTargeting(10, [2], np.random.default_rng(0), workers=1)
+    targeting.observe((5, 5), AttackResult.HIT)
+    density = targeting.density()
+
+    assert targeting.exact
+    assert targeting.accepted == 0
+    assert np.isclose(density.sum(), 2)
@@ -1,6 +1,8 @@
 from players import Player, AIPlayer, EnemyUnsetError
 from ships import Ship, get_default_ship_set
 from boards import Board
+from knowledge import SUNK
+from targeting import HuntTargetTargeting
 from utils import AttackResult
 from config import config
 import pytest
@@ -15,7 +17,7 @@ def test_player_constructor_1():
     assert player._name == "Adam"
     assert player._board._player == player
     assert player._enemy is None
-    assert player._fleet_strength == 4
+    assert player.fleet_strength == 4
     assert player._side == config.DEFAULT_PLAYER_SIDE
     assert player._last_attack_result is None
 
@@ -80,6 +82,17 @@ def test_player_set_enemy():
     player.set_enemy(enemy)
 
     assert player._enemy == enemy
+    assert player.knowledge.size == enemy.board.size
+    assert sorted(player.knowledge.remaining.elements()) == sorted(
+        ship.size for ship in enemy.ships.values()
+    )
+
+
+def test_player_knowledge_enemy_None():
+    player = Player()
+
+    with pytest.raises(EnemyUnsetError):
+        player.knowledge
 
 
 def test_player_enemy_board():
@@ -130,6 +143,29 @@ def test_player_cli_initialize_board():
     assert np.count_nonzero(x != None) == player.fleet_strength  # noqa: E711
 
 
+def test_player_cli_initialize_board_randomize():
+    class fake_CLI:
+        def __init__(self):
+            self.calls = 0
+
+        def show_menu(self, *args):
+            return lambda: None
+
+        def get_move_ship_data(self, ship: Ship, board: Board, *args):
+            # Place the first ship by hand, then randomize
+            self.calls += 1
+            if self.calls == 1:
+                return 0, 0, "UP"
+            return None
+
+    player = Player(ui=fake_CLI())
+    player.initialize_board()
+
+    x = player.board._matrix
+    assert np.count_nonzero(x != None) == player.fleet_strength  # noqa: E711
+    assert all(not ship.under_edition for ship in player.ships.values())
+
+
 def test_ai_player_initialize_board():
     player = AIPlayer()
     player.initialize_board()
@@ -141,6 +177,18 @@ def test_ai_player_initialize_board():
     assert np.count_nonzero(x != None) == player.fleet_strength  # noqa: E711
 
 
+def test_ai_player_initialize_board_crowded(monkeypatch):
+    # Too many layouts to sample them uniformly in time
+    monkeypatch.setattr("layouts.PLACEMENT_TIME_LIMIT", 0)
+    ships = [Ship(size) for size in [5, 5, 4, 4, 3, 3, 3, 2, 2, 2, 2]]
+    player = AIPlayer(ships=ships, rng=np.random.default_rng(4))
+    player.initialize_board()
+
+    x = player.board._matrix
+    assert np.count_nonzero(x != None) == player.fleet_strength  # noqa: E711
+    assert all(ship.location for ship in ships)
+
+
 def test_player_cli_attack_enemy():
     class fake_CLI:
         def __init__(self):
@@ -157,6 +205,25 @@ def test_player_cli_attack_enemy():
     player.last_attack_result == AttackResult.HIT
 
 
+def test_player_cli_attack_enemy_skips_shot_cells():
+    class fake_CLI:
+        def __init__(self):
+            self.locations = [(2, 3), (2, 3), (4, 4)]
+
+        def get_location(self, *args, **kwargs):
+            return self.locations.pop(0)
+
+    player = Player(ui=fake_CLI())
+    enemy = Player()
+    player.set_enemy(enemy)
+    enemy.board.add_ship(list(enemy.ships.keys())[0], (2, 3), "UP")
+
+    assert player.attack_enemy() == AttackResult.HIT
+    assert player.attack_enemy() == AttackResult.MISS
+    assert player.knowledge.is_shot(2, 3)
+    assert player.knowledge.is_shot(4, 4)
+
+
 def test_ai_player_attack_enemy():
     player = AIPlayer()
     enemy = AIPlayer()
@@ -165,7 +232,10 @@ def test_ai_player_attack_enemy():
     ship_uuid = list(enemy.ships.keys())[0]
     enemy.board.add_ship(ship_uuid, (2, 3), "UP")
 
-    player._target_list = [(2, 3)]
+    player._targeting = HuntTargetTargeting(
+        config.BOARD_SIZE, [], knowledge=player.knowledge
+    )
+    player._targeting._target_list = [(2, 3)]
     for _ in range(10):
         player.attack_enemy()
 
@@ -173,6 +243,58 @@ def test_ai_player_attack_enemy():
     assert enemy.ships[ship_uuid].strength == 0
 
 
+def test_ai_player_unknown_strategy():
+    with pytest.raises(ValueError):
+        AIPlayer(strategy="cheating")
+
+
+@pytest.mark.parametrize(
+    "strategy, options",
+    [
+        ("hunt_target", None),
+        ("parity", None),
+        ("density", None),
+        ("incremental_density", None),
+        ("monte_carlo", {"samples": 50, "workers": 1}),
+        ("exact", None),
+        ("anytime", {"time_budget": 0.005}),
+    ],
+)
+def test_ai_player_strategy_attack_enemy(strategy, options):
+    player = AIPlayer(strategy=strategy, targeting_options=options)
+    enemy = AIPlayer()
+    player.set_enemy(enemy)
+    enemy.initialize_board()
+
+    shots = 0
+    while enemy.fleet_strength:
+        player.attack_enemy()
+        shots += 1
+
+    # Every cell is shot at most once
+    assert shots <= config.BOARD_SIZE**2
+    assert all(ship.strength == 0 for ship in enemy.ships.values())
+    # The targeting recorded every shot once, on the player's knowledge board
+    assert player._targeting._knowledge is player.knowledge
+    assert not sum(player.knowledge.remaining.values())
+    assert np.count_nonzero(player.knowledge.state == SUNK) == sum(
+        ship.size for ship in enemy.ships.values()
+    )
+
+
+def test_ai_player_attack_enemy_time_budget():
+    player = AIPlayer(strategy="anytime", time_budget=0)
+    enemy = AIPlayer()
+    player.set_enemy(enemy)
+    enemy.initialize_board()
+
+    player.attack_enemy()
+    assert player._targeting.quality == "heuristic"
+
+    player.attack_enemy(time_budget=5.0)
+    assert player._targeting.quality in ["sampled", "exact"]
+
+
 def test_player_edit_board():
     class fake_CLI:
         def __init__(self):
@@ -204,3 +326,20 @@ def test_enemy_unset_attack():
     player = AIPlayer()
     with pytest.raises(EnemyUnsetError):
         player.attack_enemy()
+
+
+def test_ai_player_rng_reproducible():
+    def play(seed):
+        player = AIPlayer(strategy="hunt_target", rng=np.random.default_rng(seed))
+        enemy = AIPlayer(rng=np.random.default_rng(seed + 1))
+        player.set_enemy(enemy)
+        enemy.initialize_board()
+        for _ in range(30):
+            player.attack_enemy()
+        return [ship.location for ship in enemy.ships.values()], player.knowledge.state
+
+    first_layout, first_state = play(5)
+    second_layout, second_state = play(5)
+
+    assert first_layout == second_layout
+    assert np.array_equal(first_state, second_state)
@@ -0,0 +1,64 @@
+from profiling import Profiler, marked, phase, profiled, AI_DECISION, ATTACK
+import profiling
+from time import process_time
+import pstats
+import pytest
+
+
+def busy(seconds: float) -> None:
+    start = process_time()
+    while process_time() - start < seconds:
+        pass
+
+
+def test_phase_without_profiler():
+    with phase(ATTACK):
+        pass
+
+    assert phase(ATTACK) is phase(AI_DECISION)
+
+
+def test_marked_disabled(monkeypatch):
+    monkeypatch.setattr(profiling, "ENABLED", False)
+
+    def decide():
+        pass
+
+    assert marked(AI_DECISION)(decide) is decide
+
+
+def test_profiled(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "ENABLED", True)
+    path = str(tmp_path / "run")
+
+    @marked(AI_DECISION)
+    def decide():
+        busy(0.02)
+
+    with profiled(path) as profiler:
+        decide()
+        with phase(ATTACK):
+            busy(0.02)
+
+    assert profiler.phase_counts == {AI_DECISION: 1, ATTACK: 1}
+    assert profiler.phase_times[AI_DECISION] >= 0.02
+    assert "decide" in {name for _, _, name in pstats.Stats(path + ".pstats").stats}
+    with open(path + ".phases.txt") as file:
+        assert AI_DECISION in file.read()
+    with open(path + ".collapsed") as file:
+        lines = file.read().splitlines()
+    assert any(line.startswith(AI_DECISION + ";") for line in lines)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    # The markers are no-ops again
+    assert phase(ATTACK) is phase(AI_DECISION)
+
+
+def test_profiled_none():
+    with profiled(None) as profiler:
+        assert profiler is None
+
+
+def test_profiler_already_running(tmp_path):
+    with profiled(str(tmp_path / "run"), sampling=False):
+        with pytest.raises(RuntimeError):
+            Profiler(str(tmp_path / "other")).start()
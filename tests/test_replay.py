@@ -0,0 +1,142 @@
+from io import BytesIO
+from boards import Board, BitBoard
+from config import config
+from game import Game, GameOverError
+from players import AIPlayer
+from ships import Carrier
+from replay import (
+    GameRecord,
+    Replay,
+    ReplayFormatError,
+    ReplayWriter,
+    decode_records,
+    encode_record,
+    fleet_layout,
+    read_records,
+    read_varint,
+    varint,
+)
+from utils import AttackResult
+import pytest
+
+
+def record_game(seed: int) -> tuple:
+    file = BytesIO()
+    player = AIPlayer(side=0, name="AI1", strategy="parity")
+    enemy = AIPlayer(side=1, name="AI2", strategy="density")
+    game = Game(player, enemy, seed, ReplayWriter(file))
+    game.initialize_boards()
+    turns = [(turn.location, turn.result) for turn in game.steps()]
+    file.seek(0)
+    return file, game, turns
+
+
+def test_varint():
+    for value in [0, 1, 127, 128, 300, 2**35]:
+        data = varint(value)
+
+        assert read_varint(b"\x01" + data, 1) == (value, len(data) + 1)
+    assert varint(127) == b"\x7f"
+    assert varint(300) == b"\xac\x02"
+
+
+def test_read_varint_truncated():
+    with pytest.raises(ReplayFormatError):
+        read_varint(b"\xac", 0)
+
+
+def test_encode_decode_record():
+    records = [
+        GameRecord(10, (2, 1), (((0, 0, "DOWN"), (9, 9, "UP")),) * 2, (0, 99, 5)),
+        # Attacks of more than one byte
+        GameRecord(20, (3,), (((19, 0, "RIGHT"),), ((0, 19, "UP"),)), (399, 7, 0)),
+    ]
+    data = b"".join(encode_record(record) for record in records)
+
+    assert list(decode_records(data)) == records
+    # Config, fleets (2 bytes for cells from 32 up), one byte per attack and the end of the game
+    assert len(encode_record(records[0])) == 4 + 6 + 3 + 1
+
+
+def test_decode_records_truncated():
+    record = GameRecord(10, (1,), (((0, 0, "UP"),), ((5, 5, "UP"),)), (55, 0))
+
+    with pytest.raises(ReplayFormatError):
+        list(decode_records(encode_record(record)[:-1]))
+
+
+def test_read_records_header():
+    with pytest.raises(ReplayFormatError):
+        list(read_records(BytesIO(b"JSON")))
+    with pytest.raises(ReplayFormatError):
+        list(read_records(BytesIO(b"BSR\x02")))
+
+
+def test_game_recorder():
+    file, game, turns = record_game(7)
+
+    (record,) = read_records(file)
+    assert record.board_size == config.BOARD_SIZE
+    assert record.layouts == (
+        tuple(fleet_layout(game._playerA)),
+        tuple(fleet_layout(game._playerB)),
+    )
+    size = config.BOARD_SIZE
+    assert list(record.shots) == [x * size + y for (x, y), _ in turns]
+
+
+@pytest.mark.parametrize("board_class", [Board, BitBoard])
+def test_replay(board_class):
+    file, game, turns = record_game(8)
+    (record,) = read_records(file)
+
+    replay = Replay(record, board_class)
+    replayed = [(turn.location, turn.result) for turn in replay.steps()]
+
+    assert replayed == turns
+    assert replay.finished
+    assert replay.winner == (0 if game.winner is game._playerA else 1)
+    with pytest.raises(GameOverError):
+        replay.step()
+
+
+def test_replay_board_size():
+    # Larger than the configured board, the ships are placed on the last row and column
+    record = GameRecord(12, (1,), (((11, 0, "UP"),), ((0, 11, "UP"),)), (11,))
+    replay = Replay(record)
+
+    assert [board.size for board in replay.boards] == [12, 12]
+    assert config.BOARD_SIZE != 12
+    assert list(replay.steps()) == [(0, (0, 11), AttackResult.SUNK)]
+    assert replay.winner == 0
+
+
+def test_replay_seek():
+    file, game, turns = record_game(9)
+    (record,) = read_records(file)
+    replay = Replay(record)
+
+    replay.seek(len(turns))
+    replay.seek(2)
+
+    assert replay.turn == 2
+    assert replay.winner is None
+    # Player B has been attacked once
+    fleet_b = replay.boards[1].player
+    hit = turns[0][1] != AttackResult.MISS
+    assert (
+        fleet_b.fleet_strength
+        == sum(ship.size for ship in game._playerB.ships.values()) - hit
+    )
+    with pytest.raises(IndexError):
+        replay.seek(len(turns) + 1)
+
+
+def test_replay_writer_different_fleets():
+    player = AIPlayer(side=0, name="AI1")
+    enemy = AIPlayer(side=1, name="AI2", ships=[Carrier()])
+    game = Game(player, enemy, 1, ReplayWriter(BytesIO()))
+    game.initialize_boards()
+
+    with pytest.raises(ValueError):
+        game.step()
@@ -24,11 +24,13 @@ def test_ship_constructor(monkeypatch):
 
     ship = Ship(size=3)
 
-    assert ship._squares == [True, True, True]
+    assert ship._size == 3
+    assert ship._damage == 0
     assert ship._uuid == 123
     assert ship._location is None
     assert ship._orientation == config.DEFAULT_ORIENTATION
     assert ship._under_edition is True
+    assert ship._board_size is None
 
 
 def test_ship_squares():
@@ -53,7 +55,7 @@ def test_ship_size():
 
 def test_ship_strength():
     ship = Ship(size=3)
-    ship._squares = [True, False, False]
+    ship.squares = [True, False, False]
     assert ship.strength == 1
 
 
@@ -96,6 +98,14 @@ def test_ship_location_outside_of_range():
         ship.location = (config.BOARD_SIZE, 4)
 
 
+def test_ship_location_board_size():
+    ship = Ship(size=3, board_size=config.BOARD_SIZE + 2)
+    ship.location = (config.BOARD_SIZE + 1, 0)
+
+    with pytest.raises(LocationOutsideOfRangeError):
+        ship.location = (config.BOARD_SIZE + 2, 0)
+
+
 def test_ship_location_none():
     ship = Ship(size=3)
     ship.location = None
@@ -127,7 +137,27 @@ def test_ship_take_a_hit():
 
     assert ship.take_a_hit(targetIndex=2) == 2
 
-    assert ship._squares == [True, True, False]
+    assert ship.squares == [True, True, False]
+    assert ship._damage == 0b100
+
+
+def test_ship_squares_setter():
+    ship = Ship(size=3)
+    ship.squares = [False, True, True, False]
+
+    assert ship.size == 4
+    assert ship.strength == 2
+    assert ship[0] is False
+    assert ship[-1] is False
+    assert ship[1:3] == [True, True]
+    assert list(ship) == [False, True, True, False]
+
+
+def test_ship_slots():
+    ship = Carrier()
+
+    with pytest.raises(AttributeError):
+        ship.__dict__
 
 
 def test_ship_take_a_hit_fatal():
@@ -162,6 +192,30 @@ def test_ship_take_a_hit_already_destroyed():
         ship.take_a_hit(targetIndex=2)
 
 
+def test_ship_hit_mask():
+    ship = Ship(size=3)
+    ship.location = (1, 4)
+
+    assert ship.hit_mask(0b100) == 2
+    assert ship.squares == [True, True, False]
+    assert ship.hit_mask(0b001) == 1
+    assert ship.hit_mask(0b010) == 0
+
+
+def test_ship_hit_mask_unlocated():
+    ship = Ship(size=3)
+    with pytest.raises(UnlocatedShipHitError):
+        ship.hit_mask(0b100)
+
+
+def test_ship_hit_mask_already_destroyed():
+    ship = Ship(size=3)
+    ship.location = (1, 4)
+    ship.hit_mask(0b100)
+    with pytest.raises(HitDestroyedSquareError):
+        ship.hit_mask(0b100)
+
+
 def test_carrier():
     ship = Carrier()
     assert ship.size == config.BOAT_SIZES["Carrier"]
@@ -0,0 +1,108 @@
+from io import BytesIO
+from config import config
+from replay import Replay, read_records
+from simulate import game_seed, play_game, simulate
+from strategies import UnknownStrategyError
+import json
+import pytest
+
+
+def test_play_game():
+    result = play_game("hunt_target", "density")
+
+    winner_shots = result.a_shots if result.a_won else result.b_shots
+    # Every square of the default fleet has been hit by the winner
+    assert 18 <= winner_shots <= 100
+
+
+def test_play_game_b_first():
+    result = play_game("hunt_target", "hunt_target", a_first=False)
+
+    # The loser attacks at most once more than the winner
+    assert abs(result.a_shots - result.b_shots) <= 1
+
+
+def test_simulate_in_process():
+    progress = []
+
+    result = simulate(
+        5,
+        "parity",
+        workers=1,
+        chunk_size=2,
+        progress=lambda done, games, seconds: progress.append(done),
+    )
+
+    assert result.games == 5
+    assert 0 <= result.a_wins <= 5
+    assert progress == [2, 4, 5]
+    assert result.games_per_second > 0
+
+
+def test_simulate_process_pool():
+    result = simulate(6, "hunt_target", "parity", workers=2)
+
+    assert result.games == 6
+    assert result.a_win_shots + result.b_win_shots >= 6 * 18
+
+
+def test_simulate_config(tmp_path):
+    with open("configs/default_config.json") as file:
+        data = json.load(file)
+    data["BOARD_SIZE"] = 12
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps(data))
+
+    result = simulate(2, "density", workers=2, config_path=str(path))
+
+    assert result.games == 2
+
+
+def test_simulate_in_process_config_restored(tmp_path):
+    with open("configs/default_config.json") as file:
+        data = json.load(file)
+    data["BOARD_SIZE"] = 12
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps(data))
+    board_size = config.BOARD_SIZE
+
+    simulate(1, "density", workers=1, config_path=str(path))
+
+    assert config.BOARD_SIZE == board_size
+
+
+def test_simulate_unknown_strategy():
+    with pytest.raises(UnknownStrategyError):
+        simulate(1, "hunt_target", "cheating", workers=1)
+
+
+def test_simulate_seed():
+    first = simulate(4, "parity", "density", workers=2, seed=3)
+    second = simulate(4, "parity", "density", workers=1, chunk_size=1, seed=3)
+
+    assert first.seed == second.seed == 3
+    assert first[:4] == second[:4]
+
+
+def test_game_seed():
+    results = [
+        play_game("hunt_target", "parity", seed=game_seed(11, game))
+        for game in (0, 1, 0)
+    ]
+
+    assert results[0] == results[2]
+    assert game_seed(11, 1).spawn_key == (1,)
+
+
+def test_simulate_replay_file():
+    file = BytesIO()
+
+    result = simulate(4, "parity", "density", workers=2, seed=5, replay_file=file)
+
+    file.seek(0)
+    records = list(read_records(file))
+    assert len(records) == result.games
+    for record in records:
+        replay = Replay(record)
+        replay.seek(len(record.shots))
+        assert replay.winner is not None
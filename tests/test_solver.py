@@ -0,0 +1,83 @@
+from knowledge import UNKNOWN, MISS, HIT, SUNK
+from solver import ExactTargeting, constraint_masks, estimate_layout_count
+from utils import AttackResult
+import solver
+import numpy as np
+
+
+def test_constraint_masks():
+    state = np.full((4, 4), UNKNOWN, dtype=np.int8)
+    state[0, 0] = SUNK
+    state[3, 3] = MISS
+    state[2, 0] = HIT
+    blocked, hits = constraint_masks(state)
+
+    assert blocked[0, 0] and blocked[1, 1] and blocked[3, 3]
+    assert not blocked[2, 0] and not blocked[0, 2]
+    assert hits.tolist() == (state == HIT).tolist()
+
+
+def test_estimate_layout_count():
+    state = np.full((3, 3), UNKNOWN, dtype=np.int8)
+
+    # 12 placements of a size 2 ship, 12 ** 2 / 2! for two of them
+    assert np.isclose(estimate_layout_count(state, [2]), 12)
+    assert np.isclose(estimate_layout_count(state, [2, 2]), 72)
+    assert estimate_layout_count(state, [4]) == 0
+
+    state[1, :] = MISS
+    state[:, 1] = MISS
+    assert estimate_layout_count(state, [2]) == 0
+
+
+def test_estimate_layout_count_hits():
+    state = np.full((10, 10), UNKNOWN, dtype=np.int8)
+    state[4, 4] = HIT
+
+    # Only the 4 placements covering the hit are left, the hit isn't a sunk ship
+    assert np.isclose(estimate_layout_count(state, [2]), 4)
+    assert estimate_layout_count(state, [1]) == 0
+    # Either ship covers the hit, the other one avoids the cells next to it
+    count = estimate_layout_count(state, [3, 2])
+    assert count < estimate_layout_count(np.full((10, 10), UNKNOWN), [3, 2]) / 10
+
+
+def test_exact_targeting_memo(monkeypatch):
+    targeting = ExactTargeting(10, [3], np.random.default_rng(0))
+    targeting.observe((5, 5), AttackResult.HIT)
+    first = targeting.density()
+
+    samplers = []
+    monkeypatch.setattr(solver, "UniformLayoutSampler", samplers.append)
+    # The same position isn't enumerated again
+    assert np.array_equal(targeting.density(), first)
+    assert targeting.exact
+    assert not samplers
+
+
+def test_exact_targeting_density():
+    targeting = ExactTargeting(4, [2], np.random.default_rng(0))
+    targeting.observe((1, 1), AttackResult.HIT)
+    targeting.observe((1, 2), AttackResult.MISS)
+    density = targeting.density()
+
+    assert targeting.exact
+    # The ship lies on (1, 1) and one of its 3 remaining neighbours
+    assert np.isclose(density[1, 1], 1)
+    assert np.allclose(density[[0, 2, 1], [1, 1, 0]], 1 / 3)
+    assert targeting.choose_target() in [(0, 1), (2, 1), (1, 0)]
+
+
+def test_exact_targeting_fallback():
+    targeting = ExactTargeting(3, [2], threshold=0)
+    density = targeting.density()
+
+    assert not targeting.exact
+    assert np.array_equal(density, [[2, 3, 2], [3, 4, 3], [2, 3, 2]])
+
+
+def test_exact_targeting_too_many_states():
+    targeting = ExactTargeting(10, [5, 4, 3], threshold=float("inf"), max_states=10)
+    targeting.density()
+
+    assert not targeting.exact
@@ -0,0 +1,56 @@
+from strategies import (
+    STRATEGIES,
+    DIFFICULTIES,
+    Strategy,
+    UnknownStrategyError,
+    difficulty_name,
+    get_strategy,
+    register_strategy,
+)
+from players import AIPlayer
+from targeting import DensityTargeting, HuntTargetTargeting
+import pytest
+
+
+def test_builtin_strategies():
+    for name in DIFFICULTIES.values():
+        assert name in STRATEGIES
+    assert get_strategy("density").targeting is DensityTargeting
+
+
+def test_get_strategy_unknown():
+    with pytest.raises(UnknownStrategyError):
+        get_strategy("cheating")
+
+
+def test_difficulty_name():
+    assert difficulty_name("hunt_target") == "Easy"
+    assert difficulty_name("exact") == "exact"
+
+
+def test_register_strategy(monkeypatch):
+    monkeypatch.setattr("strategies.STRATEGIES", dict(STRATEGIES))
+
+    def corner_placement(board_size, ship_sizes, rng):
+        return [(2 * (i % 5), 6 * (i // 5), "UP") for i in range(len(ship_sizes))]
+
+    register_strategy(
+        "corner",
+        Strategy(
+            "Ships along two edges",
+            DensityTargeting,
+            corner_placement,
+            {"rng": None},
+        ),
+    )
+    player = AIPlayer(strategy="corner")
+    player.initialize_board()
+
+    assert all(ship.location[1] in (0, 6) for ship in player.ships.values())
+
+
+def test_strategy_options_read_only():
+    strategy = Strategy("Test", HuntTargetTargeting)
+
+    with pytest.raises(TypeError):
+        strategy.options["samples"] = 1
@@ -0,0 +1,193 @@
+from knowledge import UNKNOWN, MISS, SUNK, EMPTY, KnowledgeBoard
+from targeting import (
+    DensityTargeting,
+    HuntTargetTargeting,
+    ParityTargeting,
+    lattice,
+    IncrementalDensityTargeting,
+    coverage,
+    spread,
+)
+from utils import AttackResult
+import numpy as np
+import pytest
+
+
+def test_spread():
+    weights = np.array([[1.0, 2.0]])
+
+    assert np.array_equal(spread(weights, 2, axis=1), [[1.0, 3.0, 2.0]])
+
+
+def test_density_targeting_observe():
+    targeting = DensityTargeting(5, [2, 3])
+
+    targeting.observe((0, 0), AttackResult.MISS)
+    targeting.observe((2, 2), AttackResult.HIT)
+    targeting.observe((2, 3), AttackResult.SUNK)
+
+    assert targeting.state[0, 0] == MISS
+    assert targeting.state[2, 2] == SUNK
+    assert targeting.state[2, 3] == SUNK
+    # The halo of the sunk ship can't hold a ship
+    assert targeting.state[1, 1] == EMPTY
+    assert targeting.state[3, 4] == EMPTY
+    assert targeting.state[0, 1] == UNKNOWN
+    assert targeting.remaining[2] == 0
+    assert targeting.remaining[3] == 1
+
+
+def test_density_targeting_density_empty_board():
+    targeting = DensityTargeting(3, [2])
+    density = targeting.density()
+
+    # Corners are covered by 2 placements, edges by 3 and the center by 4
+    assert np.array_equal(density, [[2, 3, 2], [3, 4, 3], [2, 3, 2]])
+
+
+def test_density_targeting_density_single_square_ship():
+    targeting = DensityTargeting(3, [1])
+
+    assert np.array_equal(targeting.density(), np.ones((3, 3)))
+
+
+def test_density_targeting_density_misses():
+    targeting = DensityTargeting(3, [3])
+    targeting.observe((1, 1), AttackResult.MISS)
+    density = targeting.density()
+
+    assert density[1, 1] == 0
+    assert density[0, 0] == 2
+    assert density[0, 1] == 1
+
+
+def test_density_targeting_choose_target_follows_hit():
+    targeting = DensityTargeting(10, [2], np.random.default_rng(0))
+    targeting.observe((5, 5), AttackResult.HIT)
+
+    assert targeting.choose_target() in [(4, 5), (6, 5), (5, 4), (5, 6)]
+
+
+def test_density_targeting_choose_target_unshot():
+    targeting = DensityTargeting(2, [1], np.random.default_rng(0))
+    targeting.observe((0, 0), AttackResult.MISS)
+    targeting.observe((0, 1), AttackResult.MISS)
+    targeting.observe((1, 0), AttackResult.MISS)
+
+    assert targeting.choose_target() == (1, 1)
+
+
+def test_coverage():
+    table = coverage(3, 2)
+
+    # 6 vertical and 6 horizontal placements
+    assert table.squares.shape == (12, 2)
+    for cell in range(9):
+        placements = table.placements[table.starts[cell] : table.starts[cell + 1]]
+        expected = [i for i, squares in enumerate(table.squares) if cell in squares]
+        assert sorted(placements) == expected
+
+
+def test_incremental_density_targeting_matches_density():
+    shots = [
+        ((0, 0), AttackResult.MISS),
+        ((4, 4), AttackResult.HIT),
+        ((4, 5), AttackResult.HIT),
+        ((4, 6), AttackResult.SUNK),
+        ((7, 2), AttackResult.MISS),
+        ((1, 8), AttackResult.HIT),
+        ((9, 9), AttackResult.MISS),
+    ]
+    incremental = IncrementalDensityTargeting(10, [5, 3, 2, 1])
+    reference = DensityTargeting(10, [5, 3, 2, 1])
+
+    assert np.allclose(incremental.density(), reference.density())
+    for location, result in shots:
+        incremental.observe(location, result)
+        reference.observe(location, result)
+        assert np.allclose(incremental.density(), reference.density())
+    assert np.array_equal(incremental.state, reference.state)
+
+
+def test_incremental_density_targeting_density_is_a_copy():
+    targeting = IncrementalDensityTargeting(3, [2])
+    targeting.density()[1, 1] = 100
+
+    assert targeting.density()[1, 1] == 4
+
+
+def test_hunt_target_targeting_hunt():
+    targeting = HuntTargetTargeting(2, [1], np.random.default_rng(0))
+    for location in [(0, 0), (0, 1), (1, 0)]:
+        targeting.observe(location, AttackResult.MISS)
+
+    assert targeting.choose_target() == (1, 1)
+
+
+def test_hunt_target_targeting_target():
+    targeting = HuntTargetTargeting(5, [3], np.random.default_rng(0))
+    targeting.observe((2, 1), AttackResult.MISS)
+    targeting.observe((2, 2), AttackResult.HIT)
+
+    # The neighbours in line with the hit, without the missed one
+    assert sorted(targeting._target_list) == [(1, 2), (2, 3), (3, 2)]
+
+    targeting.observe((2, 3), AttackResult.HIT)
+    assert targeting._target_list == [(2, 4)]
+
+    targeting.observe((2, 4), AttackResult.SUNK)
+    assert targeting._target_list == []
+
+
+def test_lattice():
+    cells = lattice(4, 2, 1)
+
+    assert len(cells) == 8
+    assert all(sum(divmod(cell, 4)) % 2 == 1 for cell in cells)
+
+
+def test_parity_targeting_hunts_on_lattice():
+    targeting = ParityTargeting(6, [3, 2], np.random.default_rng(0))
+
+    assert targeting.stride == 2
+    shots = set()
+    for _ in range(18):
+        x, y = targeting.choose_target()
+        targeting.observe((x, y), AttackResult.MISS)
+        shots.add((x + y) % 2)
+    # All the lattice cells have been shot, only one diagonal is used
+    assert len(shots) == 1
+
+
+def test_parity_targeting_stride_widens():
+    targeting = ParityTargeting(6, [3, 2], np.random.default_rng(0))
+    targeting.observe((0, 0), AttackResult.HIT)
+    targeting.observe((0, 1), AttackResult.SUNK)
+
+    assert targeting.stride == 3
+    # 12 cells on one diagonal of the new lattice, minus the shot and halo ones
+    lattice_cells = targeting._lattice._cells
+    assert len({sum(divmod(cell, 6)) % 3 for cell in lattice_cells}) == 1
+    assert len(lattice_cells) >= 10
+    assert not {0, 1, 2, 6, 7, 8} & set(lattice_cells)
+    assert targeting._target_list == []
+
+
+def test_parity_targeting_lattice_exhausted():
+    targeting = ParityTargeting(2, [2], np.random.default_rng(0))
+    for cell in lattice(2, 2, 0) + lattice(2, 2, 1)[:1]:
+        targeting.observe(divmod(cell, 2), AttackResult.MISS)
+
+    assert targeting.choose_target() == divmod(lattice(2, 2, 1)[1], 2)
+
+
+def test_targeting_shared_knowledge():
+    knowledge = KnowledgeBoard(5, [2])
+    targeting = DensityTargeting(5, [2], knowledge=knowledge)
+    targeting.observe((1, 1), AttackResult.MISS)
+
+    assert targeting.knowledge is knowledge
+    assert knowledge.state[1, 1] == MISS
+    # A targeting created later would not know the shot
+    with pytest.raises(ValueError):
+        HuntTargetTargeting(5, [2], knowledge=knowledge)
@@ -1,7 +1,12 @@
 from utils import (
     get_uuid,
-    uuid_generator
+    uuid_generator,
+    dilate,
+    window_sums,
+    CellPool,
 )
+import numpy as np
+import pytest
 
 
 def test_uuid_generator():
@@ -14,3 +19,63 @@ def test_get_uuid(monkeypatch):
     monkeypatch.setattr("utils.uuid", uuid_generator())
     assert get_uuid() == 0
     assert get_uuid() == 1
+
+
+def test_dilate():
+    mask = np.zeros((4, 4), dtype=bool)
+    mask[0, 0] = True
+    mask[3, 2] = True
+
+    expected = np.array(
+        [
+            [1, 1, 0, 0],
+            [1, 1, 0, 0],
+            [0, 1, 1, 1],
+            [0, 1, 1, 1],
+        ],
+        dtype=bool,
+    )
+    assert np.array_equal(dilate(mask), expected)
+
+
+def test_window_sums():
+    mask = np.array([[1, 0, 1, 1], [0, 0, 0, 1]], dtype=bool)
+
+    assert np.array_equal(window_sums(mask, 2, axis=1), [[1, 1, 2], [0, 0, 1]])
+    assert np.array_equal(window_sums(mask, 2, axis=0), [[1, 0, 1, 2]])
+
+
+def test_cell_pool_remove():
+    pool = CellPool(4)
+    pool.remove(1)
+    pool.remove(3)
+
+    assert len(pool) == 2
+    assert 1 not in pool and 3 not in pool
+    assert 0 in pool and 2 in pool
+    with pytest.raises(KeyError):
+        pool.remove(1)
+
+
+def test_cell_pool_choice():
+    pool = CellPool(5)
+    for cell in (0, 2, 4):
+        pool.remove(cell)
+    rng = np.random.default_rng(0)
+
+    assert {pool.choice(rng) for _ in range(50)} == {1, 3}
+
+    pool.remove(1)
+    pool.remove(3)
+    with pytest.raises(IndexError):
+        pool.choice(rng)
+
+
+def test_cell_pool_cells():
+    pool = CellPool(10, [7, 2, 5])
+
+    assert len(pool) == 3
+    assert 2 in pool and 0 not in pool
+    pool.remove(7)
+    rng = np.random.default_rng(0)
+    assert {pool.choice(rng) for _ in range(20)} == {2, 5}